@@ -10,13 +10,23 @@ import json
 try:
     from .dataset_repo import DatasetRepository
     from .orchestrator import Orchestrator
-    from .artifacts import RunArtifactWriter, RunArtifactReader
+    from .artifacts import RunArtifactWriter, RunArtifactReader, RunFolderLayout
     from .reporter import Reporter
+    from .rescore import rescore_runs
+    from .job_store import JobStore
+    from .scheduler import JobScheduler, parse_priority
+    from .response_cache import normalize_cache_mode
+    from . import telemetry
 except ImportError:  # fallback for test runs importing as top-level modules
     from backend.dataset_repo import DatasetRepository
     from backend.orchestrator import Orchestrator
-    from backend.artifacts import RunArtifactWriter, RunArtifactReader
+    from backend.artifacts import RunArtifactWriter, RunArtifactReader, RunFolderLayout
     from backend.reporter import Reporter
+    from backend.rescore import rescore_runs
+    from backend.job_store import JobStore
+    from backend.scheduler import JobScheduler, parse_priority
+    from backend.response_cache import normalize_cache_mode
+    from backend import telemetry
     from backend.commerce_taxonomy import load_commerce_config
     from backend.coverage_builder import (
         build_per_behavior_datasets,
@@ -273,14 +283,54 @@ def _migrate_legacy_assets():
 _migrate_legacy_assets()
 _get_or_create_vertical_context(os.getenv("INDUSTRY_VERTICAL", "commerce"))
 
+def _get_scheduler() -> JobScheduler:
+    # Global job scheduler: persisted queue, per-provider running caps, fair share across verticals.
+    # Built on first use so importing the app does not create the job store file.
+    sched = getattr(app.state, "scheduler", None)
+    if sched is None:
+        sched = app.state.scheduler = JobScheduler(
+            JobStore(Path(os.getenv("JOB_STORE_PATH") or (RUNS_BASE / "jobs.sqlite3"))),
+            lambda v: _get_or_create_vertical_context(v)['orch'],
+        )
+    return sched
+
+
+@app.on_event("startup")
+async def _restore_scheduled_jobs():
+    # Re-queue jobs that were waiting or running when the previous server session stopped
+    try:
+        _get_scheduler().restore()
+    except Exception:
+        pass
+
+
+@app.on_event("shutdown")
+async def _close_http_clients():
+    # Provider and embedding connection pools live for the whole app lifespan
+    for c in _iter_all_contexts():
+        try:
+            await c['orch'].aclose()
+        except Exception:
+            pass
+    try:
+        try:
+            from .embeddings.ollama_embed import aclose_shared_embeddings
+        except ImportError:
+            from backend.embeddings.ollama_embed import aclose_shared_embeddings
+        await aclose_shared_embeddings()
+    except Exception:
+        pass
+
 
 class StartRunRequest(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
     dataset_id: str
-    model_spec: str  # e.g., "ollama:llama3.2:latest" or "gemini:gemini-2.5"
+    model_spec: Optional[str] = None  # e.g., "ollama:llama3.2:latest" or "gemini:gemini-2.5"
+    model_specs: Optional[list[str]] = None  # several models in one job (shared dataset/goldens/embeddings)
     metrics: Optional[list[str]] = None
     thresholds: Optional[dict[str, Any]] = None
     context: Optional[dict[str, Any]] = None
+    priority: Optional[int | str] = None  # 'interactive' | 'normal' (default) | 'batch' or an integer; lower runs first
 
 class StartRunResponse(BaseModel):
     job_id: str
@@ -385,21 +435,47 @@ async def update_settings_api(body: SettingsBody):
     return {"ok": True}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition: provider latency/errors/retries/in-flight, tokens, queue depth, embedding cache, artifact writes."""
+    from fastapi import Response
+    # job gauges are sampled at scrape time
+    states: Dict[str, int] = {}
+    for c in _iter_all_contexts():
+        for jr in list(c['orch'].jobs.values()):
+            states[jr.state] = states.get(jr.state, 0) + 1
+    telemetry.JOBS.clear()
+    for state, n in states.items():
+        telemetry.JOBS.set(n, state=state)
+    depth = _get_scheduler().depth()
+    telemetry.JOB_QUEUE_DEPTH.set(depth["queued"])
+    telemetry.JOBS_RUNNING.set(depth["running"])
+    return Response(content=telemetry.render(), media_type=telemetry.CONTENT_TYPE)
+
+
+@app.get("/providers/endpoints")
+async def provider_endpoints(check: bool = False, vertical: Optional[str] = None):
+    """Per-endpoint routing stats (in-flight, requests, failures, ejections, latency); `check=true` probes them first."""
+    providers = _get_or_create_vertical_context(vertical)['orch'].providers
+    health = await providers.check_endpoints() if check else None
+    return {"endpoints": providers.endpoint_stats(), "health": health}
+
+
 @app.get("/embeddings/test")
 async def embeddings_test():
     """Quick check to validate embeddings endpoint and model are working."""
     try:
         # defer import to avoid import-time failures
         try:
-            from .embeddings.ollama_embed import OllamaEmbeddings
+            from .embeddings.ollama_embed import shared_embeddings
         except ImportError:
-            from backend.embeddings.ollama_embed import OllamaEmbeddings
-        emb = OllamaEmbeddings()
+            from backend.embeddings.ollama_embed import shared_embeddings
+        emb = shared_embeddings()
         vecs = await emb.embed(["hello", "world"])
         if not isinstance(vecs, list) or not vecs or not isinstance(vecs[0], list):
             raise RuntimeError("unexpected embeddings shape")
         dim = len(vecs[0])
-        return {"ok": True, "count": len(vecs), "dim": dim, "model": os.getenv("EMBED_MODEL", "nomic-embed-text"), "host": os.getenv("OLLAMA_HOST", "http://localhost:11434")}
+        return {"ok": True, "count": len(vecs), "dim": dim, "model": emb.model, "host": getattr(emb, "base_url", None)}
     except Exception as e:
         # Return plain text so UI doesn't try to parse JSON
         from fastapi import Response
@@ -904,10 +980,38 @@ async def start_run(req: StartRunRequest):
         "thresholds": req.thresholds or {},
         "context": req.context or {},
     }
-    jr = orch.submit(dataset_id=req.dataset_id, model_spec=req.model_spec, config=cfg)
-    # initialize run folder with config
-    ctx['artifacts'].init_run(jr.run_id, {"dataset_id": req.dataset_id, "model_spec": req.model_spec, **cfg})
-    orch.start(jr.job_id)
+    scheduler = _get_scheduler()
+    try:
+        priority = parse_priority(req.priority)
+        # an unknown cache mode would otherwise only fail once the first turn runs
+        normalize_cache_mode(cfg["context"].get("response_cache"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not req.model_specs and not req.model_spec:
+        raise HTTPException(status_code=400, detail="model_spec or model_specs is required")
+    job_id = scheduler.new_job_id()
+    try:
+        if req.model_specs:
+            try:
+                jr = orch.submit_matrix(dataset_id=req.dataset_id, model_specs=req.model_specs, config=cfg, job_id=job_id)
+            except (FileNotFoundError, ValueError) as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            ctx['artifacts'].init_run(jr.run_id, {"dataset_id": req.dataset_id, "model_specs": jr.config["model_specs"], **cfg})
+            kind = "matrix"
+        else:
+            try:
+                jr = orch.submit(dataset_id=req.dataset_id, model_spec=req.model_spec, config=cfg, job_id=job_id)
+            except (FileNotFoundError, ValueError) as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            # initialize run folder with config
+            ctx['artifacts'].init_run(jr.run_id, {"dataset_id": req.dataset_id, "model_spec": req.model_spec, **cfg})
+            kind = "run"
+    except BaseException:
+        # a rejected submission must not leave its reserved job row behind
+        scheduler.release_job_id(job_id)
+        raise
+    # Starts immediately when the provider has capacity, otherwise waits in the persisted queue
+    scheduler.enqueue(ctx['vertical'], jr, kind=kind, priority=priority, config=cfg)
     return StartRunResponse(job_id=jr.job_id, run_id=jr.run_id, state=jr.state)
 
 
@@ -960,6 +1064,8 @@ async def control_run(job_id: str, body: ControlBody):
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    # A queued job resumed or cancelled before it started changes what the scheduler can dispatch
+    _get_scheduler().dispatch()
     # Return current job status snapshot
     return {
         "job_id": jr.job_id,
@@ -972,6 +1078,36 @@ async def control_run(job_id: str, body: ControlBody):
     }
 
 
+@app.post("/runs/{run_id}/resume", response_model=StartRunResponse)
+async def resume_run(run_id: str, vertical: Optional[str] = None, priority: Optional[str] = None):
+    """Resume an interrupted (e.g. stale) run from its run_config.json, skipping turns that already succeeded."""
+    scheduler = _get_scheduler()
+    try:
+        prio = parse_priority(priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    contexts = [_get_or_create_vertical_context(vertical)] if vertical else _iter_all_contexts()
+    for c in contexts:
+        orch: Orchestrator = c['orch']
+        if not (orch.runs_root / run_id / "run_config.json").exists():
+            continue
+        job_id = scheduler.new_job_id()
+        try:
+            jr = orch.resume_run(run_id, job_id=job_id)
+        except RuntimeError as e:
+            scheduler.release_job_id(job_id)
+            raise HTTPException(status_code=409, detail=str(e))
+        except (FileNotFoundError, KeyError) as e:
+            scheduler.release_job_id(job_id)
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            scheduler.release_job_id(job_id)
+            raise HTTPException(status_code=400, detail=str(e))
+        scheduler.enqueue(c['vertical'], jr, kind="resume", priority=prio)
+        return StartRunResponse(job_id=jr.job_id, run_id=jr.run_id, state=jr.state)
+    raise HTTPException(status_code=404, detail="run not found")
+
+
 @app.get("/runs/{job_id}/status")
 async def run_status(job_id: str):
     # search in-memory jobs across verticals
@@ -987,6 +1123,8 @@ async def run_status(job_id: str):
                 "total_conversations": jr.total_conversations,
                 "completed_conversations": jr.completed_conversations,
                 "error": jr.error,
+                # 1-based position in the scheduler queue while waiting for provider capacity
+                "queue_position": _get_scheduler().queue_position(job_id) if jr.state == "queued" else None,
             }
     # Try to recover from persisted job status if the process lost in-memory job across verticals
     for c in _iter_all_contexts():
@@ -1015,17 +1153,39 @@ async def run_status(job_id: str):
 
 
 @app.get("/runs/{run_id}/results")
-async def run_results(run_id: str, vertical: Optional[str] = None):
+async def run_results(run_id: str, vertical: Optional[str] = None, version: Optional[int] = None):
+    """results.json of a run; `version` (>= 2) selects a re-scored results.v<N>.json instead."""
+    contexts = [_get_or_create_vertical_context(vertical)] if vertical else _iter_all_contexts()
     paths = []
-    if vertical:
-        c = _get_or_create_vertical_context(vertical)
-        paths.append(c['reader'].layout.results_json_path(run_id))
-    else:
-        for c in _iter_all_contexts():
-            paths.append(c['reader'].layout.results_json_path(run_id))
+    for c in contexts:
+        layout = c['reader'].layout
+        paths.append(layout.results_json_path(run_id) if not version or version <= 1 else layout.results_version_path(run_id, version))
     for path in paths:
         if path.exists():
             return get_json_file(path)
+    if version and version > 1:
+        raise HTTPException(status_code=404, detail="results version not found")
+    # Run still in progress: serve conversations scored so far from the incremental store
+    readers = [_get_or_create_vertical_context(vertical)['reader']] if vertical else [c['reader'] for c in _iter_all_contexts()]
+    for reader in readers:
+        if not reader.layout.results_partial_path(run_id).exists():
+            continue
+        entries = reader.read_partial_results(run_id)
+        cfg: Dict[str, Any] = {}
+        try:
+            cfg = json.loads(reader.layout.run_config_path(run_id).read_text(encoding="utf-8"))
+        except Exception:
+            cfg = {}
+        return {
+            "run_id": run_id,
+            "dataset_id": cfg.get("dataset_id"),
+            "model_spec": cfg.get("model_spec"),
+            "partial": True,
+            "conversations": [e.get("conversation") for e in entries],
+            "input_tokens_total": sum(int(e.get("input_tokens") or 0) for e in entries),
+            "output_tokens_total": sum(int(e.get("output_tokens") or 0) for e in entries),
+            "generation_ms_total": sum(int(e.get("generation_ms") or 0) for e in entries),
+        }
     raise HTTPException(status_code=404, detail="results not found")
 
 
@@ -1246,167 +1406,213 @@ async def run_artifacts(run_id: str, type: str = "json", vertical: Optional[str]
         raise HTTPException(status_code=400, detail="unknown type")
 
 
-    @app.post("/runs/{run_id}/rebuild")
-    async def rebuild_run_artifacts(run_id: str, vertical: Optional[str] = None):
-        """Rebuild and enrich results.json and results.csv for an existing run.
-        Adds human-friendly identity, per-turn snippets, rollups, and writes CSV.
-        """
-        # locate by vertical or search across
-        if vertical:
-            ctx = _get_or_create_vertical_context(vertical)
-            reader: RunArtifactReader = ctx['reader']
-            writer: RunArtifactWriter = ctx['artifacts']
-            repo: DatasetRepository = ctx['orch'].repo
-        else:
-            # search for run_id
-            reader = None
-            writer = None
-            repo = None
-            for c in _iter_all_contexts():
-                if (c['reader'].layout.run_dir(run_id)).exists():
-                    reader = c['reader']
-                    writer = c['artifacts']
-                    repo = c['orch'].repo
-                    break
-            if reader is None or writer is None or repo is None:
-                raise HTTPException(status_code=404, detail="run not found")
-        # Load existing
-        res_path = reader.layout.results_json_path(run_id)
-        if not res_path.exists():
-            raise HTTPException(status_code=404, detail="results.json not found")
-        try:
-            results = json.loads(res_path.read_text(encoding="utf-8"))
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"invalid results.json: {e}")
-        ds_id = results.get("dataset_id")
-        if not ds_id:
-            raise HTTPException(status_code=400, detail="results missing dataset_id")
-        try:
-            ds = repo.get_dataset(ds_id)
-        except Exception as e:
-            raise HTTPException(status_code=404, detail=f"dataset not found: {e}")
-
-        # Build conversation map from dataset
-        ds_meta = ds.get("metadata", {}) or {}
-        domain_description = ds_meta.get("short_description")
-        conv_map: dict[str, dict] = {c.get("conversation_id"): c for c in (ds.get("conversations") or [])}
-
-        # Helpers
-        import re
-        def slugify(text: str) -> str:
-            t = (text or "").lower()
-            t = re.sub(r"[^a-z0-9]+", "-", t).strip("-")
-            return t[:80]
-
-        def conv_identity(cid: str) -> dict:
-            c = conv_map.get(cid) or {}
-            meta = c.get("metadata") or {}
-            d = meta.get("domain") or ds_meta.get("domain")
-            b = meta.get("behavior") or ds_meta.get("behavior")
-            s = meta.get("scenario") or meta.get("case")
-            persona = meta.get("persona")
-            locale = meta.get("locale")
-            channel = meta.get("channel")
-            complexity = meta.get("complexity") or ds_meta.get("difficulty")
-            case_type = meta.get("case_type") or meta.get("type")
-            title = c.get("title") or ((f"{b}: {s}" if b and s else (b or s)) if (b or s) else None) or cid
-            parts = [p for p in [d, b, s, persona, locale] if p]
-            slug = slugify("-".join(parts)) if parts else slugify(cid)
-            return {
-                "conversation_slug": slug,
-                "conversation_title": title,
-                "domain": d,
-                "behavior": b,
-                "scenario": s,
-                "persona": persona,
-                "locale": locale,
-                "channel": channel,
-                "complexity": complexity,
-                "case_type": case_type,
-            }
+@app.post("/runs/{run_id}/rebuild")
+async def rebuild_run_artifacts(run_id: str, vertical: Optional[str] = None):
+    """Rebuild and enrich results.json and results.csv for an existing run.
+    Adds human-friendly identity, per-turn snippets, rollups, and writes CSV.
+    """
+    # locate by vertical or search across
+    if vertical:
+        ctx = _get_or_create_vertical_context(vertical)
+        reader: RunArtifactReader = ctx['reader']
+        writer: RunArtifactWriter = ctx['artifacts']
+        repo: DatasetRepository = ctx['orch'].repo
+    else:
+        # search for run_id
+        reader = None
+        writer = None
+        repo = None
+        for c in _iter_all_contexts():
+            if (c['reader'].layout.run_dir(run_id)).exists():
+                reader = c['reader']
+                writer = c['artifacts']
+                repo = c['orch'].repo
+                break
+        if reader is None or writer is None or repo is None:
+            raise HTTPException(status_code=404, detail="run not found")
+    # Load existing
+    res_path = reader.layout.results_json_path(run_id)
+    if not res_path.exists():
+        raise HTTPException(status_code=404, detail="results.json not found")
+    try:
+        results = json.loads(res_path.read_text(encoding="utf-8"))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"invalid results.json: {e}")
+    ds_id = results.get("dataset_id")
+    if not ds_id:
+        raise HTTPException(status_code=400, detail="results missing dataset_id")
+    try:
+        ds = repo.get_dataset(ds_id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"dataset not found: {e}")
+
+    # Build conversation map from dataset
+    ds_meta = ds.get("metadata", {}) or {}
+    domain_description = ds_meta.get("short_description")
+    conv_map: dict[str, dict] = {c.get("conversation_id"): c for c in (ds.get("conversations") or [])}
+
+    # Helpers
+    import re
+    def slugify(text: str) -> str:
+        t = (text or "").lower()
+        t = re.sub(r"[^a-z0-9]+", "-", t).strip("-")
+        return t[:80]
+
+    def conv_identity(cid: str) -> dict:
+        c = conv_map.get(cid) or {}
+        meta = c.get("metadata") or {}
+        d = meta.get("domain") or ds_meta.get("domain")
+        b = meta.get("behavior") or ds_meta.get("behavior")
+        s = meta.get("scenario") or meta.get("case")
+        persona = meta.get("persona")
+        locale = meta.get("locale")
+        channel = meta.get("channel")
+        complexity = meta.get("complexity") or ds_meta.get("difficulty")
+        case_type = meta.get("case_type") or meta.get("type")
+        title = c.get("title") or ((f"{b}: {s}" if b and s else (b or s)) if (b or s) else None) or cid
+        parts = [p for p in [d, b, s, persona, locale] if p]
+        slug = slugify("-".join(parts)) if parts else slugify(cid)
+        return {
+            "conversation_slug": slug,
+            "conversation_title": title,
+            "domain": d,
+            "behavior": b,
+            "scenario": s,
+            "persona": persona,
+            "locale": locale,
+            "channel": channel,
+            "complexity": complexity,
+            "case_type": case_type,
+        }
 
-        # Enrich per conversation
-        from .artifacts import RunFolderLayout
-        layout = RunFolderLayout(reader.layout.runs_root)
-        updated = 0
-        for conv in results.get("conversations", []) or []:
-            cid = conv.get("conversation_id")
-            if not cid:
-                continue
-            ident = conv_identity(cid)
-            conv.update({k: v for k, v in ident.items() if k not in conv or conv.get(k) in (None, "")})
-            # trace dir
-            conv["trace_dir"] = str(layout.conversation_subdir(run_id, cid))
-            # set conversation_description if present in dataset
-            if "conversation_description" not in conv:
-                try:
-                    conv_desc = (conv_map.get(cid, {}).get("metadata") or {}).get("short_description")
-                    if conv_desc:
-                        conv["conversation_description"] = conv_desc
-                except Exception:
-                    pass
-            # per-turn enrich
-            # open turn files to get assistant output snippet
-            from glob import glob
+    # Enrich per conversation
+    layout = RunFolderLayout(reader.layout.runs_root)
+    updated = 0
+    for conv in results.get("conversations", []) or []:
+        cid = conv.get("conversation_id")
+        if not cid:
+            continue
+        ident = conv_identity(cid)
+        conv.update({k: v for k, v in ident.items() if k not in conv or conv.get(k) in (None, "")})
+        # trace dir
+        conv["trace_dir"] = str(layout.conversation_subdir(run_id, cid))
+        # set conversation_description if present in dataset
+        if "conversation_description" not in conv:
+            try:
+                conv_desc = (conv_map.get(cid, {}).get("metadata") or {}).get("short_description")
+                if conv_desc:
+                    conv["conversation_description"] = conv_desc
+            except Exception:
+                pass
+        # per-turn enrich
+        # open turn files to get assistant output snippet
+        from glob import glob
+        try:
+            conv_dir = layout.conversation_subdir(run_id, cid)
+            turn_files = sorted(conv_dir.glob("turn_*.json"))
+        except Exception:
+            turn_files = []
+        # map turn_index -> response content
+        resp_by_idx: dict[int, str] = {}
+        for tf in turn_files:
             try:
-                conv_dir = layout.conversation_subdir(run_id, cid)
-                turn_files = sorted(conv_dir.glob("turn_*.json"))
+                rec = json.loads(tf.read_text(encoding="utf-8"))
+                uidx = int(rec.get("turn_index", 0))
+                resp_by_idx[uidx] = ((rec.get("response", {}) or {}).get("content")) or ""
             except Exception:
-                turn_files = []
-            # map turn_index -> response content
-            resp_by_idx: dict[int, str] = {}
-            for tf in turn_files:
+                continue
+        # dataset turns for user prompt snippet
+        ds_turns = (conv_map.get(cid, {}).get("turns") or []) if cid in conv_map else []
+        def snippet(t: str, n: int = 160) -> str:
+            t = (t or "").strip().replace("\n", " ")
+            return t if len(t) <= n else (t[: n - 1] + "…")
+        for t in conv.get("turns", []) or []:
+            idx = int(t.get("turn_index", 0))
+            if "turn_pass" not in t:
+                mets = t.get("metrics", {}) or {}
+                pass_vals = [bool(v.get("pass")) for v in mets.values() if isinstance(v, dict) and "pass" in v]
+                t["turn_pass"] = (all(pass_vals) if pass_vals else True)
+            if "user_prompt_snippet" not in t:
                 try:
-                    rec = json.loads(tf.read_text(encoding="utf-8"))
-                    uidx = int(rec.get("turn_index", 0))
-                    resp_by_idx[uidx] = ((rec.get("response", {}) or {}).get("content")) or ""
+                    user_text = str(ds_turns[idx].get("text") or "") if 0 <= idx < len(ds_turns) else ""
                 except Exception:
-                    continue
-            # dataset turns for user prompt snippet
-            ds_turns = (conv_map.get(cid, {}).get("turns") or []) if cid in conv_map else []
-            def snippet(t: str, n: int = 160) -> str:
-                t = (t or "").strip().replace("\n", " ")
-                return t if len(t) <= n else (t[: n - 1] + "…")
-            for t in conv.get("turns", []) or []:
-                idx = int(t.get("turn_index", 0))
-                if "turn_pass" not in t:
-                    mets = t.get("metrics", {}) or {}
-                    pass_vals = [bool(v.get("pass")) for v in mets.values() if isinstance(v, dict) and "pass" in v]
-                    t["turn_pass"] = (all(pass_vals) if pass_vals else True)
-                if "user_prompt_snippet" not in t:
-                    try:
-                        user_text = str(ds_turns[idx].get("text") or "") if 0 <= idx < len(ds_turns) else ""
-                    except Exception:
-                        user_text = ""
-                    t["user_prompt_snippet"] = snippet(user_text)
-                if "assistant_output_snippet" not in t:
-                    t["assistant_output_snippet"] = snippet(resp_by_idx.get(idx, ""), 200)
-            # summary rollups
-            summ = conv.get("summary") or {}
-            if "total_user_turns" not in summ:
-                summ["total_user_turns"] = len(conv.get("turns") or [])
-            if "failed_turns_count" not in summ:
-                summ["failed_turns_count"] = sum(1 for tt in (conv.get("turns") or []) if tt.get("turn_pass") is False)
-            if "failed_metrics" not in summ:
-                failed_metrics = sorted({
-                    name for tt in (conv.get("turns") or []) for name, m in (tt.get("metrics") or {}).items()
-                    if isinstance(m, dict) and m.get("pass") is False
-                })
-                summ["failed_metrics"] = failed_metrics
-            conv["summary"] = summ
-            updated += 1
-
-        # Write back results.json and results.csv
-        # add domain description at top level
-        if domain_description:
-            results["domain_description"] = domain_description
-        writer.write_results_json(run_id, results)
-        try:
-            writer.write_results_csv(run_id, results)
-        except Exception as e:
-            # still return ok if JSON was updated
-            return {"ok": True, "updated_json": True, "updated_csv": False, "error": str(e), "conversations": updated}
-        return {"ok": True, "updated_json": True, "updated_csv": True, "conversations": updated}
+                    user_text = ""
+                t["user_prompt_snippet"] = snippet(user_text)
+            if "assistant_output_snippet" not in t:
+                t["assistant_output_snippet"] = snippet(resp_by_idx.get(idx, ""), 200)
+        # summary rollups
+        summ = conv.get("summary") or {}
+        if "total_user_turns" not in summ:
+            summ["total_user_turns"] = len(conv.get("turns") or [])
+        if "failed_turns_count" not in summ:
+            summ["failed_turns_count"] = sum(1 for tt in (conv.get("turns") or []) if tt.get("turn_pass") is False)
+        if "failed_metrics" not in summ:
+            failed_metrics = sorted({
+                name for tt in (conv.get("turns") or []) for name, m in (tt.get("metrics") or {}).items()
+                if isinstance(m, dict) and m.get("pass") is False
+            })
+            summ["failed_metrics"] = failed_metrics
+        conv["summary"] = summ
+        updated += 1
+
+    # Write back results.json and results.csv
+    # add domain description at top level
+    if domain_description:
+        results["domain_description"] = domain_description
+    writer.write_results_json(run_id, results)
+    try:
+        writer.write_results_csv(run_id, results)
+    except Exception as e:
+        # still return ok if JSON was updated
+        return {"ok": True, "updated_json": True, "updated_csv": False, "error": str(e), "conversations": updated}
+    return {"ok": True, "updated_json": True, "updated_csv": True, "conversations": updated}
+
+
+class RescoreRequest(BaseModel):
+    run_ids: Optional[list[str]] = None
+    metrics: Optional[list[str]] = None  # default: each run's own metrics
+    thresholds: Optional[dict[str, Any]] = None  # overrides merged over each run's thresholds
+    workers: Optional[int] = None
+
+
+def _rescore(run_ids: list[str], req: RescoreRequest, vertical: Optional[str]) -> list[dict[str, Any]]:
+    # Group runs by the vertical that holds them, then re-score each group in one process pool
+    contexts = [_get_or_create_vertical_context(vertical)] if vertical else _iter_all_contexts()
+    groups: dict[str, tuple[Any, list[str]]] = {}
+    for rid in run_ids:
+        for c in contexts:
+            if (c['orch'].runs_root / rid / "run_config.json").exists():
+                groups.setdefault(c['vertical'], (c['orch'], []))[1].append(rid)
+                break
+        else:
+            raise HTTPException(status_code=404, detail=f"run not found: {rid}")
+    out: list[dict[str, Any]] = []
+    for orch, rids in groups.values():
+        out.extend(rescore_runs(orch.runs_root, orch.repo.root_dir, rids, metrics=req.metrics, thresholds=req.thresholds, workers=req.workers))
+    return out
+
+
+@app.post("/runs/rescore")
+async def rescore_many(req: RescoreRequest, vertical: Optional[str] = None):
+    """Recompute metrics for existing runs from their turn artifacts (no provider calls).
+
+    Writes results.v<N>.json/.csv next to each run's results.json.
+    """
+    if not req.run_ids:
+        raise HTTPException(status_code=400, detail="run_ids is required")
+    import asyncio
+    try:
+        return {"runs": await asyncio.to_thread(_rescore, list(req.run_ids), req, vertical)}
+    except HTTPException:
+        raise
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/runs/{run_id}/rescore")
+async def rescore_one(run_id: str, req: Optional[RescoreRequest] = None, vertical: Optional[str] = None):
+    req = req or RescoreRequest()
+    return await rescore_many(RescoreRequest(run_ids=[run_id], metrics=req.metrics, thresholds=req.thresholds, workers=req.workers), vertical)
 
 
 @app.post("/runs/{run_id}/feedback")
@@ -1516,7 +1722,8 @@ async def list_runs(vertical: Optional[str] = None):
             except Exception:
                 cfg = {}
             # Try to read persisted job status to enrich item
-            job_state = reader.read_job_status(run_id)
+            # In-memory snapshot first: job.json progress writes are coalesced
+            job_state = c['orch'].latest_status(run_id) or reader.read_job_status(run_id)
             # Determine staleness
             boot_id = (job_state or {}).get('boot_id')
             is_stale = (boot_id is None) or (boot_id != BOOT_ID)
@@ -1526,8 +1733,8 @@ async def list_runs(vertical: Optional[str] = None):
             items.append({
                 'run_id': run_id,
                 'dataset_id': cfg.get('dataset_id'),
-                'model_spec': cfg.get('model_spec'),
-                'has_results': res_path.exists(),
+                'model_spec': cfg.get('model_spec') or (", ".join(cfg.get('model_specs') or []) or None),
+                'has_results': res_path.exists() or (p / 'matrix.json').exists(),
                 'created_ts': cfg_path.stat().st_mtime if cfg_path.exists() else None,
                 'state': state_val,
                 'progress_pct': (job_state or {}).get('progress_pct'),
@@ -2,10 +2,31 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
+import asyncio
 import json
 import csv
+import os
 import re
 import hashlib
+import tempfile
+import time
+from functools import wraps
+
+try:
+    from .telemetry import ARTIFACT_WRITE_SECONDS
+except ImportError:
+    from backend.telemetry import ARTIFACT_WRITE_SECONDS
+
+
+def _timed_write(kind: str):
+    """Record the wrapped writer method's duration in the artifact write latency histogram."""
+    def deco(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            with ARTIFACT_WRITE_SECONDS.time(kind=kind):
+                return fn(*args, **kwargs)
+        return inner
+    return deco
 
 
 def safe_component(name: str, *, max_len: int = 120) -> str:
@@ -61,14 +82,52 @@ class RunFolderLayout:
     def results_csv_path(self, run_id: str) -> Path:
         return self.run_dir(run_id) / "results.csv"
 
+    def results_version_path(self, run_id: str, version: int, ext: str = "json") -> Path:
+        # Re-scored results live next to the original: results.v2.json, results.v3.json, ...
+        return self.run_dir(run_id) / f"results.v{int(version)}.{ext}"
+
+    def results_versions(self, run_id: str) -> List[int]:
+        """Versions of re-scored results present for a run (results.json itself is version 1)."""
+        out: List[int] = []
+        for p in self.run_dir(run_id).glob("results.v*.json"):
+            try:
+                out.append(int(p.name[len("results.v"):-len(".json")]))
+            except ValueError:
+                continue
+        return sorted(out)
+
     def job_status_path(self, run_id: str) -> Path:
         return self.run_dir(run_id) / "job.json"
 
+    def matrix_summary_path(self, run_id: str) -> Path:
+        return self.run_dir(run_id) / "matrix.json"
+
+    def results_partial_path(self, run_id: str) -> Path:
+        # One JSON line per scored conversation, appended while the run is in progress
+        return self.run_dir(run_id) / "results.partial.jsonl"
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write via a temp file in the same folder and rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
 
 class RunArtifactWriter:
     def __init__(self, runs_root: Path) -> None:
         self.layout = RunFolderLayout(runs_root=runs_root)
 
+    @_timed_write("run_config")
     def init_run(self, run_id: str, config: Dict[str, Any]) -> Path:
         path = self.layout.run_config_path(run_id)
         path.write_text(json.dumps(config, indent=2), encoding="utf-8")
@@ -76,17 +135,39 @@ class RunArtifactWriter:
         self.layout.conversations_dir(run_id)
         return path
 
+    @_timed_write("job_status")
     def write_job_status(self, run_id: str, status: Dict[str, Any]) -> Path:
         path = self.layout.job_status_path(run_id)
-        path.write_text(json.dumps(status, indent=2), encoding="utf-8")
+        atomic_write_text(path, json.dumps(status, indent=2))
         return path
 
-    def write_results_json(self, run_id: str, results: Dict[str, Any]) -> Path:
-        path = self.layout.results_json_path(run_id)
+    @_timed_write("results_json")
+    def write_results_json(self, run_id: str, results: Dict[str, Any], version: Optional[int] = None) -> Path:
+        path = self.layout.results_json_path(run_id) if version is None else self.layout.results_version_path(run_id, version)
         path.write_text(json.dumps(results, indent=2), encoding="utf-8")
         return path
 
-    def write_results_csv(self, run_id: str, results: Dict[str, Any]) -> Path:
+    @_timed_write("matrix_summary")
+    def write_matrix_summary(self, run_id: str, summary: Dict[str, Any]) -> Path:
+        path = self.layout.matrix_summary_path(run_id)
+        path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        return path
+
+    @_timed_write("partial_result")
+    def append_partial_result(self, run_id: str, entry: Dict[str, Any]) -> Path:
+        """Append one scored conversation to the incremental results store."""
+        path = self.layout.results_partial_path(run_id)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        return path
+
+    def clear_partial_results(self, run_id: str) -> None:
+        path = self.layout.results_partial_path(run_id)
+        if path.exists():
+            path.unlink()
+
+    @_timed_write("results_csv")
+    def write_results_csv(self, run_id: str, results: Dict[str, Any], version: Optional[int] = None) -> Path:
         """
         Expect results structure:
         {
@@ -103,7 +184,7 @@ class RunArtifactWriter:
           ]
         }
         """
-        path = self.layout.results_csv_path(run_id)
+        path = self.layout.results_csv_path(run_id) if version is None else self.layout.results_version_path(run_id, version, "csv")
         with path.open("w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             header = [
@@ -203,6 +284,68 @@ class RunArtifactWriter:
         return path
 
 
+class JobStatusChannel:
+    """Coalesces job.json writes.
+
+    `publish` keeps the latest snapshot in memory right away. A snapshot whose `state`
+    differs from the last one on disk is written immediately; progress-only updates are
+    written at most once per `flush_interval_ms` (a timer picks up the last one).
+    """
+
+    def __init__(self, writer: RunArtifactWriter, flush_interval_ms: Optional[int] = None) -> None:
+        self._writer = writer
+        if flush_interval_ms is None:
+            try:
+                flush_interval_ms = int(os.getenv("JOB_STATUS_FLUSH_MS", "500"))
+            except ValueError:
+                flush_interval_ms = 500
+        self.flush_interval = max(0, flush_interval_ms) / 1000.0
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._written_state: Dict[str, Any] = {}
+        self._written_at: Dict[str, float] = {}
+        self._dirty: set[str] = set()
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self.writes = 0
+
+    def latest(self, run_id: str) -> Optional[Dict[str, Any]]:
+        return self._latest.get(run_id)
+
+    def publish(self, run_id: str, status: Dict[str, Any], *, force: bool = False) -> None:
+        self._latest[run_id] = status
+        self._dirty.add(run_id)
+        transition = self._written_state.get(run_id, object()) != status.get("state")
+        due = time.monotonic() - self._written_at.get(run_id, float("-inf")) >= self.flush_interval
+        if force or transition or due:
+            self.flush(run_id)
+            return
+        if run_id not in self._timers:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush(run_id)
+                return
+            delay = self.flush_interval - (time.monotonic() - self._written_at[run_id])
+            self._timers[run_id] = loop.call_later(max(0.0, delay), self.flush, run_id)
+
+    def flush(self, run_id: Optional[str] = None) -> None:
+        """Write pending snapshots (one run or all) to disk now."""
+        for rid in ([run_id] if run_id is not None else list(self._dirty)):
+            timer = self._timers.pop(rid, None)
+            if timer is not None:
+                timer.cancel()
+            if rid not in self._dirty:
+                continue
+            self._dirty.discard(rid)
+            status = self._latest[rid]
+            try:
+                self._writer.write_job_status(rid, status)
+                self.writes += 1
+            except Exception:
+                pass
+            self._written_state[rid] = status.get("state")
+            self._written_at[rid] = time.monotonic()
+
+
 class RunArtifactReader:
     def __init__(self, runs_root: Path) -> None:
         self.layout = RunFolderLayout(runs_root=runs_root)
@@ -212,6 +355,21 @@ class RunArtifactReader:
         data = json.loads(path.read_text(encoding="utf-8"))
         return data
 
+    def read_partial_results(self, run_id: str) -> List[Dict[str, Any]]:
+        """Scored conversation entries appended so far; a torn last line is ignored."""
+        path = self.layout.results_partial_path(run_id)
+        if not path.exists():
+            return []
+        entries: List[Dict[str, Any]] = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except Exception:
+                continue
+        return entries
+
     def read_job_status(self, run_id: str) -> Optional[Dict[str, Any]]:
         p = self.layout.job_status_path(run_id)
         if not p.exists():
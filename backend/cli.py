@@ -7,8 +7,11 @@ from typing import List, Optional, Tuple
 
 try:
     from .orchestrator import Orchestrator
+    from .artifacts import RunArtifactWriter
     from .schemas import SchemaValidator
     from .reporter import Reporter
+    from .rescore import rescore_runs
+    from .response_cache import normalize_cache_mode
     from .coverage_builder import (
         build_per_behavior_datasets,
         build_domain_combined_datasets,
@@ -26,8 +29,11 @@ try:
         build_global_combined_dataset_v2 = None  # type: ignore
 except ImportError:
     from backend.orchestrator import Orchestrator
+    from backend.artifacts import RunArtifactWriter
     from backend.schemas import SchemaValidator
     from backend.reporter import Reporter
+    from backend.rescore import rescore_runs
+    from backend.response_cache import normalize_cache_mode
     from backend.coverage_builder import (
         build_per_behavior_datasets,
         build_domain_combined_datasets,
@@ -139,46 +145,113 @@ def cmd_run(root: Path, file: Path, no_semantic: bool = False) -> int:
     if no_semantic and "semantic" in metrics:
         metrics = [m for m in metrics if m != "semantic"]
     thresholds = run_cfg.get("thresholds") or {}
+    job_cfg = {"metrics": metrics, "thresholds": thresholds}
+    if run_cfg.get("concurrency") is not None:
+        # conversations executed at once per job (see run_config.schema.json)
+        job_cfg["concurrency"] = run_cfg.get("concurrency")
 
     if not datasets or not models:
         print("No datasets or models specified", file=sys.stderr)
         return 2
+    try:
+        # runs take the cache mode from RESPONSE_CACHE_MODE; reject a bad one before any job starts
+        normalize_cache_mode(None)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
 
     orch = Orchestrator(datasets_dir=root / "datasets", runs_root=root / "runs")
+    writer = RunArtifactWriter(root / "runs")
     run_ids: List[str] = []
     for d in datasets:
+        if len(models) > 1:
+            # One matrix job per dataset: dataset, goldens and embeddings are shared across models
+            job = orch.submit_matrix(dataset_id=d, model_specs=models, config=job_cfg)
+            writer.init_run(job.run_id, {"dataset_id": d, "model_specs": job.config["model_specs"], **job_cfg})
+            import asyncio
+            asyncio.run(orch.run_job(job.job_id))
+            print(f"Run completed: job={job.job_id} state={job.state} run_id={job.run_id} (matrix)")
+            for m, model_run_id in job.model_runs.items():
+                print(f" - {m}: run_id={model_run_id}")
+                run_ids.append(model_run_id)
+                _write_report(root, model_run_id)
+            continue
         for m in models:
-            job = orch.submit(dataset_id=d, model_spec=m, config={"metrics": metrics, "thresholds": thresholds})
+            job = orch.submit(dataset_id=d, model_spec=m, config=job_cfg)
+            # persist run_config.json so an interrupted run can be resumed
+            writer.init_run(job.run_id, {"dataset_id": d, "model_spec": m, **job_cfg})
             # Run the job inline without requiring an event loop
             import asyncio
             asyncio.run(orch.run_job(job.job_id))
             print(f"Run completed: job={job.job_id} state={job.state} run_id={job.run_id}")
             run_ids.append(job.run_id)
-            # Generate HTML report per run
-            try:
-                runs_dir = root / "runs" / job.run_id
-                results_path = runs_dir / "results.json"
-                if results_path.exists():
-                    results = json.loads(results_path.read_text(encoding="utf-8"))
-                    templates_dir = Path(__file__).resolve().parent / "templates"
-                    rep = Reporter(templates_dir)
-                    out_html = runs_dir / "report.html"
-                    rep.write_html(results, out_html)
-                    print(f"Report: {out_html}")
-            except Exception as e:
-                print(f"Report generation failed: {e}")
+            _write_report(root, job.run_id)
 
     print("All runs:", ", ".join(run_ids))
     return 0
 
 
+def _write_report(root: Path, run_id: str) -> None:
+    # Generate HTML report per run
+    try:
+        runs_dir = root / "runs" / run_id
+        results_path = runs_dir / "results.json"
+        if results_path.exists():
+            results = json.loads(results_path.read_text(encoding="utf-8"))
+            templates_dir = Path(__file__).resolve().parent / "templates"
+            rep = Reporter(templates_dir)
+            out_html = runs_dir / "report.html"
+            rep.write_html(results, out_html)
+            print(f"Report: {out_html}")
+    except Exception as e:
+        print(f"Report generation failed: {e}")
+
+
+def cmd_resume(root: Path, run_id: str) -> int:
+    root = Path(root)
+    orch = Orchestrator(datasets_dir=root / "datasets", runs_root=root / "runs")
+    try:
+        job = orch.resume_run(run_id)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"Cannot resume {run_id}: {e}", file=sys.stderr)
+        return 2
+    import asyncio
+    asyncio.run(orch.run_job(job.job_id))
+    print(f"Run resumed: job={job.job_id} state={job.state} run_id={job.run_id}")
+    _write_report(root, job.run_id)
+    return 0 if job.state == "succeeded" else 1
+
+
+def cmd_rescore(root: Path, run_ids: List[str], metrics: Optional[List[str]], thresholds: Optional[str], workers: Optional[int]) -> int:
+    root = Path(root)
+    try:
+        thr = json.loads(thresholds) if thresholds else None
+    except Exception as e:
+        print(f"Invalid --thresholds JSON: {e}", file=sys.stderr)
+        return 2
+    try:
+        summaries = rescore_runs(root / "runs", root / "datasets", run_ids, metrics=metrics, thresholds=thr, workers=workers)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"Cannot rescore: {e}", file=sys.stderr)
+        return 2
+    for s in summaries:
+        print(f"Rescored: run_id={s['run_id']} version={s['version']} passed={s['passed']}/{s['conversations']} -> {s['path']}")
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="llm-eval-cli", description="LLM Eval CLI")
-    p.add_argument("command", choices=["init", "run", "coverage"], help="CLI command")
+    p.add_argument("command", choices=["init", "run", "resume", "rescore", "coverage"], help="CLI command")
     p.add_argument("--root", dest="root", default=str(Path.cwd()), help="Workspace root (default: CWD)")
     # run
     p.add_argument("--file", dest="file", default=None, help="Run config file (for run)")
     p.add_argument("--no-semantic", dest="no_semantic", action="store_true", help="Disable semantic metric for this run")
+    # resume
+    p.add_argument("--run-id", dest="run_id", default=None, help="Run to resume from runs/<run_id>/run_config.json (for resume); comma-separated list for rescore")
+    # rescore
+    p.add_argument("--metrics", dest="metrics", nargs="*", default=None, help="Metrics to recompute (for rescore; default: the run's own)")
+    p.add_argument("--thresholds", dest="thresholds", default=None, help='Threshold overrides as JSON, e.g. \'{"semantic": 0.75}\' (for rescore)')
+    p.add_argument("--workers", dest="workers", type=int, default=None, help="Worker processes (for rescore; default: CPU count)")
     # coverage generate options
     p.add_argument("--combined", dest="combined", action="store_true", help="Generate combined datasets (per-domain + global)")
     p.add_argument("--split", dest="split", action="store_true", help="Generate split per-behavior datasets")
@@ -207,6 +280,17 @@ def main(argv: List[str] | None = None) -> int:
             print("--file is required for run", file=sys.stderr)
             return 2
         return cmd_run(root, Path(args.file), no_semantic=args.no_semantic)
+    if args.command == "resume":
+        if not args.run_id:
+            print("--run-id is required for resume", file=sys.stderr)
+            return 2
+        return cmd_resume(root, args.run_id)
+    if args.command == "rescore":
+        if not args.run_id:
+            print("--run-id is required for rescore", file=sys.stderr)
+            return 2
+        run_ids = [r.strip() for r in args.run_id.split(",") if r.strip()]
+        return cmd_rescore(root, run_ids, args.metrics, args.thresholds, args.workers)
     if args.command == "coverage":
         return cmd_coverage_generate(
             root=root,
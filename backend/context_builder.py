@@ -5,17 +5,15 @@ import json
 # Support both package and top-level imports in tests/CLI
 try:
     from .system_prompt import build_system_prompt, DEFAULT_PARAMS  # type: ignore
+    from .token_accounting import count_tokens  # type: ignore
 except Exception:  # ImportError when run as top-level module
     from system_prompt import build_system_prompt, DEFAULT_PARAMS  # type: ignore
+    from token_accounting import count_tokens  # type: ignore
 
-# very rough token estimator (~4 chars per token)
-_DEF_TOKENS_PER_CHAR = 1 / 4.0
 
-
-def approx_tokens(text: str) -> int:
-    if not text:
-        return 0
-    return max(1, int(len(text) * _DEF_TOKENS_PER_CHAR))
+def approx_tokens(text: str, model: Optional[str] = None) -> int:
+    # Offline tokenizer for the model family (see token_accounting), cached per text hash
+    return count_tokens(text, model)
 
 
 def _render_state_summary(state: Dict[str, Any]) -> str:
@@ -23,20 +21,24 @@ def _render_state_summary(state: Dict[str, Any]) -> str:
     return json.dumps({k: v for k, v in state.items() if v not in (None, [], {})}, separators=(",", ":"))
 
 
-def _clip_text_to_tokens(text: str, max_tokens: int) -> Tuple[str, bool]:
-    if approx_tokens(text) <= max_tokens:
+def _clip_text_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> Tuple[str, bool]:
+    n = approx_tokens(text, model)
+    if n <= max_tokens:
         return text, False
     # keep tail since recent info is often at the end
-    # convert token budget to char budget
-    char_budget = max(1, int(max_tokens / _DEF_TOKENS_PER_CHAR))
+    # convert token budget to char budget using this text's own chars-per-token ratio
+    char_budget = max(1, int(len(text) * max_tokens / n))
     clipped = text[-char_budget:]
+    while char_budget > 1 and approx_tokens(clipped, model) > max_tokens:
+        char_budget = int(char_budget * 0.9)
+        clipped = text[-char_budget:]
     # mark truncation
     if len(clipped) < len(text):
         clipped = "…" + clipped
     return clipped, True
 
 
-def build_context(domain: str, turns: List[Dict[str, str]], state: Dict[str, Any], max_tokens: int = 1800, conv_meta: Optional[Dict[str, Any]] = None, params_override: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def build_context(domain: str, turns: List[Dict[str, str]], state: Dict[str, Any], max_tokens: int = 1800, conv_meta: Optional[Dict[str, Any]] = None, params_override: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> Dict[str, Any]:
     """
     Build provider-ready messages from state + fixed last 5 turns.
     Deterministic clipping: allocate a static token cap to the system message and
@@ -109,8 +111,8 @@ def build_context(domain: str, turns: List[Dict[str, str]], state: Dict[str, Any
 
     for m, cap in zip(messages, caps):
         content = m["content"]
-        clipped, did = _clip_text_to_tokens(content, cap)
-        total += approx_tokens(clipped)
+        clipped, did = _clip_text_to_tokens(content, cap, model)
+        total += approx_tokens(clipped, model)
         truncated = truncated or did
         new_messages.append({"role": m["role"], "content": clipped})
 
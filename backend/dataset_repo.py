@@ -1,7 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from .schemas import SchemaValidator
@@ -15,6 +15,10 @@ class DatasetRepository:
     def __init__(self, root_dir: Optional[Path] = None) -> None:
         self.root_dir: Path = Path(root_dir) if root_dir else DEFAULT_DATASETS_DIR
         self.sv = SchemaValidator()
+        # path -> ((mtime_ns, size), parsed json, schema errors); re-parsed only when the file changes
+        self._parsed: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any], List[str]]] = {}
+        # dataset_id -> (golden files signature, conversation_id -> golden record)
+        self._golden_indexes: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Dict[str, Any]]]] = {}
 
     # File conventions: <dataset_id>.dataset.json and <dataset_id>.golden.json
     def _dataset_files(self) -> List[Path]:
@@ -32,6 +36,42 @@ class DatasetRepository:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in {p.name}: {e}") from e
 
+    def _load_validated(self, p: Path, kind: str) -> Tuple[Dict[str, Any], List[str]]:
+        """Parsed JSON and schema errors for a dataset/golden file, cached by mtime and size."""
+        st = p.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        hit = self._parsed.get(p)
+        if hit is not None and hit[0] == key:
+            return hit[1], hit[2]
+        data = self._load_json(p)
+        errors = self.sv.validate(kind, data)
+        self._parsed[p] = (key, data, errors)
+        return data, errors
+
+    def golden_index(self, dataset_id: str) -> Dict[str, Dict[str, Any]]:
+        """conversation_id -> golden record ({dataset_id, version, entry}) for one dataset.
+
+        Built from the valid golden files whose dataset_id matches; the first entry wins,
+        like get_golden. Rebuilt only when a golden file is added, removed or modified.
+        """
+        files = self._golden_files()
+        sig = tuple((str(p), st.st_mtime_ns, st.st_size) for p, st in ((p, p.stat()) for p in files))
+        hit = self._golden_indexes.get(dataset_id)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+        index: Dict[str, Dict[str, Any]] = {}
+        for p in files:
+            golden, errors = self._load_validated(p, "golden")
+            if errors or golden.get("dataset_id") != dataset_id:
+                continue
+            header = {"dataset_id": golden.get("dataset_id"), "version": golden.get("version")}
+            for entry in golden.get("entries", []):
+                cid = entry.get("conversation_id")
+                if cid not in index:
+                    index[cid] = {**header, "entry": entry}
+        self._golden_indexes[dataset_id] = (sig, index)
+        return index
+
     def list_datasets(self) -> List[Dict[str, Any]]:
         items: List[Dict[str, Any]] = []
         golden_index = {self._load_json(p).get("dataset_id"): p for p in self._golden_files()}
@@ -78,8 +118,8 @@ class DatasetRepository:
     def get_conversation(self, conversation_id: str) -> Dict[str, Any]:
         found: Optional[Dict[str, Any]] = None
         for p in self._dataset_files():
-            data = self._load_json(p)
-            if self.sv.validate("dataset", data):
+            data, errors = self._load_validated(p, "dataset")
+            if errors:
                 continue
             for conv in data.get("conversations", []):
                 if conv.get("conversation_id") == conversation_id:
@@ -117,8 +157,8 @@ class DatasetRepository:
         found_header: Optional[Dict[str, Any]] = None
 
         for p in self._golden_files():
-            golden = self._load_json(p)
-            if self.sv.validate("golden", golden):
+            golden, errors = self._load_validated(p, "golden")
+            if errors:
                 continue
             # If we know the dataset that contains this conversation, only consider matching golden files
             if target_dataset_id and golden.get("dataset_id") != target_dataset_id:
@@ -138,8 +178,8 @@ class DatasetRepository:
             # and pick the first match deterministically.
             if not target_dataset_id:
                 for p in self._golden_files():
-                    golden = self._load_json(p)
-                    if self.sv.validate("golden", golden):
+                    golden, errors = self._load_validated(p, "golden")
+                    if errors:
                         continue
                     for entry in golden.get("entries", []):
                         if entry.get("conversation_id") == conversation_id:
@@ -0,0 +1,16 @@
+from __future__ import annotations
+from typing import List, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class Embedder(Protocol):
+    """What the semantic metric needs from an embedding backend (see shared_embeddings)."""
+
+    # identifies the vector space: persisted vectors are keyed by it
+    model: str
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+    async def aclose(self) -> None:
+        ...
@@ -0,0 +1,146 @@
+from __future__ import annotations
+import asyncio
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    from .ollama_embed import EMBED_MODEL
+    from .store import as_float32, normalize_text
+except ImportError:
+    from embeddings.ollama_embed import EMBED_MODEL
+    from embeddings.store import as_float32, normalize_text
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+class EmbeddingBatcher:
+    """Coalesces embed() calls from concurrent scorers into deduplicated, chunked batch requests.
+
+    Texts queued within EMBED_BATCH_WINDOW_MS (10) of each other, or up to EMBED_BATCH_SIZE (256) of them,
+    go out as one request to the wrapped embedder; at most EMBED_CONCURRENCY (4) requests are in flight.
+    A text already queued or in flight is not sent again: its callers share the result. Drop-in for
+    OllamaEmbeddings wherever only embed() and model are used.
+    """
+
+    def __init__(self, embedder: Any, batch_size: Optional[int] = None, concurrency: Optional[int] = None, window_ms: Optional[float] = None) -> None:
+        self.embedder = embedder
+        self.model = getattr(embedder, "model", None) or EMBED_MODEL
+        self.batch_size = batch_size or _env_int("EMBED_BATCH_SIZE", 256)
+        self.concurrency = concurrency or _env_int("EMBED_CONCURRENCY", 4)
+        if window_ms is None:
+            try:
+                window_ms = float(os.getenv("EMBED_BATCH_WINDOW_MS") or 10)
+            except ValueError:
+                window_ms = 10.0
+        self.window_s = max(0.0, window_ms) / 1000.0
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # round-trips made and texts sent, for logs and tests
+        self.requests = 0
+        self.texts_sent = 0
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        futs = []
+        for t in texts:
+            fut = self._inflight.get(t) or self._pending.get(t)
+            if fut is None:
+                fut = self._pending[t] = loop.create_future()
+                # a caller that gave up must not leave an unretrieved exception behind
+                fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+            futs.append(fut)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._pending and self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        # shielded: one cancelled caller must not cancel a vector other callers wait for
+        return list(await asyncio.gather(*[asyncio.shield(f) for f in futs]))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = dict(list(self._pending.items())[: self.batch_size])
+            for t, fut in batch.items():
+                del self._pending[t]
+                self._inflight[t] = fut
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: Dict[str, asyncio.Future]) -> None:
+        texts = list(batch)
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        try:
+            async with self._sem:
+                self.requests += 1
+                self.texts_sent += len(texts)
+                vecs = await self.embedder.embed(texts)
+            if not isinstance(vecs, list) or len(vecs) != len(texts):
+                raise RuntimeError("unexpected embedding shape")
+            for t, v in zip(texts, vecs):
+                if not batch[t].done():
+                    batch[t].set_result(v)
+        except BaseException as e:
+            err = e if isinstance(e, Exception) else RuntimeError("embedding request cancelled")
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(err)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            for t in texts:
+                self._inflight.pop(t, None)
+
+    async def aclose(self) -> None:
+        """Cancel queued and in-flight requests (end of job)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.cancel()
+        self._pending.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def prefetch_embeddings(embedder: Any, texts: Iterable[str], cache: Dict[str, List[float]], store: Any = None) -> int:
+    """Fill `cache` with vectors for `texts`: the persistent store first, then one batched embed() for the rest.
+
+    Best effort (scoring embeds whatever is still missing itself); returns how many texts were embedded.
+    Texts are normalized as semantic_similarity and the store do, so `cache` is keyed the same way.
+    """
+    todo = [t for t in dict.fromkeys(normalize_text(t) for t in texts) if t not in cache]
+    if not todo:
+        return 0
+    model = getattr(embedder, "model", None) or EMBED_MODEL
+    try:
+        if store is not None:
+            stored = await asyncio.to_thread(store.get_many, model, todo)
+            cache.update(stored)
+            todo = [t for t in todo if t not in stored]
+        if not todo:
+            return 0
+        vecs = await embedder.embed(todo)
+        if not isinstance(vecs, list) or len(vecs) != len(todo):
+            return 0
+        new = {t: as_float32(v) for t, v in zip(todo, vecs)}
+        cache.update(new)
+        if store is not None:
+            await asyncio.to_thread(store.put_many, model, new)
+        return len(todo)
+    except Exception:
+        return 0
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import re
+import unicodedata
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+LOCAL_PREFIX = "local"
+DEFAULT_DIM = 1024
+NGRAM_RANGE = (3, 5)
+
+
+def is_local_model(name: Optional[str]) -> bool:
+    return str(name or "").strip().lower().split(":", 1)[0] == LOCAL_PREFIX
+
+
+def parse_local_model(name: str) -> int:
+    """'local', 'local:ngram' or 'local:ngram-<dim>' -> vector dimension."""
+    m = re.search(r"-(\d+)$", str(name or "").strip())
+    return max(16, int(m.group(1))) if m else DEFAULT_DIM
+
+
+class HashedNgramEmbeddings:
+    """Offline, CPU-only embedder: hashed character n-grams with sublinear TF weighting, L2-normalized.
+
+    Each text is case- and accent-folded, padded per word, split into 3..5-character n-grams and hashed
+    (crc32, stable across processes) into `dim` buckets with a hash-derived sign, so collisions cancel
+    out instead of piling up. No corpus statistics (IDF) are needed, so vectors never change between
+    runs. Texts sharing wording get high cosine similarity; paraphrases with different words score lower
+    than with a neural model, so thresholds tuned on Ollama embeddings do not carry over one to one.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> None:
+        self.dim = int(dim)
+        self.ngram_range = ngram_range
+        self.model = f"{LOCAL_PREFIX}:ngram-{self.dim}"
+
+    async def aclose(self) -> None:
+        return None
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        folded = unicodedata.normalize("NFKD", (text or "").casefold())
+        folded = "".join(c for c in folded if not unicodedata.combining(c))
+        return " ".join(re.findall(r"\w+", folded))
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Bucket indices and signed, sublinear-TF weights of one text's distinct n-grams."""
+        lo, hi = self.ngram_range
+        hashes: List[int] = []
+        for word in self._normalize(text).split():
+            w = f" {word} "
+            if len(w) < lo:
+                # short words still count as one feature
+                hashes.append(zlib.crc32(w.encode("utf-8")))
+                continue
+            for n in range(lo, min(hi, len(w)) + 1):
+                hashes.extend(zlib.crc32(w[i:i + n].encode("utf-8")) for i in range(len(w) - n + 1))
+        if not hashes:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        grams, counts = np.unique(np.asarray(hashes, dtype=np.uint64), return_counts=True)
+        # sign from a hash bit the bucket does not use, so colliding n-grams tend to cancel
+        signs = np.where((grams >> np.uint64(31)) & np.uint64(1), -1.0, 1.0)
+        return (grams % np.uint64(self.dim)).astype(np.int64), signs * (1.0 + np.log(counts))
+
+    def embed_sync(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) float32 matrix of unit rows (all-zero rows for texts without word characters)."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            idx, vals = self._features(text)
+            if idx.size:
+                np.add.at(out[row], idx, vals)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_sync(list(texts)).tolist()
@@ -1,35 +1,47 @@
 from __future__ import annotations
 import time
 from typing import List
-import httpx
 import os
 
+try:
+    from ..providers.http_client import HttpClientSettings, PooledClient
+    from .base import Embedder
+    from .local_embed import HashedNgramEmbeddings, is_local_model, parse_local_model
+except ImportError:
+    from providers.http_client import HttpClientSettings, PooledClient
+    from embeddings.base import Embedder
+    from embeddings.local_embed import HashedNgramEmbeddings, is_local_model, parse_local_model
+
 EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
 
 class OllamaEmbeddings:
-    def __init__(self, host: str | None = None) -> None:
+    def __init__(self, host: str | None = None, model: str | None = None) -> None:
         self.base_url = (host or os.getenv("OLLAMA_HOST", "http://localhost:11434")).rstrip("/")
+        self.model = model or EMBED_MODEL
+        self._http = PooledClient(HttpClientSettings.from_env("EMBED", timeout_s=30.0))
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
 
     async def embed(self, texts: List[str]) -> List[List[float]]:
         # Ollama embeddings endpoint with simple retry
         url = f"{self.base_url}/api/embeddings"
-        payload = {"model": EMBED_MODEL, "input": texts}
+        payload = {"model": self.model, "input": texts}
         last_err: Exception | None = None
         for attempt in range(3):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    r = await client.post(url, json=payload)
-                    r.raise_for_status()
-                    data = r.json()
-                    # Support both single and batch formats
-                    if isinstance(data, dict) and "embeddings" in data:
-                        return data["embeddings"]
-                    if isinstance(data, dict) and "embedding" in data:
-                        return [data["embedding"]]
-                    # fallback attempt
-                    if isinstance(data, list) and data and isinstance(data[0], list):
-                        return data
-                    raise RuntimeError("unexpected embeddings response")
+                r = await self._http.get().post(url, json=payload)
+                r.raise_for_status()
+                data = r.json()
+                # Support both single and batch formats
+                if isinstance(data, dict) and "embeddings" in data:
+                    return data["embeddings"]
+                if isinstance(data, dict) and "embedding" in data:
+                    return [data["embedding"]]
+                # fallback attempt
+                if isinstance(data, list) and data and isinstance(data[0], list):
+                    return data
+                raise RuntimeError("unexpected embeddings response")
             except Exception as e:
                 last_err = e
                 # small backoff
@@ -52,3 +64,34 @@ class OllamaEmbeddings:
         if na == 0 or nb == 0:
             return 0.0
         return dot / (na * nb)
+
+
+_shared: Embedder | None = None
+_shared_key: tuple | None = None
+
+
+def shared_embeddings() -> Embedder:
+    """Process-wide embedder so semantic scoring reuses one connection pool.
+
+    EMBED_MODEL picks the backend: `local`, `local:ngram` or `local:ngram-<dim>` is the offline hashed
+    n-gram vectorizer (no network); any other name is an Ollama embedding model at OLLAMA_HOST.
+    Follows changes to either setting.
+    """
+    global _shared, _shared_key
+    model = os.getenv("EMBED_MODEL") or EMBED_MODEL
+    host = os.getenv("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
+    key = (model, None if is_local_model(model) else host)
+    if _shared is None or _shared_key != key:
+        if is_local_model(model):
+            _shared = HashedNgramEmbeddings(parse_local_model(model))
+        else:
+            _shared = OllamaEmbeddings(host, model)
+        _shared_key = key
+    return _shared
+
+
+async def aclose_shared_embeddings() -> None:
+    global _shared, _shared_key
+    emb, _shared, _shared_key = _shared, None, None
+    if emb is not None:
+        await emb.aclose()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def _unit_rows(vectors: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-normalized float64 matrix of equal-length vectors plus a mask of rows that could be normalized."""
+    m = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(m, axis=1)
+    valid = norms > 0
+    m[valid] /= norms[valid, None]
+    m[~valid] = 0.0
+    return m, valid
+
+
+class VariantMatrix:
+    """Golden variants of one turn as a pre-normalized matrix, so scoring an output is one matrix product.
+
+    Input vectors are float32 values (embeddings.store.as_float32 rounds fresh ones, the store keeps that
+    precision), so cold and warm runs score identical inputs; the product itself is computed in float64.
+    Vectors whose length differs from the first (or empty/zero ones) score 0.0, as OllamaEmbeddings.cosine did.
+    """
+
+    def __init__(self, vectors: Sequence[Sequence[float]]) -> None:
+        self.count = len(vectors)
+        self.dim = len(vectors[0]) if vectors else 0
+        self._same_dim = np.array([len(v) == self.dim for v in vectors], dtype=bool)
+        rows = [v if ok else [0.0] * self.dim for v, ok in zip(vectors, self._same_dim)]
+        if self.count and self.dim:
+            self.matrix, valid = _unit_rows(rows)
+        else:
+            self.matrix, valid = np.zeros((self.count, 0)), np.zeros(self.count, dtype=bool)
+        self._valid = valid & self._same_dim
+
+    def scores(self, outputs: Sequence[Sequence[float]]) -> np.ndarray:
+        """(len(outputs), count) cosine similarities of each output against every variant."""
+        out = np.zeros((len(outputs), self.count), dtype=np.float64)
+        ok = [i for i, o in enumerate(outputs) if len(o) == self.dim and self.dim > 0]
+        if not ok or not self._valid.any():
+            return out
+        units, valid = _unit_rows([outputs[i] for i in ok])
+        sims = units @ self.matrix.T
+        sims[:, ~self._valid] = 0.0
+        sims[~valid, :] = 0.0
+        out[ok] = sims
+        return out
+
+
+def score_pairs(pairs: Sequence[Tuple[VariantMatrix, Sequence[float]]]) -> List[np.ndarray]:
+    """Scores of many (variant matrix, output vector) pairs, e.g. every turn of a conversation, in one product.
+
+    The distinct matrices are stacked and all outputs multiplied against the stack at once; each pair
+    keeps the slice of its own matrix. Same values as vm.scores([output])[0] per pair.
+    """
+    results = [np.zeros(vm.count, dtype=np.float64) for vm, _ in pairs]
+    # outputs are grouped by dimension: normally one group, only mismatched embedders make more
+    by_dim: Dict[int, List[int]] = {}
+    for i, (vm, out) in enumerate(pairs):
+        if vm.dim > 0 and len(out) == vm.dim and vm._valid.any():
+            by_dim.setdefault(vm.dim, []).append(i)
+    for idxs in by_dim.values():
+        offsets: Dict[int, int] = {}
+        blocks: List[np.ndarray] = []
+        rows = 0
+        for i in idxs:
+            vm = pairs[i][0]
+            if id(vm) not in offsets:
+                offsets[id(vm)] = rows
+                blocks.append(vm.matrix)
+                rows += vm.count
+        units, valid = _unit_rows([pairs[i][1] for i in idxs])
+        sims = units @ np.vstack(blocks).T
+        for row, i in enumerate(idxs):
+            if not valid[row]:
+                continue
+            vm = pairs[i][0]
+            start = offsets[id(vm)]
+            res = sims[row, start:start + vm.count].copy()
+            res[~vm._valid] = 0.0
+            results[i] = res
+    return results
+
+
+def best_match(scores: Sequence[float]) -> Tuple[int, float]:
+    """(index, score) of the first maximum above -1.0, else (-1, -1.0): the same pick as a running `>` scan."""
+    best_idx, best_score = -1, -1.0
+    if len(scores):
+        i = int(np.argmax(scores))
+        if scores[i] > best_score:
+            best_idx, best_score = i, float(scores[i])
+    return best_idx, best_score
+
+
+def variant_matrix(matrices: Dict[Tuple[str, ...], VariantMatrix], variants: List[str], vectors: List[List[float]]) -> VariantMatrix:
+    """Matrix of a variant list, built once per list and reused from `matrices` (one dict per dataset/job)."""
+    key = tuple(variants)
+    vm = matrices.get(key)
+    if vm is None:
+        vm = matrices[key] = VariantMatrix(vectors)
+    return vm
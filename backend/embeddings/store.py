@@ -0,0 +1,172 @@
+from __future__ import annotations
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# last_used is only rewritten when older than this, so cache hits stay (almost) read-only
+TOUCH_INTERVAL_S = 300.0
+# SQLite's default bound-parameter limit is 999
+_CHUNK = 500
+# puts between full reconcile sweeps (exact size total); in between, a running total decides eviction
+SWEEP_EVERY = 256
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC with whitespace runs collapsed and trimmed: texts that differ only in spacing share a vector."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def as_float32(vec: List[float]) -> List[float]:
+    """`vec` rounded to float32, the precision the store keeps.
+
+    Fresh vectors go through this before they are cached or scored, so a run embedding a text and a
+    later run reading it back from the store score exactly the same values.
+    """
+    return array("f", vec).tolist()
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """SQLite store of float32 embedding vectors keyed by (embed model, normalized text hash).
+
+    Shared by every run (and rescore worker process) using the same file: WAL mode lets readers proceed
+    while one writer inserts. Rows are evicted least recently used first once the vectors exceed max_bytes.
+    """
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("EMBED_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        # running size of the stored vectors; other processes sharing the file can make it drift,
+        # which the periodic sweep corrects
+        self._total = 0
+        self._puts = 0
+        with closing(self._connect()) as con, con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vec BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, key)
+                )
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+            self._total = con.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(str(self.path), timeout=10.0)
+        con.execute("PRAGMA journal_mode=WAL")
+        return con
+
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """Stored vectors of the given texts (text -> vector); texts without one are left out."""
+        by_key: Dict[str, List[str]] = {}
+        for t in texts:
+            by_key.setdefault(text_key(t), []).append(t)
+        if not by_key:
+            return {}
+        now = time.time()
+        out: Dict[str, List[float]] = {}
+        stale: List[str] = []
+        keys = list(by_key)
+        with closing(self._connect()) as con:
+            for i in range(0, len(keys), _CHUNK):
+                part = keys[i:i + _CHUNK]
+                rows = con.execute(
+                    f"SELECT key, vec, last_used FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(part))})",
+                    (model, *part),
+                ).fetchall()
+                for key, blob, last_used in rows:
+                    vec = array("f")
+                    vec.frombytes(blob)
+                    for t in by_key[key]:
+                        out[t] = vec.tolist()
+                    if now - last_used > TOUCH_INTERVAL_S:
+                        stale.append(key)
+            if stale:
+                with self._lock, con:
+                    con.executemany("UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?", [(now, model, k) for k in stale])
+        return out
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        if not vectors:
+            return
+        now = time.time()
+        rows = []
+        for text, vec in vectors.items():
+            blob = array("f", vec).tobytes()
+            rows.append((model, text_key(text), len(vec), blob, now, now))
+        keys = list({r[1] for r in rows})
+        added = sum(len(r[3]) for r in {r[1]: r for r in rows}.values())
+        with self._lock, closing(self._connect()) as con, con:
+            replaced = 0
+            for i in range(0, len(keys), _CHUNK):
+                part = keys[i:i + _CHUNK]
+                replaced += con.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(part))})",
+                    (model, *part),
+                ).fetchone()[0]
+            con.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, dim, vec, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._total += added - replaced
+            self._puts += 1
+            if self._total > self.max_bytes or self._puts >= SWEEP_EVERY:
+                self._evict(con)
+
+    def _evict(self, con: sqlite3.Connection) -> None:
+        """Resync the running total, then drop least recently used rows until under max_bytes."""
+        self._puts = 0
+        total = con.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for model, key, size in con.execute("SELECT model, key, LENGTH(vec) FROM embeddings ORDER BY last_used ASC"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((model, key))
+            freed += size
+        con.executemany("DELETE FROM embeddings WHERE model = ? AND key = ?", doomed)
+        self._total = total - freed
+
+    def stats(self) -> Dict[str, int]:
+        with closing(self._connect()) as con:
+            n, size = con.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()
+        return {"entries": int(n), "bytes": int(size)}
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+
+
+def embedding_store_for(runs_root: Path) -> Optional[EmbeddingStore]:
+    """Process-wide store at EMBED_CACHE_PATH (default <runs_root>/embed_cache.sqlite3); None when EMBED_CACHE=off."""
+    if str(os.getenv("EMBED_CACHE", "on")).strip().lower() in ("0", "off", "false", "no"):
+        return None
+    path = str(Path(os.getenv("EMBED_CACHE_PATH") or Path(runs_root) / "embed_cache.sqlite3").resolve())
+    if path not in _stores:
+        try:
+            _stores[path] = EmbeddingStore(Path(path))
+        except Exception:
+            return None
+    return _stores[path]
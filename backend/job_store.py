@@ -0,0 +1,120 @@
+from __future__ import annotations
+import json
+import sqlite3
+import uuid
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Job states that still need the scheduler after a restart
+PENDING_STATES = ("queued", "running", "paused", "cancelling")
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobStore:
+    """SQLite-backed record of submitted jobs so queued and interrupted work survives restarts.
+
+    One row per job: what to run (kind, dataset, models, config), where (vertical),
+    its priority and last known state. `seq` preserves submission order.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as con, con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT UNIQUE NOT NULL,
+                    vertical TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    dataset_id TEXT,
+                    model_specs TEXT NOT NULL,
+                    config TEXT NOT NULL,
+                    run_id TEXT,
+                    priority INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(str(self.path), timeout=10.0)
+        con.row_factory = sqlite3.Row
+        return con
+
+    @staticmethod
+    def _row(r: sqlite3.Row) -> Dict[str, Any]:
+        d = dict(r)
+        d["model_specs"] = json.loads(d.get("model_specs") or "[]")
+        d["config"] = json.loads(d.get("config") or "{}")
+        return d
+
+    def next_job_id(self) -> str:
+        """Globally unique job id (across verticals and restarts).
+
+        Reserves a placeholder row so the id comes from the AUTOINCREMENT key, which SQLite never
+        hands out twice even to concurrent connections; add() later fills the row in.
+        """
+        now = _now_iso()
+        with closing(self._connect()) as con, con:
+            cur = con.execute(
+                "INSERT INTO jobs (job_id, vertical, kind, model_specs, config, priority, state, created_at, updated_at)"
+                " VALUES (?, '', '', '[]', '{}', 0, 'reserved', ?, ?)",
+                (f"reserved-{uuid.uuid4().hex}", now, now),
+            )
+            job_id = f"job-{int(cur.lastrowid):04d}"
+            con.execute("UPDATE jobs SET job_id = ? WHERE seq = ?", (job_id, cur.lastrowid))
+        return job_id
+
+    def release(self, job_id: str) -> None:
+        """Drop a reserved id whose submission was rejected (rows of added jobs are kept)."""
+        with closing(self._connect()) as con, con:
+            con.execute("DELETE FROM jobs WHERE job_id = ? AND state = 'reserved'", (job_id,))
+
+    def add(
+        self,
+        *,
+        job_id: str,
+        vertical: str,
+        kind: str,
+        dataset_id: Optional[str],
+        model_specs: List[str],
+        config: Dict[str, Any],
+        run_id: Optional[str],
+        priority: int,
+        state: str = "queued",
+    ) -> None:
+        now = _now_iso()
+        with closing(self._connect()) as con, con:
+            con.execute(
+                "INSERT INTO jobs (job_id, vertical, kind, dataset_id, model_specs, config, run_id, priority, state, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(job_id) DO UPDATE SET vertical = excluded.vertical, kind = excluded.kind,"
+                " dataset_id = excluded.dataset_id, model_specs = excluded.model_specs, config = excluded.config,"
+                " run_id = excluded.run_id, priority = excluded.priority, state = excluded.state, updated_at = excluded.updated_at",
+                (job_id, vertical, kind, dataset_id, json.dumps(model_specs), json.dumps(config), run_id, int(priority), state, now, now),
+            )
+
+    def update_state(self, job_id: str, state: str) -> None:
+        with closing(self._connect()) as con, con:
+            con.execute("UPDATE jobs SET state = ?, updated_at = ? WHERE job_id = ?", (state, _now_iso(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as con:
+            r = con.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row(r) if r else None
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Jobs not yet finished, in submission order."""
+        marks = ",".join("?" for _ in PENDING_STATES)
+        with closing(self._connect()) as con:
+            rows = con.execute(f"SELECT * FROM jobs WHERE state IN ({marks}) ORDER BY seq", PENDING_STATES).fetchall()
+        return [self._row(r) for r in rows]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import math
+from typing import Any, Dict, List, Optional
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (q in 0..100) of unsorted values; None when empty."""
+    if not values:
+        return None
+    xs = sorted(values)
+    pos = (len(xs) - 1) * q / 100.0
+    lo, hi = math.floor(pos), math.ceil(pos)
+    if lo == hi:
+        return float(xs[lo])
+    return xs[lo] + (xs[hi] - xs[lo]) * (pos - lo)
+
+
+def summarize(values: List[float]) -> Optional[Dict[str, Any]]:
+    """{count, p50, p95, p99} of the values, or None when there are none."""
+    vals = [float(v) for v in values if v is not None]
+    if not vals:
+        return None
+    out: Dict[str, Any] = {"count": len(vals)}
+    for q in PERCENTILES:
+        out[f"p{q}"] = round(percentile(vals, q), 2)  # type: ignore[arg-type]
+    return out
+
+
+def turn_timing(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Timing sample of one turn record, or None when it must not count towards latency stats.
+
+    Failed turns, response-cache hits (which replay a stored latency) and cold starts (the call had to
+    load the model first, see cold_start_ms) are excluded.
+    """
+    resp = rec.get("response") or {}
+    if resp.get("ok") is not True or resp.get("cache") == "hit":
+        return None
+    meta = resp.get("provider_meta") or {}
+    if meta.get("cold_start"):
+        return None
+    tps = meta.get("stream_tokens_per_sec")
+    if tps is None:
+        tps = (rec.get("usage") or {}).get("output_tokens_per_sec")
+    sample = {
+        "latency_ms": resp.get("latency_ms"),
+        "ttft_ms": meta.get("ttft_ms"),
+        "tokens_per_sec": tps,
+    }
+    if meta.get("endpoint"):
+        sample["endpoint"] = meta["endpoint"]
+    return sample
+
+
+def cold_start_ms(rec: Dict[str, Any]) -> Optional[float]:
+    """Model load time of a turn that paid a cold start (provider_meta.cold_start), else None."""
+    resp = rec.get("response") or {}
+    meta = resp.get("provider_meta") or {}
+    if resp.get("cache") == "hit" or not meta.get("cold_start"):
+        return None
+    return float(meta.get("load_ms") or 0)
+
+
+def latency_summary(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-model percentiles over turn timing samples: latency_ms, ttft_ms (streamed turns) and tokens_per_sec."""
+    return {
+        "turns": len(samples),
+        "latency_ms": summarize([s.get("latency_ms") for s in samples]),
+        "ttft_ms": summarize([s.get("ttft_ms") for s in samples]),
+        "tokens_per_sec": summarize([s.get("tokens_per_sec") for s in samples]),
+    }
@@ -1,12 +1,21 @@
 from __future__ import annotations
+import asyncio
 import os
 import re
 from typing import Dict, List, Tuple, Optional
 
 try:
-    from .embeddings.ollama_embed import OllamaEmbeddings
+    from .embeddings.ollama_embed import EMBED_MODEL, shared_embeddings
+    from .embeddings.base import Embedder
+    from .embeddings.store import EmbeddingStore, as_float32, normalize_text
+    from .embeddings.similarity import VariantMatrix, best_match, score_pairs, variant_matrix
+    from .telemetry import EMBED_CACHE
 except ImportError:
-    from embeddings.ollama_embed import OllamaEmbeddings
+    from embeddings.ollama_embed import EMBED_MODEL, shared_embeddings
+    from embeddings.base import Embedder
+    from embeddings.store import EmbeddingStore, as_float32, normalize_text
+    from embeddings.similarity import VariantMatrix, best_match, score_pairs, variant_matrix
+    from telemetry import EMBED_CACHE
 
 
 def _normalize_text(s: str) -> str:
@@ -30,59 +39,111 @@ def exact_match(output: str, variants: List[str]) -> Dict[str, object]:
 async def semantic_similarity(
     output: str,
     variants: List[str],
-    embedder: Optional[OllamaEmbeddings] = None,
+    embedder: Optional[Embedder] = None,
     threshold: Optional[float] = None,
     cache: Optional[Dict[str, List[float]]] = None,
+    store: Optional[EmbeddingStore] = None,
+    matrices: Optional[Dict[Tuple[str, ...], VariantMatrix]] = None,
 ) -> Dict[str, object]:
     """Compute semantic similarity via embeddings.
 
     - Respects threshold argument, else falls back to SEMANTIC_THRESHOLD env (default 0.80)
     - Uses an optional cache dict[text] = embedding to avoid repeat calls within a run
+    - Then an optional persistent EmbeddingStore shared across runs; new vectors are written back to it
+    - Variants are scored as one pre-normalized matrix, reused across calls through `matrices` (per dataset)
     - Gracefully returns skipped=true if embeddings are unavailable
     """
+    results = await semantic_similarity_many(
+        [(output, variants)], embedder=embedder, threshold=threshold, cache=cache, store=store, matrices=matrices
+    )
+    return results[0]
+
+
+async def semantic_similarity_many(
+    items: List[Tuple[str, List[str]]],
+    embedder: Optional[Embedder] = None,
+    threshold: Optional[float] = None,
+    cache: Optional[Dict[str, List[float]]] = None,
+    store: Optional[EmbeddingStore] = None,
+    matrices: Optional[Dict[Tuple[str, ...], VariantMatrix]] = None,
+) -> List[Dict[str, object]]:
+    """semantic_similarity for many (output, variants) pairs, e.g. every turn of a conversation.
+
+    Missing vectors are looked up and embedded together, and all outputs are scored in one matrix product.
+    Texts are embedded and cached in their normalized form (embeddings.store.normalize_text), the same
+    form the persistent store keys on, so the in-memory cache and the store agree on what is a hit.
+    """
+    items = [(normalize_text(o), [normalize_text(v) for v in (vs or [])]) for o, vs in items]
     thr = threshold if threshold is not None else float(os.getenv("SEMANTIC_THRESHOLD", "0.80"))
-    texts: List[str] = [output] + list(variants or [])
-    if not variants:
-        return {"metric": "semantic", "pass": False, "skipped": True, "reason": "no variants"}
+    results: List[Optional[Dict[str, object]]] = [None] * len(items)
+    todo: List[int] = []
+    for i, (output, variants) in enumerate(items):
+        if not variants:
+            results[i] = {"metric": "semantic", "pass": False, "skipped": True, "reason": "no variants"}
+        else:
+            todo.append(i)
+    if not todo:
+        return results  # type: ignore[return-value]
 
-    emb = embedder or OllamaEmbeddings()
+    emb = embedder or shared_embeddings()
     cache = cache if cache is not None else {}
+    matrices = matrices if matrices is not None else {}
+
+    def _skip_all(reason: str) -> List[Dict[str, object]]:
+        for i in todo:
+            results[i] = {"metric": "semantic", "pass": False, "skipped": True, "reason": reason}
+        return results  # type: ignore[return-value]
 
+    texts: List[str] = [t for i in todo for t in [items[i][0], *items[i][1]]]
     # Prepare to embed missing texts using cache
-    to_embed: List[str] = []
-    for t in texts:
-        if t not in cache:
-            to_embed.append(t)
+    to_embed: List[str] = [t for t in texts if t not in cache]
+    model = getattr(emb, "model", None) or EMBED_MODEL
     try:
+        if to_embed and store is not None:
+            try:
+                stored = await asyncio.to_thread(store.get_many, model, to_embed)
+            except Exception:
+                stored = {}
+            cache.update(stored)
+            to_embed = [t for t in to_embed if t not in stored]
+        EMBED_CACHE.inc(len(texts) - len(to_embed), result="hit")
+        EMBED_CACHE.inc(len(to_embed), result="miss")
         if to_embed:
             vecs_new = await emb.embed(to_embed)
             if not isinstance(vecs_new, list) or len(vecs_new) != len(to_embed):
-                return {"metric": "semantic", "pass": False, "skipped": True, "reason": "unexpected embedding shape"}
+                return _skip_all("unexpected embedding shape")
+            vecs_new = [as_float32(v) for v in vecs_new]
             for t, v in zip(to_embed, vecs_new):
                 cache[t] = v
+            if store is not None:
+                try:
+                    await asyncio.to_thread(store.put_many, model, dict(zip(to_embed, vecs_new)))
+                except Exception:
+                    pass
         # Gather vectors
-        out_vec = cache.get(output)
-        var_vecs = [cache.get(v) for v in variants]
-        if out_vec is None or any(vv is None for vv in var_vecs):
-            return {"metric": "semantic", "pass": False, "skipped": True, "reason": "embedding cache miss"}
-        scores: List[float] = []
-        best_idx = -1
-        best_score = -1.0
-        for i, v in enumerate(var_vecs):
-            sc = OllamaEmbeddings.cosine(out_vec, v)  # type: ignore[arg-type]
-            scores.append(sc)
-            if sc > best_score:
-                best_score = sc
-                best_idx = i
-        passed = best_score >= thr
-        return {
-            "metric": "semantic",
-            "pass": passed,
-            "score_max": best_score,
-            "threshold": thr,
-            "scores": scores,
-            "best_variant_index": best_idx,
-        }
+        pairs = []
+        scored: List[int] = []
+        for i in todo:
+            output, variants = items[i]
+            out_vec = cache.get(output)
+            var_vecs = [cache.get(v) for v in variants]
+            if out_vec is None or any(vv is None for vv in var_vecs):
+                results[i] = {"metric": "semantic", "pass": False, "skipped": True, "reason": "embedding cache miss"}
+                continue
+            pairs.append((variant_matrix(matrices, list(variants), var_vecs), out_vec))  # type: ignore[arg-type]
+            scored.append(i)
+        for i, row in zip(scored, score_pairs(pairs)):
+            scores: List[float] = row.tolist()
+            best_idx, best_score = best_match(scores)
+            results[i] = {
+                "metric": "semantic",
+                "pass": best_score >= thr,
+                "score_max": best_score,
+                "threshold": thr,
+                "scores": scores,
+                "best_variant_index": best_idx,
+            }
+        return results  # type: ignore[return-value]
     except Exception as e:
         # Graceful skip on embed failure
-        return {"metric": "semantic", "pass": False, "skipped": True, "reason": f"embeddings unavailable: {str(e)}"}
+        return _skip_all(f"embeddings unavailable: {str(e)}")
@@ -2,6 +2,8 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import os
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -10,32 +12,164 @@ from typing import Any, Dict, List, Optional
 try:
     from .dataset_repo import DatasetRepository
     from .turn_runner import TurnRunner
-    from .artifacts import RunArtifactWriter
-    from .metrics import exact_match, semantic_similarity
+    from .artifacts import JobStatusChannel, RunArtifactWriter, RunFolderLayout
+    from .metrics import exact_match, semantic_similarity_many
     from .metrics_extra import consistency, adherence, hallucination
     from .conversation_scoring import aggregate_conversation
+    from .token_accounting import tokens_per_sec, turn_usage
+    from .latency_stats import cold_start_ms, latency_summary, summarize, turn_timing
+    from .response_cache import normalize_cache_mode
+    from .telemetry import CONVERSATIONS_ACTIVE, CONVERSATIONS_WAITING
+    from .embeddings.store import EmbeddingStore, embedding_store_for
+    from .embeddings.batching import EmbeddingBatcher, prefetch_embeddings
+    from .embeddings.ollama_embed import shared_embeddings
 except ImportError:  # test fallback
     from backend.dataset_repo import DatasetRepository
     from backend.turn_runner import TurnRunner
-    from backend.artifacts import RunArtifactWriter
-    from backend.metrics import exact_match, semantic_similarity
+    from backend.artifacts import JobStatusChannel, RunArtifactWriter, RunFolderLayout
+    from backend.metrics import exact_match, semantic_similarity_many
     from backend.metrics_extra import consistency, adherence, hallucination
     from backend.conversation_scoring import aggregate_conversation
+    from backend.token_accounting import tokens_per_sec, turn_usage
+    from backend.latency_stats import cold_start_ms, latency_summary, summarize, turn_timing
+    from backend.response_cache import normalize_cache_mode
+    from backend.telemetry import CONVERSATIONS_ACTIVE, CONVERSATIONS_WAITING
+    from backend.embeddings.store import EmbeddingStore, embedding_store_for
+    from backend.embeddings.batching import EmbeddingBatcher, prefetch_embeddings
+    from backend.embeddings.ollama_embed import shared_embeddings
 
 
 JobState = str  # 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled'
 
+# Conversations executed at once per job unless config.context.max_concurrency says otherwise
+DEFAULT_MAX_CONCURRENCY = 1
+# Context keys that only affect how a run executes, not what it measures; excluded from run_id
+EXECUTION_CONTEXT_KEYS = ("max_concurrency", "model_concurrency", "response_cache", "stream", "hedge", "warmup")
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+METRIC_ALIASES = {
+    "exact_match": "exact",
+    "exact": "exact",
+    "semantic_similarity": "semantic",
+    "semantic": "semantic",
+    "consistency": "consistency",
+    "adherence": "adherence",
+    "hallucination": "hallucination",
+}
+
+
+def normalize_metrics(wanted: Optional[List[str]]) -> List[str]:
+    out: List[str] = []
+    for name in list(wanted or ["exact"]):  # default to exact only
+        norm = METRIC_ALIASES.get(str(name))
+        if norm and norm not in out:
+            out.append(norm)
+    return out
+
+
+def _slugify(text: str) -> str:
+    t = (text or "").lower()
+    t = re.sub(r"[^a-z0-9]+", "-", t).strip("-")
+    return t[:80]
+
+
+def _snippet(t: str, n: int = 160) -> str:
+    t = (t or "").strip().replace("\n", " ")
+    return t if len(t) <= n else (t[: n - 1] + "…")
+
+
+def conversation_identity(ds: Dict[str, Any], conv_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Human-friendly identity fields for a conversation (used in results and CSV)."""
+    meta_ds = ds.get("metadata", {}) or {}
+    meta = (conv_obj.get("metadata") or {}) if isinstance(conv_obj.get("metadata"), dict) else {}
+    d = meta.get("domain") or meta_ds.get("domain")
+    b = meta.get("behavior") or meta_ds.get("behavior")
+    s = meta.get("scenario") or meta.get("case")
+    persona = meta.get("persona")
+    locale = meta.get("locale")
+    channel = meta.get("channel")
+    complexity = meta.get("complexity") or meta_ds.get("difficulty")
+    case_type = meta.get("case_type") or meta.get("type")
+    title = conv_obj.get("title") or (
+        (f"{b}: {s}" if b and s else (b or s)) if (b or s) else None
+    ) or conv_obj.get("conversation_id")
+    parts = [p for p in [d, b, s, persona, locale] if p]
+    slug = _slugify("-".join(parts)) if parts else _slugify(conv_obj.get("conversation_id", "conv"))
+    return {
+        "conversation_slug": slug,
+        "conversation_title": title,
+        "domain": d,
+        "behavior": b,
+        "scenario": s,
+        "persona": persona,
+        "locale": locale,
+        "channel": channel,
+        "complexity": complexity,
+        "case_type": case_type,
+    }
+
+
+def merge_results(*, run_id: str, dataset: Dict[str, Any], model_spec: Optional[str], entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cheap final merge of scored conversation entries into the results.json shape."""
+    results: Dict[str, Any] = {
+        "run_id": run_id,
+        "dataset_id": dataset.get("dataset_id"),
+        "model_spec": model_spec,
+        "conversations": [e.get("conversation") for e in entries],
+    }
+    # include dataset/domain short description if present
+    try:
+        results["domain_description"] = (dataset.get("metadata", {}) or {}).get("short_description")
+    except Exception:
+        pass
+    results["input_tokens_total"] = int(sum(int(e.get("input_tokens") or 0) for e in entries))
+    results["output_tokens_total"] = int(sum(int(e.get("output_tokens") or 0) for e in entries))
+    results["generation_ms_total"] = int(sum(int(e.get("generation_ms") or 0) for e in entries))
+    results["output_tokens_per_sec"] = tokens_per_sec(results["output_tokens_total"], results["generation_ms_total"])
+    results["response_cache"] = {
+        "hits": int(sum(int(e.get("cache_hits") or 0) for e in entries)),
+        "misses": int(sum(int(e.get("cache_misses") or 0) for e in entries)),
+    }
+    # p50/p95/p99 of latency, TTFT (streamed turns) and tokens/sec; cache hits and failed turns excluded
+    samples = [s for e in entries for s in (e.get("timings") or [])]
+    results["latency"] = latency_summary(samples)
+    by_endpoint: Dict[str, List[Dict[str, Any]]] = {}
+    for s in samples:
+        if s.get("endpoint"):
+            by_endpoint.setdefault(s["endpoint"], []).append(s)
+    if by_endpoint:
+        # only present when the provider routed over several endpoints
+        results["latency_by_endpoint"] = {url: latency_summary(v) for url, v in sorted(by_endpoint.items())}
+    # turns that had to load the model first: left out of `latency`, their load time reported here
+    loads = [ms for e in entries for ms in (e.get("cold_starts") or [])]
+    results["cold_starts"] = {"turns": len(loads), "load_ms": summarize(loads)}
+    provider_turns = int(sum(len(e.get("timings") or []) for e in entries))
+    fired = int(sum(int((e.get("hedge") or {}).get("fired") or 0) for e in entries))
+    results["hedging"] = {
+        "hedged_turns": fired,
+        "hedge_wins": int(sum(int((e.get("hedge") or {}).get("hedge_won") or 0) for e in entries)),
+        "saved_ms_est": int(sum(int((e.get("hedge") or {}).get("saved_ms_est") or 0) for e in entries)),
+        "extra_load_fraction": round(fired / provider_turns, 4) if provider_turns else 0.0,
+    }
+    return results
+
+
+def _measured_context(context: Any) -> Any:
+    if not isinstance(context, dict):
+        return context
+    return {k: v for k, v in context.items() if k not in EXECUTION_CONTEXT_KEYS}
+
+
 def compute_run_id(dataset_id: str, dataset_version: str, model_spec: str, config: Dict[str, Any]) -> str:
     # Deterministic checksum of relevant config fields
     relevant = {
         "metrics": config.get("metrics"),
         "thresholds": config.get("thresholds"),
-        "context": config.get("context"),
+        "context": _measured_context(config.get("context")),
     }
     blob = json.dumps(relevant, sort_keys=True).encode("utf-8")
     cksum = hashlib.sha256(blob).hexdigest()[:8]
@@ -43,6 +177,87 @@ def compute_run_id(dataset_id: str, dataset_version: str, model_spec: str, confi
     return f"{dataset_id}-{dataset_version}-{safe_model}-{cksum}"
 
 
+def compute_matrix_run_id(dataset_id: str, dataset_version: str, model_specs: List[str], config: Dict[str, Any]) -> str:
+    # Same checksum inputs as compute_run_id, plus the model list
+    relevant = {
+        "models": list(model_specs),
+        "metrics": config.get("metrics"),
+        "thresholds": config.get("thresholds"),
+        "context": _measured_context(config.get("context")),
+    }
+    blob = json.dumps(relevant, sort_keys=True).encode("utf-8")
+    cksum = hashlib.sha256(blob).hexdigest()[:8]
+    return f"{dataset_id}-{dataset_version}-matrix-{cksum}"
+
+
+def matrix_summary(run_id: str, dataset: Dict[str, Any], per_model: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Side-by-side summary of a matrix job: one column per model."""
+    models: List[Dict[str, Any]] = []
+    by_conversation: Dict[str, Dict[str, Any]] = {}
+    for spec, res in per_model.items():
+        convs = res.get("conversations", []) or []
+        passed = sum(1 for c in convs if (c.get("summary") or {}).get("conversation_pass") is True)
+        turns = [t for c in convs for t in (c.get("turns") or [])]
+        turns_passed = sum(1 for t in turns if t.get("turn_pass"))
+        models.append({
+            "model_spec": spec,
+            "run_id": res.get("run_id"),
+            "conversations": len(convs),
+            "conversations_passed": passed,
+            "pass_rate": (passed / len(convs)) if convs else 0.0,
+            "turn_pass_rate": (turns_passed / len(turns)) if turns else 0.0,
+            "input_tokens_total": res.get("input_tokens_total"),
+            "output_tokens_total": res.get("output_tokens_total"),
+            "output_tokens_per_sec": res.get("output_tokens_per_sec"),
+            "latency": res.get("latency"),
+        })
+        for c in convs:
+            by_conversation.setdefault(c.get("conversation_id"), {})[spec] = (c.get("summary") or {}).get("conversation_pass")
+    return {
+        "run_id": run_id,
+        "dataset_id": dataset.get("dataset_id"),
+        "dataset_version": dataset.get("version"),
+        "models": models,
+        "conversations": [{"conversation_id": cid, "pass_by_model": v} for cid, v in by_conversation.items()],
+    }
+
+
+def _set_event() -> asyncio.Event:
+    ev = asyncio.Event()
+    ev.set()
+    return ev
+
+
+@dataclass
+class SharedRunState:
+    """Per-job state shared by every model run: parsed dataset, golden lookups, embedding caches."""
+    dataset: Dict[str, Any]
+    domain: str
+    metrics_wanted: List[str]
+    params_override: Optional[Dict[str, Any]] = None
+    # conversation_id -> golden record for this dataset (see DatasetRepository.golden_index)
+    goldens: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Simple per-job embedding cache for semantic metric
+    embed_cache: Dict[str, List[float]] = field(default_factory=dict)
+    # golden variant list -> pre-normalized embedding matrix for semantic scoring (see embeddings.similarity)
+    golden_matrices: Dict[Any, Any] = field(default_factory=dict)
+    # persistent embeddings shared across runs (None: per-job cache only)
+    embed_store: Optional[EmbeddingStore] = None
+    # EmbeddingBatcher coalescing the job's embedding requests (None: semantic_similarity's default embedder)
+    embedder: Optional[Any] = None
+    scored_total: int = 0
+    # provider response cache mode: read-write | read-only | bypass
+    cache_mode: str = "bypass"
+    # config.context.stream: stream provider replies to measure TTFT (None: PROVIDER_STREAM env)
+    stream: Optional[bool] = None
+    # config.context.hedge: hedge slow provider calls (None: PROVIDER_HEDGE env)
+    hedge: Optional[bool] = None
+    # config.thresholds of the job (semantic, hallucination_threshold, ...)
+    thresholds: Dict[str, Any] = field(default_factory=dict)
+    # config.context.warmup: load the model before the first turn (None: PROVIDER_WARMUP env, on by default)
+    warmup: Optional[bool] = None
+
+
 @dataclass
 class JobRecord:
     job_id: str
@@ -55,9 +270,241 @@ class JobRecord:
     total_conversations: int = 0
     completed_conversations: int = 0
     error: Optional[str] = None
+    # True when re-submitted via resume_run: successful turn artifacts on disk are reused
+    resume: bool = False
+    # Matrix jobs: model_spec -> per-model run_id
+    model_runs: Dict[str, str] = field(default_factory=dict)
     _task: Optional[asyncio.Task] = None
     _cancel: bool = False
-    _pause: bool = False
+    # Set while the job may proceed; paused conversations wait on it without polling
+    _unpaused: asyncio.Event = field(default_factory=_set_event)
+
+
+def golden_variant_texts(goldens: Dict[str, Dict[str, Any]], conversation_ids: Optional[List[str]] = None) -> List[str]:
+    """Distinct expected-variant texts of the golden index (optionally only some conversations), for embedding up front."""
+    ids = conversation_ids if conversation_ids is not None else list(goldens)
+    out: Dict[str, None] = {}
+    for cid in ids:
+        g = goldens.get(cid) or {}
+        for t in (g.get("entry", {}) or {}).get("turns", []) or []:
+            for v in ((t.get("expected") or {}).get("variants") or []):
+                if isinstance(v, str):
+                    out[v] = None
+    return list(out)
+
+
+def semantic_texts(shared: SharedRunState, conv: Dict[str, Any], turn_records: List[Dict[str, Any]]) -> List[str]:
+    """Every text the semantic metric will embed for one conversation: its golden variants and the turn outputs."""
+    if "semantic" not in shared.metrics_wanted:
+        return []
+    variants = golden_variant_texts(shared.goldens, [conv.get("conversation_id")])
+    if not variants:
+        return []
+    outputs = [((rec.get("response") or {}).get("content")) or "" for rec in turn_records]
+    return variants + outputs
+
+
+def _expected_variants(golden_entry: Dict[Any, Any], uidx: int) -> List[str]:
+    """Golden variants of the assistant reply to user turn `uidx`."""
+    # Robust mapping of user turn index -> assistant turn index in golden
+    # Preferred (convgen_v2): A1=1, A2=3 => assistant_idx = 2*uidx + 1
+    for ax in (2 * uidx + 1, uidx + 1, uidx):
+        if ax in golden_entry:
+            return golden_entry[ax]
+    return []
+
+
+async def score_conversation(
+    runs_root: Path,
+    run_id: str,
+    shared: SharedRunState,
+    conv: Dict[str, Any],
+    turn_records: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Score one finished conversation from its turn records (in memory or read back from disk).
+
+    Used by the orchestrator while a run executes and by offline re-scoring (see rescore.py).
+
+    Returns {"conversation": <results.json entry>, "input_tokens": int, "output_tokens": int, "generation_ms": int,
+    "cache_hits": int, "cache_misses": int, "timings": [per-turn latency samples], "cold_starts": [model load ms of cold turns],
+    "hedge": {fired, hedge_won, saved_ms_est}}.
+    """
+    ds = shared.dataset
+    metrics_wanted = shared.metrics_wanted
+    embed_cache = shared.embed_cache
+    if shared.embedder is not None:
+        # one batched request for the whole conversation instead of one per turn
+        await prefetch_embeddings(shared.embedder, semantic_texts(shared, conv, turn_records), embed_cache, shared.embed_store)
+    cid = conv.get("conversation_id")
+    # Locate conversation trace directory (support both hashed and plain layouts)
+    conv_dir_plain = runs_root / run_id / "conversations" / cid
+    conv_dir_hashed = RunFolderLayout(runs_root).conversation_subdir(run_id, cid)
+    conv_dir = conv_dir_plain if conv_dir_plain.exists() else conv_dir_hashed
+    per_turn: List[Dict[str, Any]] = []
+    identity = conversation_identity(ds, conv)
+    # Preserve axes for downstream risk rollups
+    try:
+        axes = (conv.get("metadata") or {}).get("axes") or {}
+        if isinstance(axes, dict):
+            identity["axes"] = axes
+    except Exception:
+        pass
+    # build golden maps
+    golden_entry = None
+    golden_outcome: Dict[str, Any] = {}
+    golden_constraints: Dict[str, Any] | None = None
+    # O(1) lookup in the dataset's golden index, built once per job and shared by every model
+    g = shared.goldens.get(cid)
+    if g is not None:
+        golden_entry = {t.get("turn_index"): (t.get("expected", {}) or {}).get("variants", []) for t in (g.get("entry", {}).get("turns", []) or [])}
+        # Properly handle final_outcome: prefer entry.final_outcome, fallback to top-level final_outcome
+        entry_outcome = g.get("entry", {}).get("final_outcome")
+        if entry_outcome is not None:
+            golden_outcome = entry_outcome
+        else:
+            golden_outcome = g.get("final_outcome") or {}
+        golden_constraints = g.get("entry", {}).get("constraints") or g.get("constraints")
+
+    semantic_results: Dict[int, Dict[str, Any]] = {}
+    if golden_entry and "semantic" in metrics_wanted:
+        # every turn of the conversation is scored in one batch (one matrix product)
+        thr = (shared.thresholds or {}).get("semantic")
+        if thr is None:
+            thr = (shared.thresholds or {}).get("semantic_threshold")
+        items = [
+            (((rec.get("response", {}) or {}).get("content")) or "", _expected_variants(golden_entry, int(rec.get("turn_index", 0))))
+            for rec in turn_records
+        ]
+        try:
+            batch = await semantic_similarity_many(items, threshold=thr, embedder=shared.embedder, cache=embed_cache, store=shared.embed_store, matrices=shared.golden_matrices)
+            semantic_results = dict(enumerate(batch))
+        except Exception as e:
+            semantic_results = {i: {"metric": "semantic", "pass": False, "error": str(e)} for i in range(len(turn_records))}
+
+    input_tokens = 0
+    output_tokens = 0
+    generation_ms = 0
+    cache_hits = 0
+    cache_misses = 0
+    timings: List[Dict[str, Any]] = []
+    cold_starts: List[float] = []
+    hedge = {"fired": 0, "hedge_won": 0, "saved_ms_est": 0}
+    last_state: Dict[str, Any] = {}
+    tlist = conv.get("turns", []) or []
+    for pos, rec in enumerate(turn_records):
+        out_text = ((rec.get("response", {}) or {}).get("content")) or ""
+        uidx = int(rec.get("turn_index", 0))
+        # Artifacts written before token accounting existed are normalized on the fly
+        usage = rec.get("usage") or turn_usage(rec, rec.get("model"))
+        input_tokens += int(usage.get("input_tokens") or 0)
+        output_tokens += int(usage.get("output_tokens") or 0)
+        generation_ms += int(usage.get("generation_ms") or 0)
+        cache_state = (rec.get("response") or {}).get("cache")
+        cache_hits += cache_state == "hit"
+        cache_misses += cache_state == "miss"
+        for k, v in ((rec.get("resilience") or {}).get("hedge") or {}).items():
+            if k in hedge:
+                hedge[k] += int(v or 0)
+        timing = turn_timing(rec)
+        if timing is not None:
+            timings.append(timing)
+        load_ms = cold_start_ms(rec)
+        if load_ms is not None:
+            cold_starts.append(load_ms)
+        # derive user prompt snippet from dataset conversation
+        user_text = ""
+        try:
+            if 0 <= uidx < len(tlist):
+                user_text = str(tlist[uidx].get("text") or "")
+        except Exception:
+            user_text = ""
+        mets: Dict[str, Any] = {}
+        # exact (if selected and golden exists)
+        if golden_entry:
+            exp_variants = _expected_variants(golden_entry, uidx)
+            if "exact" in metrics_wanted:
+                try:
+                    mets["exact"] = exact_match(out_text, exp_variants)
+                except Exception as e:
+                    mets["exact"] = {"metric": "exact", "pass": False, "error": str(e)}
+            if "semantic" in metrics_wanted:
+                mets["semantic"] = semantic_results[pos]
+        # policy/consistency metrics don't require gold variants
+        try:
+            mets["consistency"] = consistency(out_text, rec.get("state") or {})
+        except Exception as e:
+            mets["consistency"] = {"metric": "consistency", "pass": False, "error": str(e)}
+        try:
+            exp_decision = (golden_outcome or {}).get("decision")
+            mets["adherence"] = adherence(out_text, golden_constraints, expected_decision=exp_decision)
+        except Exception as e:
+            mets["adherence"] = {"metric": "adherence", "pass": False, "error": str(e)}
+        try:
+            history_msgs = [m.get("content", "") for m in (rec.get("request", {}) or {}).get("messages", [])]
+            # Threshold from run config or settings
+            thr = (shared.thresholds or {}).get("hallucination_threshold")
+            mets["hallucination"] = hallucination(out_text, rec.get("state") or {}, history_msgs, threshold=thr)
+        except Exception as e:
+            mets["hallucination"] = {"metric": "hallucination", "pass": False, "error": str(e)}
+
+        # compute turn_pass ignoring metrics that were explicitly skipped
+        try:
+            considered = [v for v in mets.values() if isinstance(v, dict) and ("pass" in v) and not v.get("skipped")]
+            pass_vals = [bool(v.get("pass")) for v in considered]
+            turn_pass = all(pass_vals) if pass_vals else True
+        except Exception:
+            turn_pass = False
+        per_turn.append({
+            "turn_index": uidx,
+            "metrics": mets,
+            "turn_pass": turn_pass,
+            "user_prompt_snippet": _snippet(user_text),
+            "assistant_output_snippet": _snippet(out_text, 200),
+        })
+        last_state = rec.get("state") or last_state
+
+    # conversation summary
+    summary = aggregate_conversation(per_turn, last_state or {}, golden_outcome or {})
+    # augment summary with counts and failed metrics
+    try:
+        total_user_turns = len(per_turn)
+        failed_turns_count = sum(1 for t in per_turn if not t.get("turn_pass", True))
+        failed_metrics = sorted({
+            name for t in per_turn for name, m in (t.get("metrics") or {}).items()
+            if isinstance(m, dict) and m.get("pass") is False and not m.get("skipped")
+        })
+        summary = {
+            **(summary or {}),
+            "total_user_turns": total_user_turns,
+            "failed_turns_count": failed_turns_count,
+            "failed_metrics": failed_metrics,
+        }
+    except Exception:
+        pass
+    # add conversation description from metadata if present
+    conv_description = None
+    try:
+        conv_description = (conv.get("metadata") or {}).get("short_description")
+    except Exception:
+        conv_description = None
+    return {
+        "conversation": {
+            "conversation_id": cid,
+            **identity,
+            "conversation_description": conv_description,
+            "turns": per_turn,
+            "summary": summary,
+            "trace_dir": str(conv_dir),
+        },
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "generation_ms": generation_ms,
+        "cache_hits": cache_hits,
+        "cache_misses": cache_misses,
+        "timings": timings,
+        "cold_starts": cold_starts,
+        "hedge": hedge,
+    }
 
 
 class Orchestrator:
@@ -69,8 +516,17 @@ class Orchestrator:
         self._id_seq = 0
         self._runner = TurnRunner(self.runs_root)
         self._writer = RunArtifactWriter(self.runs_root)
+        self._status = JobStatusChannel(self._writer)
         self.boot_id = boot_id or "unknown"
 
+    @property
+    def providers(self):
+        return self._runner.providers
+
+    async def aclose(self) -> None:
+        """Release the providers' pooled HTTP connections."""
+        await self._runner.providers.aclose()
+
     @staticmethod
     def parse_model_spec(model_spec: str) -> tuple[str, str]:
         # format provider:model, e.g., 'ollama:llama3.2:latest', 'gemini:gemini-2.5', 'openai:gpt-5.1'
@@ -79,57 +535,142 @@ class Orchestrator:
             raise ValueError("model spec must be 'provider:model'")
         return parts[0], parts[1]
 
-    def submit(self, *, dataset_id: str, model_spec: str, config: Dict[str, Any]) -> JobRecord:
+    def _new_job_id(self, job_id: Optional[str] = None) -> str:
+        # Callers such as the scheduler may hand in a globally unique id; keep the local sequence ahead of it
+        if job_id:
+            try:
+                self._id_seq = max(self._id_seq, int(job_id.rsplit("-", 1)[-1]))
+            except ValueError:
+                pass
+            return job_id
+        self._id_seq += 1
+        return f"job-{self._id_seq:04d}"
+
+    def submit(self, *, dataset_id: str, model_spec: str, config: Dict[str, Any], job_id: Optional[str] = None) -> JobRecord:
         ds = self.repo.get_dataset(dataset_id)
         run_id = compute_run_id(ds["dataset_id"], ds["version"], model_spec, config)
-        self._id_seq += 1
-        job_id = f"job-{self._id_seq:04d}"
+        job_id = self._new_job_id(job_id)
         jr = JobRecord(job_id=job_id, run_id=run_id, config={"dataset_id": dataset_id, "model_spec": model_spec, **config})
         jr.total_conversations = len(ds.get("conversations", []))
         self.jobs[job_id] = jr
         # persist initial job status
+        self._write_status(jr)
+        return jr
+
+    def submit_matrix(self, *, dataset_id: str, model_specs: List[str], config: Dict[str, Any], job_id: Optional[str] = None) -> JobRecord:
+        """Submit one job that runs a dataset against several models.
+
+        The dataset, golden lookups and embedding cache are shared; each model writes its
+        usual runs/<run_id>/ results and the job's own run folder gets matrix.json.
+        """
+        specs = list(dict.fromkeys(model_specs or []))
+        if not specs:
+            raise ValueError("model_specs must not be empty")
+        for spec in specs:
+            self.parse_model_spec(spec)
+        ds = self.repo.get_dataset(dataset_id)
+        run_id = compute_matrix_run_id(ds["dataset_id"], ds["version"], specs, config)
+        job_id = self._new_job_id(job_id)
+        jr = JobRecord(job_id=job_id, run_id=run_id, config={"dataset_id": dataset_id, "model_specs": specs, **config})
+        jr.total_conversations = len(ds.get("conversations", [])) * len(specs)
+        jr.model_runs = {spec: compute_run_id(ds["dataset_id"], ds["version"], spec, config) for spec in specs}
+        self.jobs[job_id] = jr
+        self._write_status(jr)
+        return jr
+
+    def resume_run(self, run_id: str, job_id: Optional[str] = None) -> JobRecord:
+        """Re-submit an interrupted run from its run_config.json.
+
+        The job keeps the original run_id; user turns whose turn_NNN.json already holds
+        response.ok == true are reused instead of calling the provider again.
+        """
+        cfg_path = self.runs_root / run_id / "run_config.json"
+        if not cfg_path.exists():
+            raise FileNotFoundError(f"run_config.json not found for run: {run_id}")
+        for other in self.jobs.values():
+            if other.run_id == run_id and other.state in ("queued", "running", "paused", "cancelling"):
+                raise RuntimeError(f"run is already active: {other.job_id}")
+        cfg = json.loads(cfg_path.read_text(encoding="utf-8"))
+        dataset_id = cfg.pop("dataset_id", None)
+        model_spec = cfg.pop("model_spec", None)
+        if not dataset_id or not (model_spec or cfg.get("model_specs")):
+            raise ValueError("run_config.json missing dataset_id or model_spec")
+        ds = self.repo.get_dataset(dataset_id)
+        job_id = self._new_job_id(job_id)
+        job_cfg = {"dataset_id": dataset_id, **({"model_spec": model_spec} if model_spec else {}), **cfg}
+        jr = JobRecord(job_id=job_id, run_id=run_id, config=job_cfg, resume=True)
+        jr.total_conversations = len(ds.get("conversations", [])) * max(1, len(cfg.get("model_specs") or []))
+        # Pick up persisted progress so the status does not restart from zero
         try:
-            self._writer.write_job_status(run_id, {
-                "job_id": job_id,
-                "run_id": run_id,
+            prev = json.loads((self.runs_root / run_id / "job.json").read_text(encoding="utf-8"))
+            jr.completed_conversations = min(jr.total_conversations, int(prev.get("completed_conversations") or 0))
+            jr.progress_pct = int(jr.completed_conversations * 100 / max(1, jr.total_conversations))
+        except Exception:
+            pass
+        self.jobs[job_id] = jr
+        self._write_status(jr)
+        return jr
+
+    def latest_status(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent job.json snapshot for a run of this process, possibly not yet on disk."""
+        return self._status.latest(run_id)
+
+    def _write_status(self, jr: JobRecord, error: Optional[str] = None) -> None:
+        # State transitions hit disk at once; progress updates are coalesced by the channel
+        try:
+            self._status.publish(jr.run_id, {
+                "job_id": jr.job_id,
+                "run_id": jr.run_id,
                 "state": jr.state,
                 "progress_pct": jr.progress_pct,
                 "total_conversations": jr.total_conversations,
                 "completed_conversations": jr.completed_conversations,
-                "error": None,
+                "error": error if error is not None else jr.error,
                 "boot_id": self.boot_id,
-            })
+            }, force=jr.state in ("succeeded", "failed", "cancelled"))
         except Exception:
             pass
-        return jr
+
+    @staticmethod
+    def max_concurrency(config: Dict[str, Any]) -> int:
+        # config.context.max_concurrency (API) wins over top-level concurrency (CLI run config)
+        raw = (config.get("context") or {}).get("max_concurrency")
+        if raw is None:
+            raw = config.get("concurrency")
+        try:
+            return max(1, int(raw)) if raw is not None else DEFAULT_MAX_CONCURRENCY
+        except (TypeError, ValueError):
+            return DEFAULT_MAX_CONCURRENCY
+
+    @classmethod
+    def model_concurrency(cls, config: Dict[str, Any], model_spec: str) -> int:
+        # Matrix jobs may give each model its own limit via config.context.model_concurrency
+        per_model = (config.get("context") or {}).get("model_concurrency") or {}
+        try:
+            if model_spec in per_model:
+                return max(1, int(per_model[model_spec]))
+        except (TypeError, ValueError):
+            pass
+        return cls.max_concurrency(config)
 
     def cancel(self, job_id: str) -> None:
         jr = self.jobs[job_id]
         jr._cancel = True
         jr.updated_at = _now_iso()
-        # If there's an active task, cancel it immediately and mark cancelled
+        # wake paused conversations so they observe the cancel
+        jr._unpaused.set()
         if jr._task and not jr._task.done():
+            # Interrupts in-flight provider requests; run_job (or _on_task_done when the task
+            # never got to run) records the final status, so only the in-memory state changes here
+            jr.state = "cancelled"
             try:
                 jr._task.cancel()
             except Exception:
                 pass
-            jr.state = "cancelled"
-        else:
-            # If not yet started or already paused, mark cancelled
-            jr.state = "cancelled" if jr.state in ("queued", "paused") else "cancelling"
-        try:
-            self._writer.write_job_status(jr.run_id, {
-                "job_id": jr.job_id,
-                "run_id": jr.run_id,
-                "state": jr.state,
-                "progress_pct": jr.progress_pct,
-                "total_conversations": jr.total_conversations,
-                "completed_conversations": jr.completed_conversations,
-                "error": "cancelled by user" if jr.state == "cancelled" else None,
-                "boot_id": self.boot_id,
-            })
-        except Exception:
-            pass
+            return
+        # If not yet started or already paused, mark cancelled
+        jr.state = "cancelled" if jr.state in ("queued", "paused") else "cancelling"
+        self._write_status(jr, "cancelled by user" if jr.state == "cancelled" else None)
 
     def pause(self, job_id: str) -> None:
         jr = self.jobs[job_id]
@@ -137,593 +678,281 @@ class Orchestrator:
             raise RuntimeError("cannot pause a completed job")
         if jr.state == "paused":
             return
-        jr._pause = True
+        jr._unpaused.clear()
         jr.state = "paused"
         jr.updated_at = _now_iso()
-        try:
-            self._writer.write_job_status(jr.run_id, {
-                "job_id": jr.job_id,
-                "run_id": jr.run_id,
-                "state": jr.state,
-                "progress_pct": jr.progress_pct,
-                "total_conversations": jr.total_conversations,
-                "completed_conversations": jr.completed_conversations,
-                "error": None,
-                "boot_id": self.boot_id,
-            })
-        except Exception:
-            pass
+        self._write_status(jr)
 
     def resume(self, job_id: str) -> None:
         jr = self.jobs[job_id]
         if jr.state in ("succeeded", "failed", "cancelled") or (jr._task and jr._task.done()):
             raise RuntimeError("cannot resume a completed job")
-        jr._pause = False
-        jr.state = "running"
+        if jr.state != "paused":
+            return
+        jr._unpaused.set()
+        # a job paused while still waiting to start goes back to the queue
+        jr.state = "running" if jr._task else "queued"
         jr.updated_at = _now_iso()
+        self._write_status(jr)
+
+    async def _gate(self, jr: JobRecord) -> bool:
+        """Block while the job is paused. Returns False once the job is cancelled."""
+        if not jr._unpaused.is_set():
+            await jr._unpaused.wait()
+        return not jr._cancel
+
+    async def _score_conversation(
+        self,
+        jr: JobRecord,
+        run_id: str,
+        shared: SharedRunState,
+        conv: Dict[str, Any],
+        turn_records: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        return await score_conversation(self.runs_root, run_id, shared, conv, turn_records)
+
+    async def _warm_up(self, shared: SharedRunState, provider: str, model: str) -> Optional[Dict[str, Any]]:
+        """Provider warm-up result ({model, ok, load_ms, check_ms, endpoints}), or None when skipped or unsupported.
+
+        A failed warm-up is recorded, not fatal: the turns then surface the provider error themselves.
+        """
+        flag: Any = shared.warmup
+        if flag is None:
+            flag = os.getenv("PROVIDER_WARMUP", "1")
+        if isinstance(flag, str):
+            flag = flag.strip().lower() in ("1", "true", "yes", "on")
+        if not flag:
+            return None
         try:
-            self._writer.write_job_status(jr.run_id, {
-                "job_id": jr.job_id,
-                "run_id": jr.run_id,
-                "state": jr.state,
-                "progress_pct": jr.progress_pct,
-                "total_conversations": jr.total_conversations,
-                "completed_conversations": jr.completed_conversations,
-                "error": None,
-                "boot_id": self.boot_id,
-            })
+            return await self._runner.providers.warm_up(provider, model)
+        except Exception as e:
+            return {"model": model, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    async def _execute_model(self, jr: JobRecord, shared: SharedRunState, model_spec: str, run_id: str, concurrency: int) -> Dict[str, Any]:
+        """Generate and score every conversation of the shared dataset against one model.
+
+        Writes results.json/CSV under runs/<run_id>/ and returns the merged results.
+        """
+        ds = shared.dataset
+        provider, model = self.parse_model_spec(model_spec)  # e.g., 'ollama', 'llama3.2:2b'
+        # Ensure run folder exists even if downstream is mocked
+        run_folder = self.runs_root / run_id
+        run_folder.mkdir(parents=True, exist_ok=True)
+        # Scored conversations are appended here as they finish; start from a clean store
+        self._writer.clear_partial_results(run_id)
+
+        # Pre-flight: load the model once so the first conversations do not pay (or time out on) the load
+        warmup = await self._warm_up(shared, provider, model)
+
+        # Conversations run concurrently up to the model's limit; turns within one stay sequential
+        sem = asyncio.Semaphore(concurrency)
+        conversations = ds.get("conversations", [])
+        # position in dataset -> scored entry, so the final merge keeps dataset order
+        scored: Dict[int, Dict[str, Any]] = {}
+
+        async def _run_conversation(pos: int, conv: Dict[str, Any]) -> None:
+            CONVERSATIONS_WAITING.inc(model=model_spec)
+            try:
+                await sem.acquire()
+            finally:
+                CONVERSATIONS_WAITING.dec(model=model_spec)
+            CONVERSATIONS_ACTIVE.inc(model=model_spec)
+            try:
+                await _run_admitted(pos, conv)
+            finally:
+                CONVERSATIONS_ACTIVE.dec(model=model_spec)
+                sem.release()
+
+        async def _run_admitted(pos: int, conv: Dict[str, Any]) -> None:
+            # Pause gate before each conversation and between turns
+            if not await self._gate(jr):
+                return
+            conv_id = conv.get("conversation_id")
+            conv_meta = (conv.get("metadata") or {}) if isinstance(conv.get("metadata"), dict) else {}
+            turns = conv.get("turns", [])
+            turn_records: List[Dict[str, Any]] = []
+            # iterate user turns only
+            for idx, t in enumerate(turns):
+                if t.get("role") != "user":
+                    continue
+                # inner pause gate before each user turn
+                if not await self._gate(jr):
+                    return
+                rec = self._runner.load_turn(run_id, conv_id, idx) if jr.resume else None
+                if rec is not None:
+                    turn_records.append(rec)
+                    continue
+                rec = await self._runner.run_turn(
+                    run_id=run_id,
+                    provider=provider,
+                    model=model,
+                    domain=shared.domain,
+                    conversation_id=conv_id,
+                    turn_index=idx,
+                    turns=turns[: idx + 1],
+                    conv_meta=conv_meta,
+                    params_override=shared.params_override,
+                    cache_mode=shared.cache_mode,
+                    stream=shared.stream,
+                    hedge=shared.hedge,
+                )
+                turn_records.append({"turn_index": idx, **(rec or {})})
+            self._runner.forget_conversation(run_id, conv_id)
+            # Score while other conversations are still generating
+            entry = await self._score_conversation(jr, run_id, shared, conv, turn_records)
+            self._writer.append_partial_result(run_id, entry)
+            scored[pos] = entry
+            # Conversations may finish out of order; the counter only ever moves forward
+            # (a resumed job starts from the persisted count and catches up as reused work is re-scored)
+            shared.scored_total += 1
+            jr.completed_conversations = max(jr.completed_conversations, shared.scored_total)
+            jr.progress_pct = int(jr.completed_conversations * 100 / max(1, jr.total_conversations))
+            jr.updated_at = _now_iso()
+            self._write_status(jr)
+
+        tasks = [asyncio.create_task(_run_conversation(pos, conv)) for pos, conv in enumerate(conversations)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # On failure or external cancel, do not leave sibling conversations running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            self._runner.forget_run(run_id)
+        if jr._cancel:
+            return {}
+
+        # Merge scored conversations (dataset order) and write artifacts
+        results = merge_results(
+            run_id=run_id,
+            dataset=ds,
+            model_spec=model_spec,
+            entries=[scored[pos] for pos in sorted(scored)],
+        )
+        if warmup is not None:
+            results["warmup"] = warmup
+        self._writer.write_results_json(run_id, results)
+        try:
+            self._writer.write_results_csv(run_id, results)
         except Exception:
             pass
+        # results.json now supersedes the incremental store
+        self._writer.clear_partial_results(run_id)
+        return results
 
     async def run_job(self, job_id: str) -> JobRecord:
         jr = self.jobs[job_id]
+        shared: Optional[SharedRunState] = None
+        prefetch: Optional[asyncio.Task] = None
         try:
-            if jr.state not in ("queued",):
+            if jr.state not in ("queued", "paused"):
                 return jr
-            jr.state = "running"
-            jr.updated_at = _now_iso()
-            # write running status
-            try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": None,
-                    "boot_id": self.boot_id,
-                })
-            except Exception:
-                pass
-
-            ds = self.repo.get_dataset(jr.config["dataset_id"])
-            provider, model = self.parse_model_spec(jr.config["model_spec"])  # e.g., 'ollama', 'llama3.2:2b'
-            domain = ds.get("metadata", {}).get("domain", "commerce")
-            # Normalize metric selection from run config
-            wanted_raw: List[str] = list(jr.config.get("metrics") or ["exact"])  # default to exact only
-            map_names = {
-                "exact_match": "exact",
-                "exact": "exact",
-                "semantic_similarity": "semantic",
-                "semantic": "semantic",
-                "consistency": "consistency",
-                "adherence": "adherence",
-                "hallucination": "hallucination",
-            }
-            metrics_wanted: List[str] = []
-            for name in wanted_raw:
-                norm = map_names.get(str(name))
-                if norm and norm not in metrics_wanted:
-                    metrics_wanted.append(norm)
-
-            # Ensure run folder exists even if downstream is mocked
-            run_folder = self.runs_root / jr.run_id
-            run_folder.mkdir(parents=True, exist_ok=True)
-
-            # Helpers for identity enrichment
-            def _slugify(text: str) -> str:
-                import re
-                t = (text or "").lower()
-                t = re.sub(r"[^a-z0-9]+", "-", t).strip("-")
-                return t[:80]
-
-            def _conv_identity(conv_obj: Dict[str, Any]) -> Dict[str, Any]:
-                meta_ds = ds.get("metadata", {}) or {}
-                meta = (conv_obj.get("metadata") or {}) if isinstance(conv_obj.get("metadata"), dict) else {}
-                # fields
-                d = meta.get("domain") or meta_ds.get("domain")
-                b = meta.get("behavior") or meta_ds.get("behavior")
-                s = meta.get("scenario") or meta.get("case")
-                persona = meta.get("persona")
-                locale = meta.get("locale")
-                channel = meta.get("channel")
-                complexity = meta.get("complexity") or meta_ds.get("difficulty")
-                case_type = meta.get("case_type") or meta.get("type")
-                title = conv_obj.get("title") or (
-                    (f"{b}: {s}" if b and s else (b or s)) if (b or s) else None
-                ) or conv_obj.get("conversation_id")
-                parts = [p for p in [d, b, s, persona, locale] if p]
-                slug = _slugify("-".join(parts)) if parts else _slugify(conv_obj.get("conversation_id", "conv"))
-                return {
-                    "conversation_slug": slug,
-                    "conversation_title": title,
-                    "domain": d,
-                    "behavior": b,
-                    "scenario": s,
-                    "persona": persona,
-                    "locale": locale,
-                    "channel": channel,
-                    "complexity": complexity,
-                    "case_type": case_type,
-                }
-
-            # Simple per-run embedding cache for semantic metric
-            embed_cache: Dict[str, List[float]] = {}
-
-            for conv in ds.get("conversations", []):
-                if jr._cancel:
-                    jr.state = "cancelled"
-                    jr.updated_at = _now_iso()
-                    try:
-                        self._writer.write_job_status(jr.run_id, {
-                            "job_id": jr.job_id,
-                            "run_id": jr.run_id,
-                            "state": jr.state,
-                            "progress_pct": jr.progress_pct,
-                            "total_conversations": jr.total_conversations,
-                            "completed_conversations": jr.completed_conversations,
-                            "error": None,
-                            "boot_id": self.boot_id,
-                        })
-                    except Exception:
-                        pass
-                    return jr
-                # Pause gate before each conversation and between turns
-                if jr._pause:
-                    jr.state = "paused"
-                    jr.updated_at = _now_iso()
-                    try:
-                        self._writer.write_job_status(jr.run_id, {
-                            "job_id": jr.job_id,
-                            "run_id": jr.run_id,
-                            "state": jr.state,
-                            "progress_pct": jr.progress_pct,
-                            "total_conversations": jr.total_conversations,
-                            "completed_conversations": jr.completed_conversations,
-                            "error": None,
-                            "boot_id": self.boot_id,
-                        })
-                    except Exception:
-                        pass
-                    # wait until unpaused or cancelled
-                    while jr._pause and not jr._cancel:
-                        await asyncio.sleep(0.3)
-                    if jr._cancel:
-                        jr.state = "cancelled"
-                        jr.updated_at = _now_iso()
-                        return jr
-                    jr.state = "running"
-                    jr.updated_at = _now_iso()
-                    try:
-                        self._writer.write_job_status(jr.run_id, {
-                            "job_id": jr.job_id,
-                            "run_id": jr.run_id,
-                            "state": jr.state,
-                            "progress_pct": jr.progress_pct,
-                            "total_conversations": jr.total_conversations,
-                            "completed_conversations": jr.completed_conversations,
-                            "error": None,
-                            "boot_id": self.boot_id,
-                        })
-                    except Exception:
-                        pass
-                conv_id = conv.get("conversation_id")
-                conv_meta = (conv.get("metadata") or {}) if isinstance(conv.get("metadata"), dict) else {}
-                turns = conv.get("turns", [])
-                # iterate user turns only
-                for idx, t in enumerate(turns):
-                    if t.get("role") == "user":
-                        # inner pause gate before each user turn
-                        if jr._cancel:
-                            jr.state = "cancelled"
-                            jr.updated_at = _now_iso()
-                            try:
-                                self._writer.write_job_status(jr.run_id, {
-                                    "job_id": jr.job_id,
-                                    "run_id": jr.run_id,
-                                    "state": jr.state,
-                                    "progress_pct": jr.progress_pct,
-                                    "total_conversations": jr.total_conversations,
-                                    "completed_conversations": jr.completed_conversations,
-                                    "error": None,
-                                    "boot_id": self.boot_id,
-                                })
-                            except Exception:
-                                pass
-                            return jr
-                        if jr._pause:
-                            jr.state = "paused"
-                            jr.updated_at = _now_iso()
-                            try:
-                                self._writer.write_job_status(jr.run_id, {
-                                    "job_id": jr.job_id,
-                                    "run_id": jr.run_id,
-                                    "state": jr.state,
-                                    "progress_pct": jr.progress_pct,
-                                    "total_conversations": jr.total_conversations,
-                                    "completed_conversations": jr.completed_conversations,
-                                    "error": None,
-                                    "boot_id": self.boot_id,
-                                })
-                            except Exception:
-                                pass
-                            while jr._pause and not jr._cancel:
-                                await asyncio.sleep(0.3)
-                            if jr._cancel:
-                                jr.state = "cancelled"
-                                jr.updated_at = _now_iso()
-                                try:
-                                    self._writer.write_job_status(jr.run_id, {
-                                        "job_id": jr.job_id,
-                                        "run_id": jr.run_id,
-                                        "state": jr.state,
-                                        "progress_pct": jr.progress_pct,
-                                        "total_conversations": jr.total_conversations,
-                                        "completed_conversations": jr.completed_conversations,
-                                        "error": None,
-                                        "boot_id": self.boot_id,
-                                    })
-                                except Exception:
-                                    pass
-                                return jr
-                            jr.state = "running"
-                            jr.updated_at = _now_iso()
-                            try:
-                                self._writer.write_job_status(jr.run_id, {
-                                    "job_id": jr.job_id,
-                                    "run_id": jr.run_id,
-                                    "state": jr.state,
-                                    "progress_pct": jr.progress_pct,
-                                    "total_conversations": jr.total_conversations,
-                                    "completed_conversations": jr.completed_conversations,
-                                    "error": None,
-                                    "boot_id": self.boot_id,
-                                })
-                            except Exception:
-                                pass
-                        # Allow run-level decoding overrides via config.context.params
-                        params_override = None
-                        try:
-                            params_override = (jr.config.get("context") or {}).get("params")
-                        except Exception:
-                            params_override = None
-                        await self._runner.run_turn(
-                            run_id=jr.run_id,
-                            provider=provider,
-                            model=model,
-                            domain=domain,
-                            conversation_id=conv_id,
-                            turn_index=idx,
-                            turns=turns[: idx + 1],
-                            conv_meta=conv_meta,
-                            params_override=params_override,
-                        )
-                jr.completed_conversations += 1
-                jr.progress_pct = int(jr.completed_conversations * 100 / max(1, jr.total_conversations))
+            # A job paused before it started stays paused; conversations wait at the gate
+            if jr.state == "queued":
+                jr.state = "running"
                 jr.updated_at = _now_iso()
-                try:
-                    self._writer.write_job_status(jr.run_id, {
-                        "job_id": jr.job_id,
-                        "run_id": jr.run_id,
-                        "state": jr.state,
-                        "progress_pct": jr.progress_pct,
-                        "total_conversations": jr.total_conversations,
-                        "completed_conversations": jr.completed_conversations,
-                        "error": None,
-                        "boot_id": self.boot_id,
-                    })
-                except Exception:
-                    pass
-
-            # Aggregate results across conversations and write artifacts
-            results: Dict[str, Any] = {
-                "run_id": jr.run_id,
-                "dataset_id": ds.get("dataset_id"),
-                "model_spec": jr.config.get("model_spec"),
-                "conversations": [],
-            }
-            # Accumulate token usage across all turns
-            total_input_tokens = 0
-            total_output_tokens = 0
-            # include dataset/domain short description if present
-            try:
-                results["domain_description"] = (ds.get("metadata", {}) or {}).get("short_description")
-            except Exception:
-                pass
+                # write running status
+                self._write_status(jr)
 
-            for conv in ds.get("conversations", []):
-                cid = conv.get("conversation_id")
-                # Locate conversation trace directory (support both hashed and plain layouts)
-                try:
-                    from .artifacts import RunFolderLayout  # type: ignore
-                except Exception:
-                    from artifacts import RunFolderLayout  # type: ignore
-                # Prefer plain layout used by TurnRunner in tests; fallback to hashed
-                conv_dir_plain = self.runs_root / jr.run_id / "conversations" / cid
-                conv_dir_hashed = RunFolderLayout(self.runs_root).conversation_subdir(jr.run_id, cid)
-                if conv_dir_plain.exists():
-                    conv_dir = conv_dir_plain
-                elif conv_dir_hashed.exists():
-                    conv_dir = conv_dir_hashed
-                else:
-                    # default to hashed to avoid path length issues
-                    conv_dir = conv_dir_hashed
-                turn_files = sorted(conv_dir.glob("turn_*.json"))
-                per_turn: List[Dict[str, Any]] = []
-                identity = _conv_identity(conv)
-                # Preserve axes for downstream risk rollups
-                try:
-                    axes = (conv.get("metadata") or {}).get("axes") or {}
-                    if isinstance(axes, dict):
-                        identity["axes"] = axes
-                except Exception:
-                    pass
-                # attach axes for downstream rollups/reporting
-                try:
-                    axes = (conv.get("metadata") or {}).get("axes") or {}
-                    if isinstance(axes, dict):
-                        identity["axes"] = axes
-                except Exception:
-                    pass
-                # build golden maps
-                golden_entry = None
-                golden_outcome: Dict[str, Any] = {}
-                golden_constraints: Dict[str, Any] | None = None
-                try:
-                    g = self.repo.get_golden(cid)
-                    golden_entry = {t.get("turn_index"): (t.get("expected", {}) or {}).get("variants", []) for t in (g.get("entry", {}).get("turns", []) or [])}
-                    # Properly handle final_outcome: prefer entry.final_outcome, fallback to top-level final_outcome
-                    entry_outcome = g.get("entry", {}).get("final_outcome")
-                    if entry_outcome is not None:
-                        golden_outcome = entry_outcome
-                    else:
-                        golden_outcome = g.get("final_outcome") or {}
-                    golden_constraints = g.get("entry", {}).get("constraints") or g.get("constraints")
-                except Exception as e:
-                    import sys
-                    print(f"[DEBUG] Failed to load golden for {cid}: {e}", file=sys.stderr)
-                    pass
-
-                last_state: Dict[str, Any] = {}
-                for tf in turn_files:
-                    try:
-                        rec = json.loads(tf.read_text(encoding="utf-8"))
-                    except Exception:
-                        continue
-                    out_text = ((rec.get("response", {}) or {}).get("content")) or ""
-                    uidx = int(rec.get("turn_index", 0))
-                    # Token accounting from provider metadata when available; otherwise approximate
-                    try:
-                        pm = ((rec.get("response", {}) or {}).get("provider_meta") or {})
-                        usage = pm.get("usage") if isinstance(pm, dict) else None
-                        in_tok = None
-                        out_tok = None
-                        if isinstance(usage, dict):
-                            # OpenAI-style usage
-                            if "prompt_tokens" in usage:
-                                in_tok = int(usage.get("prompt_tokens") or 0)
-                            if "completion_tokens" in usage:
-                                out_tok = int(usage.get("completion_tokens") or 0)
-                            if in_tok is None and "input_tokens" in usage:
-                                in_tok = int(usage.get("input_tokens") or 0)
-                            if out_tok is None and "output_tokens" in usage:
-                                out_tok = int(usage.get("output_tokens") or 0)
-                        # Ollama-style counters
-                        if in_tok is None and isinstance(pm, dict) and "prompt_eval_count" in pm:
-                            try:
-                                in_tok = int(pm.get("prompt_eval_count") or 0)
-                            except Exception:
-                                in_tok = 0
-                        if out_tok is None and isinstance(pm, dict) and "eval_count" in pm:
-                            try:
-                                out_tok = int(pm.get("eval_count") or 0)
-                            except Exception:
-                                out_tok = 0
-                        # Fallback to rough estimates if still missing
-                        if in_tok is None:
-                            try:
-                                ctx_est = int((rec.get("context_audit", {}) or {}).get("token_estimate") or 0)
-                            except Exception:
-                                ctx_est = 0
-                            in_tok = ctx_est
-                        if out_tok is None:
-                            try:
-                                out_tok = max(0, int(len(out_text) / 4.0))
-                            except Exception:
-                                out_tok = 0
-                        total_input_tokens += int(in_tok or 0)
-                        total_output_tokens += int(out_tok or 0)
-                    except Exception:
-                        pass
-                    # Robust mapping of user turn index -> assistant turn index in golden
-                    # Preferred (convgen_v2): A1=1, A2=3 => assistant_idx = 2*uidx + 1
-                    cand_idxs = [2 * uidx + 1, uidx + 1, uidx]
-                    # derive user prompt snippet from dataset conversation
-                    user_text = ""
-                    try:
-                        tlist = conv.get("turns", []) or []
-                        if 0 <= uidx < len(tlist):
-                            user_text = str(tlist[uidx].get("text") or "")
-                    except Exception:
-                        user_text = ""
-                    def _snippet(t: str, n: int = 160) -> str:
-                        t = (t or "").strip().replace("\n", " ")
-                        return t if len(t) <= n else (t[: n - 1] + "…")
-                    mets: Dict[str, Any] = {}
-                    # exact (if selected and golden exists)
-                    exp_variants = []
-                    if golden_entry:
-                        # pick first matching candidate index
-                        for ax in cand_idxs:
-                            if ax in golden_entry:
-                                exp_variants = golden_entry[ax]
-                                break
-                        if "exact" in metrics_wanted:
-                            try:
-                                mets["exact"] = exact_match(out_text, exp_variants)
-                            except Exception as e:
-                                mets["exact"] = {"metric": "exact", "pass": False, "error": str(e)}
-                        if "semantic" in metrics_wanted:
-                            try:
-                                # semantic may fail if embeddings not available
-                                thr = (jr.config.get("thresholds", {}) or {}).get("semantic")
-                                if thr is None:
-                                    thr = (jr.config.get("thresholds", {}) or {}).get("semantic_threshold")
-                                mets["semantic"] = await semantic_similarity(out_text, exp_variants, threshold=thr, cache=embed_cache)
-                            except Exception as e:
-                                mets["semantic"] = {"metric": "semantic", "pass": False, "error": str(e)}
-                    # policy/consistency metrics don't require gold variants
-                    try:
-                        mets["consistency"] = consistency(out_text, rec.get("state") or {})
-                    except Exception as e:
-                        mets["consistency"] = {"metric": "consistency", "pass": False, "error": str(e)}
-                    try:
-                        exp_decision = (golden_outcome or {}).get("decision")
-                        mets["adherence"] = adherence(out_text, golden_constraints, expected_decision=exp_decision)
-                    except Exception as e:
-                        mets["adherence"] = {"metric": "adherence", "pass": False, "error": str(e)}
-                    try:
-                        history_msgs = [m.get("content", "") for m in (rec.get("request", {}) or {}).get("messages", [])]
-                        # Threshold from run config or settings
-                        thr = (jr.config.get("thresholds", {}) or {}).get("hallucination_threshold")
-                        mets["hallucination"] = hallucination(out_text, rec.get("state") or {}, history_msgs, threshold=thr)
-                    except Exception as e:
-                        mets["hallucination"] = {"metric": "hallucination", "pass": False, "error": str(e)}
-
-                    # compute turn_pass ignoring metrics that were explicitly skipped
-                    try:
-                        considered = [v for v in mets.values() if isinstance(v, dict) and ("pass" in v) and not v.get("skipped")]
-                        pass_vals = [bool(v.get("pass")) for v in considered]
-                        turn_pass = all(pass_vals) if pass_vals else True
-                    except Exception:
-                        turn_pass = False
-                    per_turn.append({
-                        "turn_index": uidx,
-                        "metrics": mets,
-                        "turn_pass": turn_pass,
-                        "user_prompt_snippet": _snippet(user_text),
-                        "assistant_output_snippet": _snippet(out_text, 200),
-                    })
-                    last_state = rec.get("state") or last_state
-
-                # conversation summary
-                summary = aggregate_conversation(per_turn, last_state or {}, golden_outcome or {})
-                # augment summary with counts and failed metrics
-                try:
-                    total_user_turns = len(per_turn)
-                    failed_turns_count = sum(1 for t in per_turn if not t.get("turn_pass", True))
-                    failed_metrics = sorted({
-                        name for t in per_turn for name, m in (t.get("metrics") or {}).items()
-                        if isinstance(m, dict) and m.get("pass") is False and not m.get("skipped")
-                    })
-                    summary = {
-                        **(summary or {}),
-                        "total_user_turns": total_user_turns,
-                        "failed_turns_count": failed_turns_count,
-                        "failed_metrics": failed_metrics,
-                    }
-                except Exception:
-                    pass
-                # add conversation description from metadata if present
-                conv_description = None
-                try:
-                    conv_description = (conv.get("metadata") or {}).get("short_description")
-                except Exception:
-                    conv_description = None
-                results["conversations"].append({
-                    "conversation_id": cid,
-                    **identity,
-                    "conversation_description": conv_description,
-                    "turns": per_turn,
-                    "summary": summary,
-                    "trace_dir": str(conv_dir),
-                })
-
-            # persist results
+            # Parsed once per job and shared by every model of a matrix job
+            ds = self.repo.get_dataset(jr.config["dataset_id"])
+            # Allow run-level decoding overrides via config.context.params
+            params_override = None
             try:
-                results["input_tokens_total"] = int(total_input_tokens)
-                results["output_tokens_total"] = int(total_output_tokens)
+                params_override = (jr.config.get("context") or {}).get("params")
             except Exception:
-                pass
-            self._writer.write_results_json(jr.run_id, results)
+                params_override = None
+            shared = SharedRunState(
+                dataset=ds,
+                domain=ds.get("metadata", {}).get("domain", "commerce"),
+                # Normalize metric selection from run config
+                metrics_wanted=normalize_metrics(jr.config.get("metrics")),
+                params_override=params_override,
+                cache_mode=normalize_cache_mode((jr.config.get("context") or {}).get("response_cache")),
+                stream=(jr.config.get("context") or {}).get("stream"),
+                hedge=(jr.config.get("context") or {}).get("hedge"),
+                warmup=(jr.config.get("context") or {}).get("warmup"),
+                embed_store=embedding_store_for(self.runs_root),
+                thresholds=dict(jr.config.get("thresholds") or {}),
+            )
             try:
-                self._writer.write_results_csv(jr.run_id, results)
-            except Exception:
-                pass
+                shared.goldens = self.repo.golden_index(ds["dataset_id"])
+            except Exception as e:
+                # the run still executes; golden-based metrics are skipped and the reason is kept on the job
+                jr.error = f"goldens unavailable for {ds['dataset_id']}: {e}"
+                self._write_status(jr)
+            if "semantic" in shared.metrics_wanted:
+                shared.embedder = EmbeddingBatcher(shared_embeddings())
+                # golden variants are known up front: embed them in a few large batches while the model generates
+                prefetch = asyncio.create_task(prefetch_embeddings(
+                    shared.embedder, golden_variant_texts(shared.goldens), shared.embed_cache, shared.embed_store))
+
+            model_specs = jr.config.get("model_specs")
+            if not model_specs:
+                await self._execute_model(jr, shared, jr.config["model_spec"], jr.run_id, self.max_concurrency(jr.config))
+            else:
+                # Matrix job: every model gets its own run folder and concurrency limit, all dispatched together
+                (self.runs_root / jr.run_id).mkdir(parents=True, exist_ok=True)
+                base_cfg = {k: v for k, v in jr.config.items() if k not in ("dataset_id", "model_specs")}
+                runs = jr.model_runs = {spec: compute_run_id(ds["dataset_id"], ds["version"], spec, base_cfg) for spec in model_specs}
+                for spec in model_specs:
+                    # per-model run_config.json keeps each model's run resumable on its own
+                    self._writer.init_run(runs[spec], {"dataset_id": jr.config["dataset_id"], "model_spec": spec, **base_cfg})
+                per_model = await asyncio.gather(*[
+                    self._execute_model(jr, shared, spec, runs[spec], self.model_concurrency(jr.config, spec))
+                    for spec in model_specs
+                ])
+                if not jr._cancel:
+                    self._writer.write_matrix_summary(jr.run_id, matrix_summary(jr.run_id, ds, dict(zip(model_specs, per_model))))
+            if jr._cancel:
+                jr.state = "cancelled"
+                jr.updated_at = _now_iso()
+                self._write_status(jr)
+                return jr
 
             jr.state = "succeeded"
             jr.updated_at = _now_iso()
             jr.progress_pct = 100
-            try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": None,
-                    "boot_id": self.boot_id,
-                })
-            except Exception:
-                pass
+            self._write_status(jr)
             return jr
         except asyncio.CancelledError:
             # Task cancelled externally (via control cancel). Reflect immediately.
             jr.state = "cancelled"
             jr.updated_at = _now_iso()
-            try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": "cancelled by user",
-                    "boot_id": self.boot_id,
-                })
-            except Exception:
-                pass
+            self._write_status(jr, "cancelled by user")
             return jr
         except Exception as e:
             jr.state = "failed"
             jr.error = str(e)
             jr.updated_at = _now_iso()
-            try:
-                self._writer.write_job_status(jr.run_id, {
-                    "job_id": jr.job_id,
-                    "run_id": jr.run_id,
-                    "state": jr.state,
-                    "progress_pct": jr.progress_pct,
-                    "total_conversations": jr.total_conversations,
-                    "completed_conversations": jr.completed_conversations,
-                    "error": jr.error,
-                    "boot_id": self.boot_id,
-                })
-            except Exception:
-                pass
+            self._write_status(jr, jr.error)
             return jr
+        finally:
+            if prefetch is not None and not prefetch.done():
+                prefetch.cancel()
+            if shared is not None and shared.embedder is not None:
+                await shared.embedder.aclose()
 
     def start(self, job_id: str) -> None:
         jr = self.jobs[job_id]
         if jr._task and not jr._task.done():
             return
         jr._task = asyncio.create_task(self.run_job(job_id))
+        jr._task.add_done_callback(lambda t, jr=jr: self._on_task_done(jr, t))
+
+    def _on_task_done(self, jr: JobRecord, task: asyncio.Task) -> None:
+        # A task cancelled before its first step never reaches run_job's handler
+        if task.cancelled():
+            jr.state = "cancelled"
+            jr.updated_at = _now_iso()
+            self._write_status(jr, "cancelled by user")
 
     async def wait(self, job_id: str) -> JobRecord:
         jr = self.jobs[job_id]
         if jr._task:
-            await jr._task
+            try:
+                await jr._task
+            except asyncio.CancelledError:
+                if not jr._task.cancelled():
+                    raise
         return jr
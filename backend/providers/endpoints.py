@@ -0,0 +1,212 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+ROUTING_STRATEGIES = ("least-outstanding", "latency")
+# weight of the newest sample in the per-endpoint latency moving average
+EWMA_ALPHA = 0.2
+
+
+def _env(provider: str, name: str) -> Optional[str]:
+    # Per-provider override (OLLAMA_ROUTING) wins over the global one (ENDPOINT_ROUTING)
+    return os.getenv(f"{provider.upper()}_{name}") or os.getenv(f"ENDPOINT_{name}")
+
+
+def parse_urls(value: Union[str, List[str], None]) -> List[str]:
+    items = value if isinstance(value, list) else str(value or "").split(",")
+    out: List[str] = []
+    for u in items:
+        u = str(u).strip().rstrip("/")
+        if u and u not in out:
+            out.append(u)
+    return out
+
+
+@dataclass
+class Endpoint:
+    url: str
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ewma_latency_ms: Optional[float] = None
+    ejected_until: float = 0.0
+    ejections: int = 0
+    last_error: Optional[str] = None
+
+    def ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": not self.ejected(now),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "ewma_latency_ms": round(self.ewma_latency_ms, 1) if self.ewma_latency_ms is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+class EndpointPool:
+    """Routes a provider's calls over several base URLs.
+
+    `least-outstanding` picks the endpoint with the fewest in-flight requests (ties: lower latency);
+    `latency` weighs in-flight requests by each endpoint's moving-average latency. An endpoint is ejected
+    for `eject_s` after `eject_after` consecutive failures (5xx, timeouts, connection errors); once the
+    ejection expires it takes traffic again, and a periodic health probe can restore it earlier. When every
+    endpoint is ejected the one closest to re-admission is used rather than failing the turn.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        strategy: str = "least-outstanding",
+        eject_after: int = 3,
+        eject_s: float = 30.0,
+        health_interval_s: float = 15.0,
+        probe: Optional[Callable[[str], Awaitable[bool]]] = None,
+    ) -> None:
+        if not urls:
+            raise ValueError("endpoint pool needs at least one URL")
+        self.endpoints = [Endpoint(u) for u in urls]
+        self.strategy = strategy if strategy in ROUTING_STRATEGIES else "least-outstanding"
+        self.eject_after = max(1, int(eject_after))
+        self.eject_s = float(eject_s)
+        self.health_interval_s = float(health_interval_s)
+        self.probe = probe
+        self._rr = 0
+        self._last_health = 0.0
+        self._health_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, provider: str, urls: List[str], probe: Optional[Callable[[str], Awaitable[bool]]] = None) -> "EndpointPool":
+        try:
+            return cls(
+                urls,
+                strategy=(_env(provider, "ROUTING") or "least-outstanding").strip().lower(),
+                eject_after=int(_env(provider, "EJECT_AFTER") or 3),
+                eject_s=float(_env(provider, "EJECT_S") or 30.0),
+                health_interval_s=float(_env(provider, "HEALTH_INTERVAL_S") or 15.0),
+                probe=probe,
+            )
+        except ValueError:
+            return cls(urls, probe=probe)
+
+    @property
+    def primary_url(self) -> str:
+        return self.endpoints[0].url
+
+    def _score(self, ep: Endpoint) -> tuple:
+        if self.strategy == "latency":
+            # endpoints without samples yet are tried first
+            lat = ep.ewma_latency_ms if ep.ewma_latency_ms is not None else 0.0
+            return ((ep.outstanding + 1) * lat, ep.outstanding)
+        return (ep.outstanding, ep.ewma_latency_ms if ep.ewma_latency_ms is not None else 0.0)
+
+    def acquire(self) -> Endpoint:
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if not e.ejected(now)]
+        if not healthy:
+            healthy = [min(self.endpoints, key=lambda e: e.ejected_until)]
+        best = min(self._score(e) for e in healthy)
+        tied = [e for e in healthy if self._score(e) == best]
+        ep = tied[self._rr % len(tied)]
+        self._rr += 1
+        ep.outstanding += 1
+        ep.requests += 1
+        self._maybe_check_health(now)
+        return ep
+
+    def release(self, ep: Endpoint, ok: Optional[bool], latency_ms: Optional[float] = None, host_failure: bool = False, error: Optional[str] = None) -> None:
+        """ok=None: the call was cancelled (e.g. a losing hedge) and says nothing about the host."""
+        ep.outstanding = max(0, ep.outstanding - 1)
+        if ok is None:
+            return
+        if ok:
+            ep.consecutive_failures = 0
+            if latency_ms is not None:
+                ep.ewma_latency_ms = float(latency_ms) if ep.ewma_latency_ms is None else (
+                    EWMA_ALPHA * float(latency_ms) + (1 - EWMA_ALPHA) * ep.ewma_latency_ms)
+            return
+        if not host_failure:
+            return
+        ep.failures += 1
+        ep.consecutive_failures += 1
+        ep.last_error = error
+        if ep.consecutive_failures >= self.eject_after:
+            self.eject(ep)
+
+    def eject(self, ep: Endpoint) -> None:
+        ep.ejected_until = time.monotonic() + self.eject_s
+        ep.ejections += 1
+        ep.consecutive_failures = 0
+
+    def _maybe_check_health(self, now: float) -> None:
+        # probes run in the background and only while some endpoint is ejected
+        if self.probe is None or len(self.endpoints) < 2 or now - self._last_health < self.health_interval_s:
+            return
+        if not any(e.ejected(now) for e in self.endpoints):
+            return
+        if self._health_task is not None and not self._health_task.done():
+            return
+        self._last_health = now
+        try:
+            self._health_task = asyncio.get_running_loop().create_task(self.check_health())
+        except RuntimeError:
+            pass
+
+    async def check_health(self) -> Dict[str, bool]:
+        """Probe every endpoint: failures are ejected, recovered ejected endpoints re-admitted."""
+        results: Dict[str, bool] = {}
+        if self.probe is None:
+            return results
+        for ep in self.endpoints:
+            try:
+                ok = bool(await self.probe(ep.url))
+            except Exception as e:
+                ok = False
+                ep.last_error = str(e)
+            results[ep.url] = ok
+            if ok:
+                ep.ejected_until = 0.0
+                ep.consecutive_failures = 0
+            elif not ep.ejected(time.monotonic()):
+                self.eject(ep)
+        return results
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [e.snapshot(now) for e in self.endpoints]
+
+
+def host_failure(resp: Any) -> bool:
+    """Failures that say something about the host: 5xx, timeouts and connection errors (not 4xx)."""
+    meta = getattr(resp, "provider_meta", None) or {}
+    status = meta.get("status")
+    if status is not None:
+        return int(status) >= 500
+    return "exception" in meta
+
+
+async def route(pool: EndpointPool, call: Callable[[str], Awaitable[Any]]) -> Any:
+    """Run `call(base_url)` on the pool's chosen endpoint and feed the outcome back into its stats."""
+    ep = pool.acquire()
+    resp = None
+    try:
+        resp = await call(ep.url)
+    finally:
+        if resp is None:
+            pool.release(ep, None)
+        else:
+            pool.release(ep, bool(getattr(resp, "ok", False)), getattr(resp, "latency_ms", None),
+                         host_failure(resp), getattr(resp, "error", None))
+            meta = getattr(resp, "provider_meta", None)
+            if len(pool.endpoints) > 1 and isinstance(meta, dict):
+                meta["endpoint"] = ep.url
+    return resp
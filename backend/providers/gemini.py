@@ -2,23 +2,31 @@ from __future__ import annotations
 import os
 import time
 from typing import Dict, Any, List
-import httpx
 
 try:
     from .types import ProviderRequest, ProviderResponse
+    from .http_client import HttpClientSettings, PooledClient, error_meta
+    from .streaming import StreamCollector, iter_sse_json, stream_requested
 except ImportError:
     from providers.types import ProviderRequest, ProviderResponse
+    from providers.http_client import HttpClientSettings, PooledClient, error_meta
+    from providers.streaming import StreamCollector, iter_sse_json, stream_requested
 
 GEMINI_API = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={key}"
+GEMINI_STREAM_API = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse&key={key}"
 
 class GeminiProvider:
     def __init__(self, api_key: str | None) -> None:
         self.api_key = api_key
+        self._http = PooledClient(HttpClientSettings.from_env("GEMINI"))
 
     @property
     def enabled(self) -> bool:
         return bool(self.api_key)
 
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
     async def chat(self, req: ProviderRequest) -> ProviderResponse:
         if not self.enabled:
             return ProviderResponse(False, "", 0, {}, error="Gemini disabled: missing GOOGLE_API_KEY")
@@ -61,20 +69,43 @@ class GeminiProvider:
         }
         if system_msg is not None:
             payload["systemInstruction"] = system_msg
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(url, json=payload)
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                if r.status_code != 200:
-                    return ProviderResponse(False, "", latency_ms, {"status": r.status_code}, error=r.text)
-                data = r.json()
-                text = (
-                    data.get("candidates", [{}])[0]
-                    .get("content", {})
-                    .get("parts", [{}])[0]
-                    .get("text", "")
-                )
-                return ProviderResponse(True, text, latency_ms, {"candidates": len(data.get("candidates", []))})
-            except Exception as e:
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                return ProviderResponse(False, "", latency_ms, {}, error=str(e))
+        try:
+            if stream_requested(req):
+                return await self._chat_stream(GEMINI_STREAM_API.format(model=req.model, key=self.api_key), payload, req.model, t0)
+            r = await self._http.get().post(url, json=payload)
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            if r.status_code != 200:
+                return ProviderResponse(False, "", latency_ms, error_meta(r), error=r.text)
+            data = r.json()
+            text = (
+                data.get("candidates", [{}])[0]
+                .get("content", {})
+                .get("parts", [{}])[0]
+                .get("text", "")
+            )
+            return ProviderResponse(True, text, latency_ms, {
+                "candidates": len(data.get("candidates", [])),
+                "usageMetadata": data.get("usageMetadata"),
+            })
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            return ProviderResponse(False, "", latency_ms, {"exception": type(e).__name__}, error=str(e))
+
+    async def _chat_stream(self, url: str, payload: Dict[str, Any], model: str, t0: float) -> ProviderResponse:
+        # SSE chunks, each a partial GenerateContentResponse; the last one carries usageMetadata
+        col = StreamCollector(t0)
+        meta: Dict[str, Any] = {"candidates": 0, "usageMetadata": None}
+        async with self._http.get().stream("POST", url, json=payload) as r:
+            if r.status_code != 200:
+                text = (await r.aread()).decode("utf-8", "replace")
+                return ProviderResponse(False, "", col.latency_ms(), {**error_meta(r), "stream": True}, error=text)
+            async for data in iter_sse_json(r):
+                cands = data.get("candidates") or []
+                meta["candidates"] = max(meta["candidates"], len(cands))
+                if data.get("usageMetadata"):
+                    meta["usageMetadata"] = data["usageMetadata"]
+                if cands:
+                    parts = ((cands[0] or {}).get("content") or {}).get("parts") or []
+                    col.add("".join(str(p.get("text") or "") for p in parts if isinstance(p, dict)))
+        meta.update(col.timing_meta(meta, model))
+        return ProviderResponse(True, col.text, col.latency_ms(), meta)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+try:
+    from ..latency_stats import percentile
+except ImportError:
+    from latency_stats import percentile
+
+try:
+    from .types import ProviderRequest, ProviderResponse
+except ImportError:
+    from providers.types import ProviderRequest, ProviderResponse
+
+
+def hedge_requested(req: ProviderRequest) -> bool:
+    """Hedging is chosen per request (metadata.hedge, from config.context.hedge), else PROVIDER_HEDGE."""
+    flag = (req.metadata or {}).get("hedge")
+    if flag is None:
+        flag = os.getenv("PROVIDER_HEDGE", "")
+    if isinstance(flag, str):
+        return flag.strip().lower() in ("1", "true", "yes", "on")
+    return bool(flag)
+
+
+@dataclass
+class HedgePolicy:
+    # fire the duplicate once the primary is slower than this percentile of the model's recent latencies
+    quantile: float = 95.0
+    # hedges may add at most this fraction of extra requests per provider
+    max_extra_fraction: float = 0.1
+    # no hedging until this many latencies have been observed for the model
+    min_samples: int = 20
+    window: int = 500
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        p = cls()
+        try:
+            p.quantile = float(os.getenv("HEDGE_QUANTILE") or p.quantile)
+            p.max_extra_fraction = float(os.getenv("HEDGE_MAX_EXTRA_FRACTION") or p.max_extra_fraction)
+            p.min_samples = int(os.getenv("HEDGE_MIN_SAMPLES") or p.min_samples)
+        except ValueError:
+            pass
+        return p
+
+
+class Hedger:
+    """Tail-latency hedging: a duplicate request after the model's observed p95, first success wins.
+
+    Latencies of successful calls are tracked per (provider, model) in a rolling window. The extra load
+    is capped per provider: a hedge only fires while hedges <= max_extra_fraction * primary requests.
+    """
+
+    def __init__(self, policy: Optional[HedgePolicy] = None) -> None:
+        self.policy = policy or HedgePolicy.from_env()
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+        self.primaries: Dict[str, int] = {}
+        self.hedges: Dict[str, int] = {}
+
+    def observe(self, provider: str, model: str, latency_ms: float) -> None:
+        key = (provider, model)
+        if key not in self._latencies:
+            self._latencies[key] = deque(maxlen=self.policy.window)
+        self._latencies[key].append(float(latency_ms))
+
+    def threshold_ms(self, provider: str, model: str) -> Optional[float]:
+        xs = self._latencies.get((provider, model))
+        if not xs or len(xs) < self.policy.min_samples:
+            return None
+        return percentile(list(xs), self.policy.quantile)
+
+    def expected_tail_ms(self, provider: str, model: str, threshold: float) -> Optional[float]:
+        """Mean latency of observed calls slower than `threshold`: what a call past it is expected to take."""
+        tail = [x for x in self._latencies.get((provider, model)) or () if x >= threshold]
+        return sum(tail) / len(tail) if tail else None
+
+    def _budget_allows(self, provider: str) -> bool:
+        return self.hedges.get(provider, 0) + 1 <= self.policy.max_extra_fraction * self.primaries.get(provider, 0)
+
+    async def call(
+        self,
+        provider: str,
+        chat: Callable[[ProviderRequest], Awaitable[ProviderResponse]],
+        req: ProviderRequest,
+        stats: Dict[str, Any],
+    ) -> ProviderResponse:
+        """One provider call, hedged when enabled. Accumulates {fired, hedge_won, saved_ms_est} into `stats`."""
+        self.primaries[provider] = self.primaries.get(provider, 0) + 1
+        t0 = time.perf_counter()
+        threshold = self.threshold_ms(provider, req.model) if hedge_requested(req) else None
+        primary = asyncio.ensure_future(chat(req))
+        tasks = [primary]
+        try:
+            if threshold is None:
+                resp = await primary
+                self._record(provider, req.model, resp)
+                return resp
+            done, _ = await asyncio.wait({primary}, timeout=threshold / 1000.0)
+            if done or not self._budget_allows(provider):
+                resp = await primary
+                self._record(provider, req.model, resp)
+                return resp
+
+            self.hedges[provider] = self.hedges.get(provider, 0) + 1
+            stats["fired"] = stats.get("fired", 0) + 1
+            hedge = asyncio.ensure_future(chat(req))
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            winner = None
+            # first successful reply wins; a fast failure waits for the other request
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and getattr(task.result(), "ok", False):
+                        winner = task
+                        break
+            if winner is None:
+                # both failed: report the primary's outcome
+                winner = primary
+        finally:
+            # the loser, or every request when the caller was cancelled, must not outlive this call
+            unfinished = [t for t in tasks if not t.done()]
+            for task in unfinished:
+                task.cancel()
+            for task in unfinished:
+                try:
+                    await task
+                except BaseException:
+                    pass
+        resp = winner.result()
+        self._record(provider, req.model, resp)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        if winner is hedge and getattr(resp, "ok", False):
+            stats["hedge_won"] = stats.get("hedge_won", 0) + 1
+            tail = self.expected_tail_ms(provider, req.model, threshold)
+            if tail is not None:
+                stats["saved_ms_est"] = stats.get("saved_ms_est", 0) + int(max(0.0, tail - elapsed_ms))
+        try:
+            # the turn waited from the primary's dispatch, not from the hedge's
+            resp.latency_ms = int(elapsed_ms)
+        except Exception:
+            pass
+        return resp
+
+    def _record(self, provider: str, model: str, resp: Any) -> None:
+        if getattr(resp, "ok", False) and getattr(resp, "latency_ms", None) is not None:
+            self.observe(provider, model, resp.latency_ms)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+
+
+def _env(prefix: str, name: str) -> Optional[str]:
+    # Per-provider override (OLLAMA_HTTP_MAX_CONNECTIONS) wins over the global one (HTTP_MAX_CONNECTIONS)
+    return os.getenv(f"{prefix}_HTTP_{name}") or os.getenv(f"HTTP_{name}")
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+@dataclass
+class HttpClientSettings:
+    timeout_s: float = 60.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_s: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls, prefix: str, timeout_s: float = 60.0) -> "HttpClientSettings":
+        """Settings from HTTP_* env vars, overridable per provider with <PREFIX>_HTTP_*."""
+        s = cls(timeout_s=timeout_s)
+        try:
+            s.timeout_s = float(_env(prefix, "TIMEOUT_S") or s.timeout_s)
+            s.max_connections = int(_env(prefix, "MAX_CONNECTIONS") or s.max_connections)
+            s.max_keepalive_connections = int(_env(prefix, "MAX_KEEPALIVE") or s.max_keepalive_connections)
+            s.keepalive_expiry_s = float(_env(prefix, "KEEPALIVE_EXPIRY_S") or s.keepalive_expiry_s)
+        except ValueError:
+            pass
+        s.http2 = str(_env(prefix, "HTTP2") or "").strip().lower() in ("1", "true", "yes", "on")
+        return s
+
+
+class PooledClient:
+    """One long-lived httpx.AsyncClient per owner, created on first use.
+
+    httpx clients are bound to the event loop they first ran on, so a new client is built
+    when called from a different loop (each CLI command or rescore worker runs its own).
+    HTTP/2 is used only when requested and the `h2` package is installed.
+    """
+
+    def __init__(self, settings: Optional[HttpClientSettings] = None, headers: Optional[Dict[str, str]] = None) -> None:
+        self.settings = settings or HttpClientSettings()
+        self.headers = dict(headers or {})
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.clients_created = 0
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            s = self.settings
+            self._client = httpx.AsyncClient(
+                timeout=s.timeout_s,
+                limits=httpx.Limits(
+                    max_connections=s.max_connections,
+                    max_keepalive_connections=s.max_keepalive_connections,
+                    keepalive_expiry=s.keepalive_expiry_s,
+                ),
+                http2=s.http2 and _h2_available(),
+                headers=self.headers or None,
+            )
+            self._loop = loop
+            self.clients_created += 1
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is None or client.is_closed:
+            return
+        try:
+            # a client from another (finished) loop cannot be closed from this one; just drop it
+            if self._loop is asyncio.get_running_loop():
+                await client.aclose()
+        except Exception:
+            pass
+        self._loop = None
+
+
+def ratelimit_meta(r: httpx.Response) -> Dict[str, object]:
+    """{"ratelimit": {x-ratelimit-* headers}} when the provider reports its remaining quota, else {}."""
+    rl = {k.lower(): v for k, v in r.headers.items() if k.lower().startswith("x-ratelimit-")}
+    return {"ratelimit": rl} if rl else {}
+
+
+def error_meta(r: httpx.Response) -> Dict[str, object]:
+    """provider_meta of a non-200 reply: status plus the Retry-After and quota hints when sent."""
+    meta: Dict[str, object] = {"status": r.status_code}
+    retry_after = r.headers.get("retry-after")
+    if retry_after:
+        meta["retry_after"] = retry_after
+    meta.update(ratelimit_meta(r))
+    return meta
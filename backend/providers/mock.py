@@ -0,0 +1,203 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .types import ProviderRequest, ProviderResponse
+except ImportError:
+    from providers.types import ProviderRequest, ProviderResponse
+
+try:
+    from ..artifacts import conversation_dirname
+except ImportError:
+    from artifacts import conversation_dirname
+
+# Turns whose attempt counts are remembered; retries of a turn follow it closely, so older ones can go
+MAX_ATTEMPT_KEYS = 10_000
+
+# Built-in profiles; MOCK_PROVIDER_PROFILES (JSON or a path to a JSON file) overrides them or adds new ones on top of 'default'
+DEFAULT_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "latency_ms": 200,
+        "latency_dist": "lognormal",
+        "latency_spread": 0.4,
+        "template": "Thanks for the details. Regarding \"{user}\", I have reviewed your request and can help with it.",
+        "final_state": {"decision": "ALLOW", "next_action": None, "refund_amount": None, "policy_flags": []},
+    },
+    # no delay, no errors: measures pure pipeline overhead
+    "instant": {"latency_ms": 0, "template": "Acknowledged: {user}", "final_state": {"decision": "ALLOW"}},
+    "flaky": {"latency_ms": 300, "latency_dist": "exponential", "error_rate": 0.1, "error_status": 503,
+              "template": "Noted: {user}", "final_state": {"decision": "PARTIAL"}},
+}
+
+
+def _parse_value(v: str) -> Any:
+    try:
+        return json.loads(v)
+    except ValueError:
+        return v
+
+
+def load_profiles() -> Dict[str, Dict[str, Any]]:
+    profiles = {k: dict(v) for k, v in DEFAULT_PROFILES.items()}
+    raw = os.getenv("MOCK_PROVIDER_PROFILES")
+    if raw:
+        try:
+            text = Path(raw).read_text(encoding="utf-8") if not raw.lstrip().startswith("{") else raw
+            extra = json.loads(text)
+            for name, prof in (extra.get("profiles", extra) or {}).items():
+                if isinstance(prof, dict):
+                    # new profiles start from 'default'
+                    profiles[name] = {**profiles.get(name, profiles["default"]), **prof}
+        except Exception:
+            pass
+    return profiles
+
+
+def parse_mock_model(model: str, profiles: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[str, Dict[str, Any]]:
+    """'default,latency_ms=50,error_rate=0.02' -> ('default', merged settings). Unknown names start from 'default'."""
+    profiles = profiles if profiles is not None else load_profiles()
+    name, *overrides = [p.strip() for p in (model or "default").split(",")]
+    name = name or "default"
+    settings = dict(profiles.get(name) or profiles.get("default") or {})
+    for ov in overrides:
+        if "=" in ov:
+            k, v = ov.split("=", 1)
+            settings[k.strip()] = _parse_value(v.strip())
+    return name, settings
+
+
+def sample_latency_ms(settings: Dict[str, Any], rng: random.Random) -> float:
+    """latency_ms is the median (fixed, lognormal) or mean (normal, exponential, uniform) of latency_dist."""
+    base = float(settings.get("latency_ms") or 0)
+    if base <= 0:
+        return 0.0
+    dist = str(settings.get("latency_dist") or "fixed").lower()
+    spread = float(settings.get("latency_spread") or 0)
+    if dist == "lognormal":
+        return base * rng.lognormvariate(0.0, spread or 0.5)
+    if dist == "normal":
+        return max(0.0, rng.gauss(base, spread or base * 0.1))
+    if dist == "exponential":
+        return rng.expovariate(1.0 / base)
+    if dist == "uniform":
+        half = spread or base * 0.5
+        return rng.uniform(max(0.0, base - half), base + half)
+    return base
+
+
+class MockProvider:
+    """Offline provider for load tests and CI (model spec `mock:<profile>[,key=value...]`).
+
+    Profiles set latency (latency_ms, latency_dist, latency_spread), failures (error_rate, error_status,
+    retry_after) and the reply: a canned `responses` list or a `template` with {user}, {model},
+    {conversation_id} and {turn_index}, followed by a FINAL_STATE line built from `final_state`.
+    `replay=<run_id or folder>` returns the recorded turn artifacts of an earlier run instead.
+    Randomness is seeded per (seed, conversation, turn, attempt), so repeated runs behave the same.
+    """
+
+    def __init__(self, runs_root: Optional[Path] = None) -> None:
+        self.runs_root = Path(runs_root) if runs_root else None
+        self.enabled = True
+        self._attempts: "OrderedDict[Tuple[Any, ...], int]" = OrderedDict()
+        self._models: Dict[Tuple[str, Optional[str]], Tuple[str, Dict[str, Any]]] = {}
+
+    async def aclose(self) -> None:
+        return None
+
+    def _replay_dir(self, source: str) -> Optional[Path]:
+        """Run folder to replay: an absolute path, or a run_id under MOCK_REPLAY_ROOT or this runs root."""
+        p = Path(source)
+        candidates = [p]
+        if not p.is_absolute():
+            if os.getenv("MOCK_REPLAY_ROOT"):
+                candidates.insert(0, Path(os.environ["MOCK_REPLAY_ROOT"]) / source)
+            if self.runs_root is not None:
+                candidates.insert(0, self.runs_root / source)
+        return next((c for c in candidates if (c / "conversations").is_dir()), None)
+
+    def _replay_path(self, source: str, conversation_id: str, turn_index: int) -> Optional[Path]:
+        run_dir = self._replay_dir(source)
+        if run_dir is None:
+            return None
+        name = f"turn_{int(turn_index):03d}.json"
+        for sub in (conversation_id, conversation_dirname(conversation_id)):
+            p = run_dir / "conversations" / sub / name
+            if p.exists():
+                return p
+        return None
+
+    def _render(self, settings: Dict[str, Any], req: ProviderRequest, rng: random.Random) -> str:
+        meta = req.metadata or {}
+        user = next((str(m.get("content") or "") for m in reversed(req.messages or []) if m.get("role") == "user"), "")
+        user = " ".join(user.split())[:160]
+        responses: List[str] = list(settings.get("responses") or [])
+        if responses:
+            text = responses[rng.randrange(len(responses))]
+        else:
+            text = str(settings.get("template") or "{user}")
+        try:
+            text = text.format(user=user, model=req.model, conversation_id=meta.get("conversation_id"), turn_index=meta.get("turn_index"))
+        except (KeyError, IndexError, ValueError):
+            pass
+        final_state = settings.get("final_state")
+        if final_state is not None and "FINAL_STATE" not in text:
+            text = f"{text}\nFINAL_STATE: {json.dumps(final_state)}"
+        return text
+
+    async def chat(self, req: ProviderRequest) -> ProviderResponse:
+        t0 = time.perf_counter()
+        # parsed once per model spec (and profiles setting) so the mock itself stays off the profile
+        mkey = (req.model, os.getenv("MOCK_PROVIDER_PROFILES"))
+        if mkey not in self._models:
+            self._models[mkey] = parse_mock_model(req.model)
+        name, settings = self._models[mkey]
+        meta = req.metadata or {}
+        ident = (meta.get("run_id"), meta.get("conversation_id"), meta.get("turn_index"))
+        attempt = self._attempts.pop(ident, 0)
+        self._attempts[ident] = attempt + 1
+        while len(self._attempts) > MAX_ATTEMPT_KEYS:
+            self._attempts.popitem(last=False)
+        seed_src = json.dumps([settings.get("seed", 0), req.model, ident[1], ident[2], attempt], default=str)
+        rng = random.Random(int.from_bytes(hashlib.sha256(seed_src.encode("utf-8")).digest()[:8], "big"))
+
+        replay = settings.get("replay")
+        recorded: Optional[Dict[str, Any]] = None
+        if replay:
+            path = self._replay_path(str(replay), str(ident[1]), int(ident[2] or 0))
+            if path is not None:
+                try:
+                    recorded = (json.loads(path.read_text(encoding="utf-8")).get("response") or {})
+                except Exception:
+                    recorded = None
+            if recorded is None:
+                return ProviderResponse(False, "", 0, {"mock": name}, error=f"mock replay: no recorded turn in {replay}")
+
+        if recorded is not None and settings.get("replay_latency", True):
+            delay_ms = float(recorded.get("latency_ms") or 0)
+        else:
+            delay_ms = sample_latency_ms(settings, rng)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+        latency_ms = int((time.perf_counter() - t0) * 1000)
+
+        if rng.random() < float(settings.get("error_rate") or 0):
+            err_meta: Dict[str, Any] = {"mock": name, "status": int(settings.get("error_status") or 503)}
+            if settings.get("retry_after") is not None:
+                err_meta["retry_after"] = str(settings["retry_after"])
+            return ProviderResponse(False, "", latency_ms, err_meta, error="mock provider error")
+        if recorded is not None:
+            if not recorded.get("ok"):
+                # replayed as a permanent failure: no status, so it is neither retried nor trips the breaker
+                kept = {k: v for k, v in (recorded.get("provider_meta") or {}).items() if k not in ("status", "exception", "retry_after")}
+                return ProviderResponse(False, "", latency_ms, {"mock": name, **kept}, error=recorded.get("error") or "recorded failure")
+            return ProviderResponse(True, recorded.get("content") or "", latency_ms,
+                                    {"mock": name, "replay": str(replay), **(recorded.get("provider_meta") or {})})
+        return ProviderResponse(True, self._render(settings, req, rng), latency_ms, {"mock": name})
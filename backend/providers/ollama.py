@@ -1,20 +1,115 @@
 from __future__ import annotations
+import asyncio
+import json
+import os
 import time
-from typing import Dict, Any, List
-import httpx
+from typing import Dict, Any, List, Union
 
 try:
     from .types import ProviderRequest, ProviderResponse
+    from .http_client import HttpClientSettings, PooledClient, error_meta
+    from .streaming import StreamCollector, stream_requested
+    from .endpoints import EndpointPool, parse_urls, route
 except ImportError:
     from providers.types import ProviderRequest, ProviderResponse
+    from providers.http_client import HttpClientSettings, PooledClient, error_meta
+    from providers.streaming import StreamCollector, stream_requested
+    from providers.endpoints import EndpointPool, parse_urls, route
+
+META_KEYS = ("total_duration", "load_duration", "prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration")
+
+
+def load_meta(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """load_ms from Ollama's load_duration (ns), and cold_start when loading took at least OLLAMA_COLD_START_MS (1000)."""
+    ns = meta.get("load_duration")
+    if not isinstance(ns, (int, float)):
+        return {}
+    load_ms = round(ns / 1e6, 1)
+    try:
+        threshold = float(os.getenv("OLLAMA_COLD_START_MS") or 1000)
+    except ValueError:
+        threshold = 1000.0
+    out: Dict[str, Any] = {"load_ms": load_ms}
+    if load_ms >= threshold:
+        out["cold_start"] = True
+    return out
+
 
 class OllamaProvider:
-    def __init__(self, host: str = "http://localhost:11434") -> None:
-        self.base_url = host.rstrip("/")
+    def __init__(self, host: Union[str, List[str]] = "http://localhost:11434") -> None:
+        # one or more hosts (list or comma-separated); calls are routed over them
+        self.endpoints = EndpointPool.from_env("OLLAMA", parse_urls(host) or ["http://localhost:11434"], probe=self._probe)
+        self.base_url = self.endpoints.primary_url
+        self._http = PooledClient(HttpClientSettings.from_env("OLLAMA"))
+        # how long Ollama keeps the model loaded after each call; sent with every request so it stays resident
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _probe(self, base_url: str) -> bool:
+        r = await self._http.get().get(f"{base_url}/api/tags", timeout=5.0)
+        return r.status_code == 200
+
+    async def warm_up(self, model: str) -> Dict[str, Any]:
+        """Load `model` on every endpoint and check it answers, before a run's first turn.
+
+        Returns {model, ok, load_ms, check_ms, endpoints: [{url, ok, load_ms, check_ms, error}]}; load_ms is
+        the slowest endpoint's load time. Calls use OLLAMA_WARMUP_TIMEOUT_S (300) since a cold load can
+        take longer than the regular client timeout.
+        """
+        try:
+            timeout = float(os.getenv("OLLAMA_WARMUP_TIMEOUT_S") or 300)
+        except ValueError:
+            timeout = 300.0
+        results = await asyncio.gather(*[self._warm_up_endpoint(ep.url, model, timeout) for ep in self.endpoints.endpoints])
+        loads = [r["load_ms"] for r in results if r.get("load_ms") is not None]
+        checks = [r["check_ms"] for r in results if r.get("check_ms") is not None]
+        return {
+            "model": model,
+            "ok": all(r["ok"] for r in results),
+            "load_ms": max(loads) if loads else None,
+            "check_ms": max(checks) if checks else None,
+            "endpoints": results,
+        }
+
+    async def _warm_up_endpoint(self, base_url: str, model: str, timeout: float) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"url": base_url, "ok": False, "load_ms": None, "check_ms": None, "error": None}
+        client = self._http.get()
+        try:
+            # a generate call without a prompt only loads the model
+            t0 = time.perf_counter()
+            r = await client.post(f"{base_url}/api/generate", json={"model": model, "keep_alive": self.keep_alive}, timeout=timeout)
+            if r.status_code != 200:
+                out["error"] = f"load failed: HTTP {r.status_code}: {r.text[:200]}"
+                return out
+            data = r.json()
+            ns = data.get("load_duration")
+            out["load_ms"] = round(ns / 1e6, 1) if isinstance(ns, (int, float)) else int((time.perf_counter() - t0) * 1000)
+            # one-token reply proves the loaded model actually answers
+            t1 = time.perf_counter()
+            r = await client.post(f"{base_url}/api/chat", json={
+                "model": model,
+                "messages": [{"role": "user", "content": "ping"}],
+                "stream": False,
+                "keep_alive": self.keep_alive,
+                "options": {"num_predict": 1, "temperature": 0.0},
+            }, timeout=timeout)
+            out["check_ms"] = int((time.perf_counter() - t1) * 1000)
+            if r.status_code != 200:
+                out["error"] = f"check failed: HTTP {r.status_code}: {r.text[:200]}"
+                return out
+            out["ok"] = True
+        except Exception as e:
+            out["error"] = f"{type(e).__name__}: {e}"
+        return out
 
     async def chat(self, req: ProviderRequest) -> ProviderResponse:
+        return await route(self.endpoints, lambda base_url: self._chat(base_url, req))
+
+    async def _chat(self, base_url: str, req: ProviderRequest) -> ProviderResponse:
         t0 = time.perf_counter()
-        url = f"{self.base_url}/api/chat"
+        url = f"{base_url}/api/chat"
         temperature = 0.0  # Set to 0 for deterministic outputs
         top_p = 1.0
         seed = None
@@ -31,6 +126,7 @@ class OllamaProvider:
             "model": req.model,
             "messages": req.messages,
             "stream": False,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": temperature,
                 "top_p": top_p,
@@ -39,16 +135,43 @@ class OllamaProvider:
         # Add seed for deterministic sampling if provided (Ollama supports seed)
         if seed is not None:
             payload["options"]["seed"] = seed
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(url, json=payload)
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                if r.status_code != 200:
-                    return ProviderResponse(False, "", latency_ms, {"status": r.status_code}, error=r.text)
-                data = r.json()
-                content = data.get("message", {}).get("content", "")
-                meta = {k: data.get(k) for k in ("total_duration", "load_duration", "prompt_eval_count", "eval_count")}
-                return ProviderResponse(True, content, latency_ms, meta)
-            except Exception as e:
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                return ProviderResponse(False, "", latency_ms, {}, error=str(e))
+        try:
+            if stream_requested(req):
+                return await self._chat_stream(url, payload, req.model, t0)
+            r = await self._http.get().post(url, json=payload)
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            if r.status_code != 200:
+                return ProviderResponse(False, "", latency_ms, error_meta(r), error=r.text)
+            data = r.json()
+            content = data.get("message", {}).get("content", "")
+            meta = {k: data.get(k) for k in META_KEYS}
+            meta.update(load_meta(meta))
+            return ProviderResponse(True, content, latency_ms, meta)
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            return ProviderResponse(False, "", latency_ms, {"exception": type(e).__name__}, error=str(e))
+
+    async def _chat_stream(self, url: str, payload: Dict[str, Any], model: str, t0: float) -> ProviderResponse:
+        # NDJSON chunks; the final one (done=true) carries the eval counts and durations
+        col = StreamCollector(t0)
+        final: Dict[str, Any] = {}
+        async with self._http.get().stream("POST", url, json={**payload, "stream": True}) as r:
+            if r.status_code != 200:
+                body = (await r.aread()).decode("utf-8", "replace")
+                return ProviderResponse(False, "", col.latency_ms(), {**error_meta(r), "stream": True}, error=body)
+            async for line in r.aiter_lines():
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue
+                if data.get("error"):
+                    raise RuntimeError(str(data["error"]))
+                col.add((data.get("message") or {}).get("content") or "")
+                if data.get("done"):
+                    final = data
+        meta: Dict[str, Any] = {k: final.get(k) for k in META_KEYS}
+        meta.update(load_meta(meta))
+        meta.update(col.timing_meta(meta, model))
+        return ProviderResponse(True, col.text, col.latency_ms(), meta)
@@ -1,28 +1,58 @@
 from __future__ import annotations
+import os
 import time
-from typing import Dict, Any, List
-import httpx
+from typing import Dict, Any, List, Union
 
 try:
     from .types import ProviderRequest, ProviderResponse
+    from .http_client import HttpClientSettings, PooledClient, error_meta, ratelimit_meta
+    from .streaming import StreamCollector, iter_sse_json, stream_requested
+    from .endpoints import EndpointPool, parse_urls, route
 except ImportError:
     from providers.types import ProviderRequest, ProviderResponse
+    from providers.http_client import HttpClientSettings, PooledClient, error_meta, ratelimit_meta
+    from providers.streaming import StreamCollector, iter_sse_json, stream_requested
+    from providers.endpoints import EndpointPool, parse_urls, route
+
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
 
 
 class OpenAIProvider:
-    def __init__(self, api_key: str | None) -> None:
+    def __init__(self, api_key: str | None, base_urls: Union[str, List[str], None] = None) -> None:
         self.api_key = api_key
-        self.base_url = "https://api.openai.com/v1"
+        # OpenAI or OpenAI-compatible servers (vLLM, llama.cpp, LM Studio...); several URLs form a routed pool
+        urls = parse_urls(base_urls or os.getenv("OPENAI_BASE_URLS") or os.getenv("OPENAI_BASE_URL") or DEFAULT_BASE_URL)
+        self.endpoints = EndpointPool.from_env("OPENAI", urls, probe=self._probe)
+        self.base_url = self.endpoints.primary_url
+        self._http = PooledClient(HttpClientSettings.from_env("OPENAI"))
 
     @property
     def enabled(self) -> bool:
-        return bool(self.api_key)
+        # local compatible servers usually need no key
+        return bool(self.api_key) or any(e.url != DEFAULT_BASE_URL for e in self.endpoints.endpoints)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    async def _probe(self, base_url: str) -> bool:
+        r = await self._http.get().get(f"{base_url}/models", headers=self._headers(), timeout=5.0)
+        return r.status_code == 200
 
     async def chat(self, req: ProviderRequest) -> ProviderResponse:
         if not self.enabled:
             return ProviderResponse(False, "", 0, {}, error="OpenAI disabled: missing OPENAI_API_KEY")
+        return await route(self.endpoints, lambda base_url: self._chat(base_url, req))
+
+    async def _chat(self, base_url: str, req: ProviderRequest) -> ProviderResponse:
         t0 = time.perf_counter()
-        url = f"{self.base_url}/chat/completions"
+        url = f"{base_url}/chat/completions"
         # Allow upstream to pass decoding params via a synthetic system message metadata if present.
         # Back-compat: default temperature=0.0 for determinism, max_tokens=512
         temperature = 0.0
@@ -53,27 +83,45 @@ class OpenAIProvider:
         # Add seed for deterministic sampling if provided
         if seed is not None:
             payload["seed"] = seed
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(url, json=payload, headers=headers)
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                if r.status_code != 200:
-                    return ProviderResponse(False, "", latency_ms, {"status": r.status_code}, error=r.text)
-                data = r.json()
-                content = (
-                    (data.get("choices", [{}])[0] or {})
-                    .get("message", {})
-                    .get("content", "")
-                )
-                meta = {
-                    "model": data.get("model"),
-                    "usage": data.get("usage"),
-                }
-                return ProviderResponse(True, content, latency_ms, meta)
-            except Exception as e:
-                latency_ms = int((time.perf_counter() - t0) * 1000)
-                return ProviderResponse(False, "", latency_ms, {}, error=str(e))
+        headers = self._headers()
+        try:
+            if stream_requested(req):
+                return await self._chat_stream(url, payload, headers, req.model, t0)
+            r = await self._http.get().post(url, json=payload, headers=headers)
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            if r.status_code != 200:
+                return ProviderResponse(False, "", latency_ms, error_meta(r), error=r.text)
+            data = r.json()
+            content = (
+                (data.get("choices", [{}])[0] or {})
+                .get("message", {})
+                .get("content", "")
+            )
+            meta = {
+                "model": data.get("model"),
+                "usage": data.get("usage"),
+                **ratelimit_meta(r),
+            }
+            return ProviderResponse(True, content, latency_ms, meta)
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - t0) * 1000)
+            return ProviderResponse(False, "", latency_ms, {"exception": type(e).__name__}, error=str(e))
+
+    async def _chat_stream(self, url: str, payload: Dict[str, Any], headers: Dict[str, str], model: str, t0: float) -> ProviderResponse:
+        # SSE chunks of choices[0].delta; include_usage adds a final chunk with token counts
+        col = StreamCollector(t0)
+        meta: Dict[str, Any] = {"model": None, "usage": None}
+        body = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        async with self._http.get().stream("POST", url, json=body, headers=headers) as r:
+            if r.status_code != 200:
+                text = (await r.aread()).decode("utf-8", "replace")
+                return ProviderResponse(False, "", col.latency_ms(), {**error_meta(r), "stream": True}, error=text)
+            meta.update(ratelimit_meta(r))
+            async for data in iter_sse_json(r):
+                meta["model"] = data.get("model") or meta["model"]
+                if data.get("usage"):
+                    meta["usage"] = data["usage"]
+                for choice in data.get("choices") or []:
+                    col.add(((choice or {}).get("delta") or {}).get("content") or "")
+        meta.update(col.timing_meta(meta, model))
+        return ProviderResponse(True, col.text, col.latency_ms(), meta)
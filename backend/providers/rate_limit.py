@@ -0,0 +1,149 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+try:
+    from ..token_accounting import normalize_usage
+except ImportError:
+    from token_accounting import normalize_usage
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` units, refilled continuously at `rate` units per second."""
+
+    def __init__(self, capacity: float, rate: float) -> None:
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self.level = float(capacity)
+        self._at = time.monotonic()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        return cls(limit, limit / 60.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._at) * self.rate)
+        self._at = now
+
+    def wait_s(self, amount: float) -> float:
+        """Seconds until `amount` units are available (amounts above capacity wait for a full bucket)."""
+        self._refill()
+        need = min(float(amount), self.capacity) - self.level
+        return 0.0 if need <= 0 else need / self.rate if self.rate > 0 else float("inf")
+
+    def take(self, amount: float) -> None:
+        # may go negative: an oversized request borrows from the next refill
+        self._refill()
+        self.level -= float(amount)
+
+    def give(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + float(amount))
+
+    def clamp(self, remaining: float, limit: Optional[float] = None) -> None:
+        """Trust the server's view of the quota: never hold more than it says is left."""
+        self._refill()
+        if limit and limit > 0 and abs(limit - self.capacity) > 0.5:
+            self.capacity = float(limit)
+            self.rate = float(limit) / 60.0
+        self.level = min(self.level, float(remaining))
+
+
+@dataclass
+class Reservation:
+    key: Tuple[str, str]
+    tokens: int
+    waited_s: float
+
+
+def limits_from_env() -> Dict[str, Dict[str, float]]:
+    """PROVIDER_RATE_LIMITS as JSON: {"openai": {"rpm": 500, "tpm": 200000}, "openai:gpt-4o": {"tpm": 30000}}."""
+    raw = os.getenv("PROVIDER_RATE_LIMITS")
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return {}
+    out: Dict[str, Dict[str, float]] = {}
+    for key, lim in (data or {}).items():
+        if isinstance(lim, dict):
+            out[str(key)] = {k: float(v) for k, v in lim.items() if k in ("rpm", "tpm") and v}
+    return out
+
+
+class RateLimiter:
+    """RPM/TPM token buckets per (provider, model).
+
+    Limits come from `limits` (or PROVIDER_RATE_LIMITS): a "provider:model" entry wins over a "provider"
+    entry, and each model gets its own buckets. TPM is reserved before dispatch from the context's token
+    estimate plus the max output tokens, then settled against the provider-reported usage. Remaining-quota
+    headers (x-ratelimit-*) clamp the buckets, and a 429 drains them, so dispatch slows before the provider
+    has to push back.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+        self.limits = limits if limits is not None else limits_from_env()
+        self._buckets: Dict[Tuple[str, str], Dict[str, TokenBucket]] = {}
+
+    def limits_for(self, provider: str, model: str) -> Dict[str, float]:
+        return self.limits.get(f"{provider}:{model}") or self.limits.get(provider) or {}
+
+    def _buckets_for(self, provider: str, model: str) -> Dict[str, TokenBucket]:
+        key = (provider, model)
+        if key not in self._buckets:
+            lim = self.limits_for(provider, model)
+            self._buckets[key] = {k: TokenBucket.per_minute(v) for k, v in lim.items()}
+        return self._buckets[key]
+
+    async def acquire(
+        self, provider: str, model: str, tokens: int, sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ) -> Reservation:
+        buckets = self._buckets_for(provider, model)
+        waited = 0.0
+        while buckets:
+            wait = 0.0
+            if "rpm" in buckets:
+                wait = max(wait, buckets["rpm"].wait_s(1))
+            if "tpm" in buckets:
+                wait = max(wait, buckets["tpm"].wait_s(tokens))
+            if wait <= 0:
+                break
+            await sleep(wait)
+            waited += wait
+        if "rpm" in buckets:
+            buckets["rpm"].take(1)
+        if "tpm" in buckets:
+            buckets["tpm"].take(tokens)
+        return Reservation((provider, model), int(tokens), waited)
+
+    def settle(self, res: Reservation, provider_meta: Optional[Dict[str, Any]], status: Optional[int] = None) -> None:
+        buckets = self._buckets.get(res.key) or {}
+        if not buckets:
+            return
+        meta = provider_meta or {}
+        tpm = buckets.get("tpm")
+        if tpm is not None:
+            usage = normalize_usage(meta)
+            if usage["input_tokens"] is not None or usage["output_tokens"] is not None:
+                used = int(usage["input_tokens"] or 0) + int(usage["output_tokens"] or 0)
+                tpm.give(res.tokens - used)  # refund over-reservation, or charge the shortfall
+        rl = meta.get("ratelimit") or {}
+        for kind, bucket in (("requests", buckets.get("rpm")), ("tokens", tpm)):
+            if bucket is None:
+                continue
+            remaining = rl.get(f"x-ratelimit-remaining-{kind}")
+            try:
+                if remaining is not None:
+                    limit = rl.get(f"x-ratelimit-limit-{kind}")
+                    bucket.clamp(float(remaining), float(limit) if limit is not None else None)
+            except (TypeError, ValueError):
+                pass
+        if status == 429:
+            for bucket in buckets.values():
+                bucket.level = min(bucket.level, 0.0)
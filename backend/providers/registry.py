@@ -1,6 +1,8 @@
 from __future__ import annotations
+import asyncio
 import os
-from typing import Dict
+import time
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 
 # Load .env from repo root so CLI and scripts pick up API keys without starting the web app
@@ -30,28 +32,130 @@ def _load_env_from_file() -> None:
 
 _load_env_from_file()
 
+try:
+    from ..telemetry import PROVIDER_ERRORS, PROVIDER_INFLIGHT, PROVIDER_REQUEST_SECONDS, PROVIDER_RETRIES
+except ImportError:
+    from telemetry import PROVIDER_ERRORS, PROVIDER_INFLIGHT, PROVIDER_REQUEST_SECONDS, PROVIDER_RETRIES
+
 try:
     from .ollama import OllamaProvider
     from .gemini import GeminiProvider
     from .openai import OpenAIProvider
+    from .mock import MockProvider
+    from .resilience import CircuitBreaker, RetryPolicy, call_with_resilience
+    from .rate_limit import RateLimiter
+    from .hedging import Hedger
+    from .types import ProviderRequest, ProviderResponse
 except ImportError:
     from providers.ollama import OllamaProvider
     from providers.gemini import GeminiProvider
     from providers.openai import OpenAIProvider
+    from providers.mock import MockProvider
+    from providers.resilience import CircuitBreaker, RetryPolicy, call_with_resilience
+    from providers.rate_limit import RateLimiter
+    from providers.hedging import Hedger
+    from providers.types import ProviderRequest, ProviderResponse
 
 class ProviderRegistry:
-    def __init__(self) -> None:
+    def __init__(self, runs_root: Optional[Path] = None) -> None:
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self._ollama = OllamaProvider(self.ollama_host)
+        # OLLAMA_HOSTS (comma-separated) spreads calls over several Ollama boxes
+        self._ollama = OllamaProvider(os.getenv("OLLAMA_HOSTS") or self.ollama_host)
         self._gemini = GeminiProvider(self.google_api_key)
         self._openai = OpenAIProvider(self.openai_api_key)
+        # offline load-test provider; replays resolve run ids under runs_root
+        self._mock = MockProvider(runs_root)
+        self._retry: Dict[str, RetryPolicy] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.rate_limiter = RateLimiter()
+        self.hedger = Hedger()
 
     @property
     def gemini_enabled(self) -> bool:
         return self._gemini.enabled
 
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients (app shutdown)."""
+        for p in (self._ollama, self._gemini, self._openai, self._mock):
+            try:
+                await p.aclose()
+            except Exception:
+                pass
+
+    def endpoint_stats(self) -> Dict[str, Any]:
+        """Per-endpoint routing stats of providers with an endpoint pool."""
+        return {name: p.endpoints.stats() for name, p in (("ollama", self._ollama), ("openai", self._openai))}
+
+    async def check_endpoints(self) -> Dict[str, Dict[str, bool]]:
+        """Run the health probes now; failing endpoints are ejected, recovered ones re-admitted."""
+        return {name: await p.endpoints.check_health() for name, p in (("ollama", self._ollama), ("openai", self._openai))}
+
+    async def warm_up(self, provider: str, model: str) -> Optional[Dict[str, Any]]:
+        """Pre-flight load of `model` for providers that support it (Ollama); None for the others."""
+        fn = getattr(self.get(provider), "warm_up", None)
+        return await fn(model) if fn is not None else None
+
+    def retry_policy(self, provider: str) -> RetryPolicy:
+        if provider not in self._retry:
+            self._retry[provider] = RetryPolicy.from_env(provider)
+        return self._retry[provider]
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker.from_env(provider)
+        return self._breakers[provider]
+
+    async def chat(self, provider: str, req: ProviderRequest) -> Tuple[ProviderResponse, Dict[str, Any]]:
+        """adapter.chat behind the RPM/TPM limiter, optional hedging, retries (jittered backoff,
+        Retry-After) and the provider's circuit breaker.
+
+        Returns the response and the resilience record of the call (see call_with_resilience), plus
+        rate_limit_wait_ms and hedge {fired, hedge_won, saved_ms_est}.
+        """
+        adapter = self.get(provider)
+        meta = req.metadata or {}
+        # TPM reservation: context estimate from build_context plus the output budget
+        reserve = int(meta.get("token_estimate") or 0) + int((meta.get("params") or {}).get("max_tokens") or 512)
+        waited = 0.0
+
+        async def limited_chat(r: ProviderRequest) -> ProviderResponse:
+            nonlocal waited
+            res = await self.rate_limiter.acquire(provider, r.model, reserve)
+            waited += res.waited_s
+            t0 = time.perf_counter()
+            PROVIDER_INFLIGHT.inc(provider=provider)
+            try:
+                resp = await adapter.chat(r)
+            except BaseException as e:
+                # a cancelled hedge loser is not a provider error
+                if not isinstance(e, asyncio.CancelledError):
+                    PROVIDER_ERRORS.inc(provider=provider, model=r.model, reason=type(e).__name__)
+                raise
+            finally:
+                PROVIDER_INFLIGHT.dec(provider=provider)
+            pm = getattr(resp, "provider_meta", None) or {}
+            ok = bool(getattr(resp, "ok", False))
+            PROVIDER_REQUEST_SECONDS.observe(time.perf_counter() - t0, provider=provider, model=r.model, outcome="ok" if ok else "error")
+            if not ok:
+                PROVIDER_ERRORS.inc(provider=provider, model=r.model, reason=str(pm.get("status") or pm.get("exception") or "error"))
+            self.rate_limiter.settle(res, pm, pm.get("status"))
+            return resp
+
+        hedge: Dict[str, Any] = {}
+
+        async def hedged_chat(r: ProviderRequest) -> ProviderResponse:
+            return await self.hedger.call(provider, limited_chat, r, hedge)
+
+        resp, info = await call_with_resilience(hedged_chat, req, self.retry_policy(provider), self.breaker(provider))
+        info["rate_limit_wait_ms"] = int(waited * 1000)
+        if info.get("retries"):
+            PROVIDER_RETRIES.inc(info["retries"], provider=provider, model=req.model)
+        if hedge:
+            info["hedge"] = hedge
+        return resp, info
+
     def get(self, provider: str):
         if provider == "ollama":
             return self._ollama
@@ -59,4 +163,6 @@ class ProviderRegistry:
             return self._gemini
         if provider == "openai":
             return self._openai
+        if provider == "mock":
+            return self._mock
         raise KeyError(f"Unknown provider: {provider}")
@@ -0,0 +1,209 @@
+from __future__ import annotations
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Tuple
+
+try:
+    from .types import ProviderRequest, ProviderResponse
+except ImportError:
+    from providers.types import ProviderRequest, ProviderResponse
+
+DEFAULT_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def _env(provider: str, name: str) -> Optional[str]:
+    # Per-provider override (OPENAI_MAX_RETRIES) wins over the global one (PROVIDER_MAX_RETRIES)
+    return os.getenv(f"{provider.upper()}_{name}") or os.getenv(f"PROVIDER_{name}")
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 3
+    backoff_base_ms: float = 500.0
+    backoff_max_ms: float = 30_000.0
+    # Retry-After longer than this is not waited for; the turn fails instead
+    max_retry_after_s: float = 120.0
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: DEFAULT_RETRY_STATUSES)
+
+    @classmethod
+    def from_env(cls, provider: str) -> "RetryPolicy":
+        p = cls()
+        try:
+            p.max_retries = int(_env(provider, "MAX_RETRIES") or p.max_retries)
+            p.backoff_base_ms = float(_env(provider, "BACKOFF_BASE_MS") or p.backoff_base_ms)
+            p.backoff_max_ms = float(_env(provider, "BACKOFF_MAX_MS") or p.backoff_max_ms)
+            p.max_retry_after_s = float(_env(provider, "MAX_RETRY_AFTER_S") or p.max_retry_after_s)
+            statuses = _env(provider, "RETRY_STATUSES")
+            if statuses:
+                p.retry_statuses = frozenset(int(x) for x in statuses.split(",") if x.strip())
+        except ValueError:
+            pass
+        return p
+
+    def retryable(self, resp: ProviderResponse) -> bool:
+        """Transient failures only: listed HTTP statuses and transport errors (timeouts, resets)."""
+        if resp.ok:
+            return False
+        meta = resp.provider_meta or {}
+        if meta.get("status") is not None:
+            return int(meta["status"]) in self.retry_statuses
+        return "exception" in meta
+
+    def delay_s(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff; a server Retry-After is a floor."""
+        cap = min(self.backoff_max_ms, self.backoff_base_ms * (2 ** attempt)) / 1000.0
+        delay = random.uniform(0.0, cap)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Seconds to wait from a Retry-After header value (delta-seconds or HTTP date)."""
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+
+class CircuitBreaker:
+    """Per-provider breaker: opens after consecutive transient failures, holding back every caller.
+
+    While open, `acquire` waits out the cooldown instead of failing, so a job stops dispatching turns
+    against a provider that is down. After the cooldown one probe call goes through (half-open):
+    success closes the breaker, failure re-opens it with a doubled cooldown (up to max_cooldown_s).
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_s: float = 30.0, max_cooldown_s: float = 300.0) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.base_cooldown_s = float(cooldown_s)
+        self.max_cooldown_s = float(max_cooldown_s)
+        self.cooldown_s = self.base_cooldown_s
+        self.state = "closed"
+        self.failures = 0
+        self.opened_until = 0.0
+        self.opened_count = 0
+        self._probe_in_flight = False
+
+    @classmethod
+    def from_env(cls, provider: str) -> "CircuitBreaker":
+        try:
+            return cls(
+                failure_threshold=int(_env(provider, "BREAKER_FAILURES") or 5),
+                cooldown_s=float(_env(provider, "BREAKER_COOLDOWN_S") or 30.0),
+                max_cooldown_s=float(_env(provider, "BREAKER_MAX_COOLDOWN_S") or 300.0),
+            )
+        except ValueError:
+            return cls()
+
+    async def acquire(self, sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep) -> float:
+        """Wait until a call may go out; returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            if self.state == "closed":
+                return waited
+            if self.state == "open" and now >= self.opened_until:
+                self.state = "half-open"
+            if self.state == "half-open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return waited
+            # open, or half-open with a probe already out: check again shortly
+            pause = max(0.05, min(1.0, self.opened_until - now)) if self.state == "open" else 0.1
+            await sleep(pause)
+            waited += pause
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown_s = self.base_cooldown_s
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half-open":
+            self.cooldown_s = min(self.max_cooldown_s, self.cooldown_s * 2)
+            self._open()
+        elif self.state == "closed" and self.failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot whose call never finished (cancelled or raised)."""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_until = time.monotonic() + self.cooldown_s
+        self.opened_count += 1
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "opened_count": self.opened_count}
+
+
+async def call_with_resilience(
+    chat: Callable[[ProviderRequest], Awaitable[ProviderResponse]],
+    req: ProviderRequest,
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+) -> Tuple[ProviderResponse, Dict[str, Any]]:
+    """Call `chat` with retries and circuit breaking.
+
+    Returns the last response and a record for the turn artifact:
+    {attempts, retries, wasted_ms, breaker_wait_ms, errors: [{status|exception, latency_ms, retry_after_s}]}.
+    wasted_ms is time lost to failed attempts plus backoff sleeps.
+    """
+    info: Dict[str, Any] = {"attempts": 0, "retries": 0, "wasted_ms": 0, "breaker_wait_ms": 0, "errors": []}
+    attempt = 0
+    while True:
+        if breaker is not None:
+            info["breaker_wait_ms"] += int(await breaker.acquire(sleep) * 1000)
+        info["attempts"] += 1
+        try:
+            resp = await chat(req)
+        except BaseException:
+            # a cancelled or crashed probe must not keep the breaker half-open forever
+            if breaker is not None:
+                breaker.release()
+            raise
+        transient = policy.retryable(resp)
+        if breaker is not None:
+            if resp.ok or not transient:
+                # a 4xx is the caller's problem, not the provider's health
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+        if not transient:
+            return resp, info
+        meta = resp.provider_meta or {}
+        retry_after = parse_retry_after(meta.get("retry_after"))
+        err: Dict[str, Any] = {"latency_ms": int(resp.latency_ms or 0)}
+        if meta.get("status") is not None:
+            err["status"] = meta.get("status")
+        if meta.get("exception"):
+            err["exception"] = meta.get("exception")
+        if retry_after is not None:
+            err["retry_after_s"] = retry_after
+        info["errors"].append(err)
+        if attempt >= policy.max_retries or (retry_after is not None and retry_after > policy.max_retry_after_s):
+            return resp, info
+        delay = policy.delay_s(attempt, retry_after)
+        info["wasted_ms"] += int(resp.latency_ms or 0) + int(delay * 1000)
+        await sleep(delay)
+        attempt += 1
+        info["retries"] = attempt
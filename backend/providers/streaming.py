@@ -0,0 +1,90 @@
+from __future__ import annotations
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+try:
+    from ..token_accounting import count_tokens, normalize_usage
+except ImportError:
+    from token_accounting import count_tokens, normalize_usage
+
+try:
+    from .types import ProviderRequest
+except ImportError:
+    from providers.types import ProviderRequest
+
+
+def stream_requested(req: ProviderRequest) -> bool:
+    """Streaming is chosen per request (metadata.stream, from config.context.stream), else PROVIDER_STREAM."""
+    flag = (req.metadata or {}).get("stream")
+    if flag is None:
+        flag = os.getenv("PROVIDER_STREAM", "")
+    if isinstance(flag, str):
+        return flag.strip().lower() in ("1", "true", "yes", "on")
+    return bool(flag)
+
+
+async def iter_sse_json(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """JSON payloads of a server-sent events stream (`data: {...}` lines, ends at `data: [DONE]`)."""
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        try:
+            yield json.loads(data)
+        except ValueError:
+            continue
+
+
+class StreamCollector:
+    """Collects streamed text chunks with their arrival times."""
+
+    def __init__(self, t0: float) -> None:
+        self.t0 = t0
+        self.parts: List[str] = []
+        self.chunks = 0
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+
+    def add(self, text: str) -> None:
+        if not text:
+            return
+        now = time.perf_counter()
+        if self.first_at is None:
+            self.first_at = now
+        self.last_at = now
+        self.chunks += 1
+        self.parts.append(text)
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def latency_ms(self) -> int:
+        return int((time.perf_counter() - self.t0) * 1000)
+
+    def timing_meta(self, provider_meta: Dict[str, Any], model: Optional[str] = None) -> Dict[str, Any]:
+        """stream, ttft_ms, stream_ms, stream_chunks and stream_tokens_per_sec for provider_meta.
+
+        Throughput is measured between the first and the last chunk, so it excludes time to first token;
+        output tokens come from the provider's usage counts when streamed back, else the offline tokenizer.
+        """
+        out_tokens = normalize_usage(provider_meta).get("output_tokens")
+        if out_tokens is None:
+            out_tokens = count_tokens(self.text, model)
+        ttft_ms = int((self.first_at - self.t0) * 1000) if self.first_at is not None else None
+        stream_ms = (self.last_at - self.first_at) * 1000 if self.first_at is not None and self.last_at is not None else 0.0
+        tps = round((out_tokens - 1) * 1000.0 / stream_ms, 2) if stream_ms > 0 and out_tokens > 1 else None
+        return {
+            "stream": True,
+            "ttft_ms": ttft_ms,
+            "stream_ms": int(stream_ms),
+            "stream_chunks": self.chunks,
+            "stream_tokens_per_sec": tps,
+        }
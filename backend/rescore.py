@@ -0,0 +1,171 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .dataset_repo import DatasetRepository
+    from .artifacts import RunArtifactWriter, conversation_dirname
+    from .orchestrator import SharedRunState, compute_run_id, merge_results, normalize_metrics, score_conversation, semantic_texts
+    from .embeddings.store import embedding_store_for
+    from .embeddings.batching import EmbeddingBatcher, prefetch_embeddings
+    from .embeddings.ollama_embed import shared_embeddings
+except ImportError:  # test fallback
+    from backend.dataset_repo import DatasetRepository
+    from backend.artifacts import RunArtifactWriter, conversation_dirname
+    from backend.orchestrator import SharedRunState, compute_run_id, merge_results, normalize_metrics, score_conversation, semantic_texts
+    from backend.embeddings.store import embedding_store_for
+    from backend.embeddings.batching import EmbeddingBatcher, prefetch_embeddings
+    from backend.embeddings.ollama_embed import shared_embeddings
+
+# Conversations per worker task; small enough to balance, large enough to amortize process startup
+CHUNK_SIZE = 25
+
+
+def load_turn_records(runs_root: Path, run_id: str, conv: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Persisted turn artifacts of one conversation (every user turn that has one, ok or not)."""
+    cid = conv.get("conversation_id")
+    conv_root = Path(runs_root) / run_id / "conversations"
+    records: List[Dict[str, Any]] = []
+    for idx, t in enumerate(conv.get("turns", []) or []):
+        if t.get("role") != "user":
+            continue
+        name = f"turn_{idx:03d}.json"
+        for p in (conv_root / cid / name, conv_root / conversation_dirname(cid) / name):
+            if not p.exists():
+                continue
+            try:
+                rec = json.loads(p.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            records.append({"turn_index": idx, **rec})
+            break
+    return records
+
+
+def _score_chunk(task: Tuple[str, str, Dict[str, Any], Dict[str, Any], List[str], Dict[str, Any], List[Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Worker: score a slice of one run's conversations. Returns (conversation_id, entry) pairs."""
+    runs_root, run_id, ds_header, goldens, metrics, thresholds, convs = task
+    shared = SharedRunState(dataset=ds_header, domain=(ds_header.get("metadata") or {}).get("domain", "commerce"),
+                            metrics_wanted=metrics, goldens=goldens, thresholds=thresholds,
+                            embed_store=embedding_store_for(Path(runs_root)))
+
+    async def _run() -> List[Tuple[str, Dict[str, Any]]]:
+        out: List[Tuple[str, Dict[str, Any]]] = []
+        loaded = [(conv, load_turn_records(Path(runs_root), run_id, conv)) for conv in convs]
+        loaded = [(conv, records) for conv, records in loaded if records]  # skip conversations that never ran
+        if "semantic" in shared.metrics_wanted:
+            shared.embedder = EmbeddingBatcher(shared_embeddings())
+            # everything the chunk needs embedded, in as few requests as the batch size allows
+            texts = [t for conv, records in loaded for t in semantic_texts(shared, conv, records)]
+            await prefetch_embeddings(shared.embedder, texts, shared.embed_cache, shared.embed_store)
+        try:
+            for conv, records in loaded:
+                out.append((conv.get("conversation_id"), await score_conversation(Path(runs_root), run_id, shared, conv, records)))
+        finally:
+            if shared.embedder is not None:
+                await shared.embedder.aclose()
+        return out
+
+    return asyncio.run(_run())
+
+
+def expand_run_ids(runs_root: Path, run_ids: List[str], repo: DatasetRepository) -> List[str]:
+    """Matrix job folders stand for their per-model runs."""
+    out: List[str] = []
+    for rid in run_ids:
+        cfg_path = Path(runs_root) / rid / "run_config.json"
+        cfg = json.loads(cfg_path.read_text(encoding="utf-8")) if cfg_path.exists() else {}
+        specs = cfg.get("model_specs")
+        if specs:
+            ds = repo.get_dataset(cfg["dataset_id"])
+            base_cfg = {k: v for k, v in cfg.items() if k not in ("dataset_id", "model_specs")}
+            out.extend(compute_run_id(ds["dataset_id"], ds["version"], spec, base_cfg) for spec in specs)
+        else:
+            out.append(rid)
+    return out
+
+
+def rescore_runs(
+    runs_root: Path,
+    datasets_dir: Optional[Path],
+    run_ids: List[str],
+    *,
+    metrics: Optional[List[str]] = None,
+    thresholds: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Recompute metrics for existing runs from their turn artifacts, without calling any provider.
+
+    Each run gets a new results.v<N>.json/.csv next to results.json (which is left untouched).
+    metrics/thresholds default to the run's own config; thresholds given here override per key.
+    Returns one {run_id, version, path, conversations, passed} summary per run.
+    """
+    runs_root = Path(runs_root)
+    repo = DatasetRepository(datasets_dir)
+    writer = RunArtifactWriter(runs_root)
+    plans: Dict[str, Dict[str, Any]] = {}
+    tasks: List[Tuple[str, str, Dict[str, Any], Dict[str, Any], List[str], Dict[str, Any], List[Dict[str, Any]]]] = []
+    for rid in expand_run_ids(runs_root, list(run_ids), repo):
+        cfg_path = runs_root / rid / "run_config.json"
+        if not cfg_path.exists():
+            raise FileNotFoundError(f"run_config.json not found for run: {rid}")
+        cfg = json.loads(cfg_path.read_text(encoding="utf-8"))
+        ds = repo.get_dataset(cfg["dataset_id"])
+        goldens = repo.golden_index(ds["dataset_id"])
+        plan = {
+            "config": cfg,
+            "dataset": ds,
+            "metrics": normalize_metrics(metrics if metrics is not None else cfg.get("metrics")),
+            "thresholds": {**(cfg.get("thresholds") or {}), **(thresholds or {})},
+        }
+        plans[rid] = plan
+        # ship only what scoring needs: dataset header (no conversations) and this chunk's goldens
+        header = {k: v for k, v in ds.items() if k != "conversations"}
+        convs = ds.get("conversations", []) or []
+        for i in range(0, len(convs), CHUNK_SIZE):
+            chunk = convs[i:i + CHUNK_SIZE]
+            chunk_goldens = {c.get("conversation_id"): goldens[c.get("conversation_id")] for c in chunk if c.get("conversation_id") in goldens}
+            tasks.append((str(runs_root), rid, header, chunk_goldens, plan["metrics"], plan["thresholds"], chunk))
+
+    workers = max(1, min(int(workers or os.cpu_count() or 1), len(tasks) or 1))
+    if workers == 1:
+        chunks = [_score_chunk(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            chunks = list(ex.map(_score_chunk, tasks))
+
+    scored: Dict[str, Dict[str, Dict[str, Any]]] = {rid: {} for rid in plans}
+    for t, pairs in zip(tasks, chunks):
+        scored[t[1]].update(dict(pairs))
+
+    summaries: List[Dict[str, Any]] = []
+    for rid, plan in plans.items():
+        ds = plan["dataset"]
+        entries = [scored[rid][c.get("conversation_id")] for c in ds.get("conversations", []) or [] if c.get("conversation_id") in scored[rid]]
+        results = merge_results(run_id=rid, dataset=ds, model_spec=plan["config"].get("model_spec"), entries=entries)
+        version = max([1] + writer.layout.results_versions(rid)) + 1
+        results["rescore"] = {
+            "version": version,
+            "metrics": plan["metrics"],
+            "thresholds": plan["thresholds"],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        path = writer.write_results_json(rid, results, version=version)
+        try:
+            writer.write_results_csv(rid, results, version=version)
+        except Exception:
+            pass
+        convs = results.get("conversations", [])
+        summaries.append({
+            "run_id": rid,
+            "version": version,
+            "path": str(path),
+            "conversations": len(convs),
+            "passed": sum(1 for c in convs if (c.get("summary") or {}).get("conversation_pass") is True),
+        })
+    return summaries
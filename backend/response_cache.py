@@ -0,0 +1,140 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Per-run cache modes (config.context.response_cache, default RESPONSE_CACHE_MODE or bypass)
+CACHE_MODES = ("read-write", "read-only", "bypass")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30.0
+# puts between full sweeps (expiry, exact size total); in between, a running total decides eviction
+SWEEP_EVERY = 256
+
+
+def normalize_cache_mode(value: Any) -> str:
+    mode = str(value or os.getenv("RESPONSE_CACHE_MODE") or "bypass").strip().lower().replace("_", "-")
+    if mode in ("rw", "on", "true", "1"):
+        mode = "read-write"
+    if mode in ("ro", "readonly"):
+        mode = "read-only"
+    if mode in ("off", "false", "0", "none"):
+        mode = "bypass"
+    if mode not in CACHE_MODES:
+        raise ValueError(f"unknown response cache mode: {value}")
+    return mode
+
+
+def cache_key(provider: str, model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]]) -> str:
+    """Content address of a provider call: sha256 over the canonical JSON of everything that shapes the reply."""
+    blob = json.dumps(
+        {"provider": provider, "model": model, "messages": messages, "params": params or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class ResponseCache:
+    """SQLite store of successful provider replies, evicted by age and by total size (least recently used first)."""
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("RESPONSE_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024)
+        if max_age_days is None:
+            max_age_days = float(os.getenv("RESPONSE_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS))
+        self.max_bytes = int(max_bytes)
+        self.max_age_s = float(max_age_days) * 86400.0
+        self._lock = threading.Lock()
+        # running size of the table; None until the first sweep. Other processes sharing the file
+        # can make it drift, which the periodic sweep corrects.
+        self._total: Optional[int] = None
+        self._puts = 0
+        with closing(self._connect()) as con, con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    latency_ms INTEGER,
+                    provider_meta TEXT,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+            con.execute("CREATE INDEX IF NOT EXISTS responses_created_at ON responses(created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(str(self.path), timeout=10.0)
+        con.execute("PRAGMA journal_mode=WAL")
+        return con
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock, closing(self._connect()) as con, con:
+            row = con.execute(
+                "SELECT content, latency_ms, provider_meta, created_at, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[3] > self.max_age_s:
+                con.execute("DELETE FROM responses WHERE key = ?", (key,))
+                if self._total is not None:
+                    self._total -= row[4]
+                return None
+            con.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return {"content": row[0], "latency_ms": row[1], "provider_meta": json.loads(row[2] or "{}")}
+
+    def put(self, key: str, *, provider: str, model: str, content: str, latency_ms: int, provider_meta: Dict[str, Any]) -> None:
+        now = time.time()
+        meta = json.dumps(provider_meta or {}, separators=(",", ":"))
+        size = len(content.encode("utf-8")) + len(meta) + len(key)
+        with self._lock, closing(self._connect()) as con, con:
+            old = con.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            con.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, content, latency_ms, provider_meta, size, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, content, int(latency_ms or 0), meta, size, now, now),
+            )
+            self._puts += 1
+            if self._total is not None:
+                self._total += size - (old[0] if old else 0)
+            if self._total is None or self._total > self.max_bytes or self._puts >= SWEEP_EVERY:
+                self._evict(con, now)
+
+    def _evict(self, con: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then least recently used ones until under max_bytes; resyncs the running total."""
+        self._puts = 0
+        con.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_s,))
+        total = con.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        # drop least recently used rows until under the size cap
+        freed = 0
+        doomed: List[str] = []
+        for key, size in con.execute("SELECT key, size FROM responses ORDER BY last_used ASC"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append(key)
+            freed += size
+        con.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in doomed])
+        self._total = total - freed
+
+    def stats(self) -> Dict[str, int]:
+        with closing(self._connect()) as con:
+            n, size = con.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": int(n), "bytes": int(size)}
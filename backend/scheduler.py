@@ -0,0 +1,220 @@
+from __future__ import annotations
+import os
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .job_store import JobStore
+    from .orchestrator import Orchestrator, JobRecord
+except ImportError:  # test fallback
+    from backend.job_store import JobStore
+    from backend.orchestrator import Orchestrator, JobRecord
+
+# Lower value runs first
+PRIORITIES = {"interactive": 0, "normal": 10, "batch": 20}
+DEFAULT_PRIORITY = PRIORITIES["normal"]
+# Concurrently running jobs per provider; a single local Ollama box is easily saturated
+DEFAULT_PROVIDER_LIMITS = {"ollama": 1}
+DEFAULT_PROVIDER_LIMIT = 2
+
+
+def parse_priority(value: Any) -> int:
+    """Accept a named class ('interactive' | 'normal' | 'batch') or an integer."""
+    if value is None:
+        return DEFAULT_PRIORITY
+    if isinstance(value, str) and value.lower() in PRIORITIES:
+        return PRIORITIES[value.lower()]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"unknown priority: {value}")
+
+
+def provider_limits_from_env() -> Dict[str, int]:
+    """SCHEDULER_PROVIDER_LIMITS='ollama=1,openai=4,gemini=4' overrides the defaults."""
+    limits = dict(DEFAULT_PROVIDER_LIMITS)
+    raw = os.getenv("SCHEDULER_PROVIDER_LIMITS", "")
+    for part in raw.split(","):
+        if "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        try:
+            limits[k.strip()] = max(1, int(v.strip()))
+        except ValueError:
+            continue
+    return limits
+
+
+@dataclass
+class QueuedJob:
+    job_id: str
+    vertical: str
+    providers: Tuple[str, ...]
+    priority: int
+    seq: int
+
+
+class JobScheduler:
+    """Global admission control for jobs across all vertical orchestrators.
+
+    Jobs are persisted in a JobStore and started only while every provider they use is
+    under its running-job limit. Among startable jobs, the lowest priority value wins;
+    within a priority class, the vertical with the fewest running jobs goes first, then
+    submission order.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        orch_for: Callable[[str], Orchestrator],
+        provider_limits: Optional[Dict[str, int]] = None,
+        default_limit: int = DEFAULT_PROVIDER_LIMIT,
+    ) -> None:
+        self.store = store
+        self._orch_for = orch_for
+        self.provider_limits = dict(provider_limits if provider_limits is not None else provider_limits_from_env())
+        self.default_limit = max(1, int(default_limit))
+        self._queue: List[QueuedJob] = []
+        self._running: Dict[str, QueuedJob] = {}
+        self._seq = 0
+
+    def new_job_id(self) -> str:
+        return self.store.next_job_id()
+
+    def release_job_id(self, job_id: str) -> None:
+        """Give back an id from new_job_id() when the submission it was reserved for fails."""
+        self.store.release(job_id)
+
+    def limit_for(self, provider: str) -> int:
+        return self.provider_limits.get(provider, self.default_limit)
+
+    @staticmethod
+    def _providers(model_specs: List[str]) -> Tuple[str, ...]:
+        return tuple(sorted({Orchestrator.parse_model_spec(m)[0] for m in model_specs}))
+
+    def enqueue(
+        self,
+        vertical: str,
+        jr: JobRecord,
+        *,
+        kind: str,
+        priority: int = DEFAULT_PRIORITY,
+        dataset_id: Optional[str] = None,
+        model_specs: Optional[List[str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Persist a submitted job and start it as soon as capacity allows.
+
+        kind is 'run', 'matrix' or 'resume' and decides how the job is re-created after a restart.
+        """
+        specs = list(model_specs or ([jr.config["model_spec"]] if jr.config.get("model_spec") else jr.config.get("model_specs") or []))
+        self.store.add(
+            job_id=jr.job_id,
+            vertical=vertical,
+            kind=kind,
+            dataset_id=dataset_id or jr.config.get("dataset_id"),
+            model_specs=specs,
+            config=config or {},
+            run_id=jr.run_id,
+            priority=priority,
+        )
+        self._push(jr.job_id, vertical, specs, priority)
+        self.dispatch()
+
+    def _push(self, job_id: str, vertical: str, model_specs: List[str], priority: int) -> None:
+        self._seq += 1
+        self._queue.append(QueuedJob(job_id, vertical, self._providers(model_specs), priority, self._seq))
+
+    def _ordered(self) -> List[QueuedJob]:
+        """Queued jobs in the order they would be started."""
+        served = Counter(q.vertical for q in self._running.values())
+        out: List[QueuedJob] = []
+        for prio in sorted({q.priority for q in self._queue}):
+            tier = sorted((q for q in self._queue if q.priority == prio), key=lambda q: q.seq)
+            # fair share: least-served vertical next, then submission order
+            while tier:
+                pick = min(tier, key=lambda q: (served[q.vertical], q.seq))
+                tier.remove(pick)
+                served[pick.vertical] += 1
+                out.append(pick)
+        return out
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position among queued jobs, or None when the job is not queued."""
+        for i, q in enumerate(self._ordered(), start=1):
+            if q.job_id == job_id:
+                return i
+        return None
+
+    def depth(self) -> Dict[str, int]:
+        """Jobs waiting in the queue and jobs started but not yet finished."""
+        return {"queued": len(self._queue), "running": len(self._running)}
+
+    def dispatch(self) -> List[str]:
+        """Start every queued job that fits under the provider limits. Returns the started job ids."""
+        started: List[str] = []
+        while True:
+            in_use = Counter(p for q in self._running.values() for p in q.providers)
+            picked = None
+            for q in self._ordered():
+                jr = self._orch_for(q.vertical).jobs.get(q.job_id)
+                if jr is not None and jr.state == "paused":
+                    # paused before it started: keeps its place until resumed
+                    continue
+                if jr is None or jr.state != "queued":
+                    # cancelled (or lost) while waiting in the queue
+                    picked = q
+                    break
+                if all(in_use[p] < self.limit_for(p) for p in q.providers):
+                    picked = q
+                    break
+            if picked is None:
+                return started
+            self._queue.remove(picked)
+            orch = self._orch_for(picked.vertical)
+            jr = orch.jobs.get(picked.job_id)
+            if jr is None or jr.state != "queued":
+                self.store.update_state(picked.job_id, jr.state if jr else "failed")
+                continue
+            self._running[picked.job_id] = picked
+            orch.start(picked.job_id)
+            self.store.update_state(picked.job_id, "running")
+            if jr._task is not None:
+                jr._task.add_done_callback(lambda _t, q=picked: self._on_done(q))
+            started.append(picked.job_id)
+
+    def _on_done(self, q: QueuedJob) -> None:
+        self._running.pop(q.job_id, None)
+        jr = self._orch_for(q.vertical).jobs.get(q.job_id)
+        self.store.update_state(q.job_id, jr.state if jr else "failed")
+        self.dispatch()
+
+    def restore(self) -> int:
+        """Re-create jobs left queued or interrupted by a previous server session. Returns how many were re-queued."""
+        restored = 0
+        for row in self.store.pending():
+            job_id = row["job_id"]
+            orch = self._orch_for(row["vertical"])
+            if job_id in orch.jobs:
+                continue
+            if row["state"] == "cancelling":
+                self.store.update_state(job_id, "cancelled")
+                continue
+            specs = row["model_specs"]
+            try:
+                if row["state"] == "queued" and row["kind"] == "run":
+                    jr = orch.submit(dataset_id=row["dataset_id"], model_spec=specs[0], config=row["config"], job_id=job_id)
+                elif row["state"] == "queued" and row["kind"] == "matrix":
+                    jr = orch.submit_matrix(dataset_id=row["dataset_id"], model_specs=specs, config=row["config"], job_id=job_id)
+                else:
+                    # started before the restart: continue from its turn artifacts
+                    jr = orch.resume_run(row["run_id"], job_id=job_id)
+            except Exception:
+                self.store.update_state(job_id, "failed")
+                continue
+            self.store.update_state(job_id, "queued")
+            self._push(jr.job_id, row["vertical"], specs, int(row["priority"]))
+            restored += 1
+        self.dispatch()
+        return restored
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import copy
 import re
 from typing import Dict, List, Optional, Any
 
@@ -78,11 +79,7 @@ def _detect_decision(text: str) -> Optional[str]:
     return None
 
 
-def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """
-    Deterministic extractor over the full transcript (turns as list of {role,user|assistant; text}).
-    Returns a compact state object aggregated from all turns. No LLM usage.
-    """
+def _initial_state(domain: str) -> Dict[str, Any]:
     state: Dict[str, Any] = {
         "user_intent": None,
         "decision": None,
@@ -104,6 +101,95 @@ def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional
             "kyc_status": None,
             "limit_flags": [],
         })
+    return state
+
+
+def _apply_turn(domain: str, state: Dict[str, Any], t: Dict[str, str]) -> None:
+    """Fold one message into `state` in place; latest info wins."""
+    role = t.get("role", "").lower()
+    text = t.get("text", "")
+    # Fast-path: parse structured FINAL_STATE JSON line if present at end of assistant reply
+    if role == "assistant":
+        try:
+            import json as _json
+            import re as _re
+            m = _re.search(r"FINAL_STATE\s*:\s*(\{.*\})\s*$", text, _re.I)
+            if m:
+                js = m.group(1)
+                obj = _json.loads(js)
+                # Merge allowed keys
+                for k in ("decision", "next_action", "refund_amount", "policy_flags"):
+                    if k in obj:
+                        state[k] = obj[k]
+        except Exception:
+            pass
+    # intent primarily from user turns
+    if role == "user":
+        intent = _detect_intent(domain, text)
+        if intent:
+            state["user_intent"] = intent
+    # decisions/actions from assistant turns
+    if role == "assistant":
+        dec = _detect_decision(text)
+        # Heuristics around refund phrasing
+        if REFUND_NEGATIVE.search(text or ""):
+            dec = dec or "DENY"
+        elif REFUND_PARTIAL.search(text or ""):
+            dec = dec or "PARTIAL"
+        elif REFUND_POSITIVE.search(text or ""):
+            dec = dec or "ALLOW"
+        if dec:
+            state["decision"] = dec
+        if re.search(r"issue (a )?refund|process(ing)? refund", text, re.I):
+            state["next_action"] = "issue_refund"
+        elif re.search(r"confirm order|confirmed order", text, re.I):
+            state["next_action"] = "confirm_order"
+        elif re.search(r"escalat(e|ion)", text, re.I):
+            state["next_action"] = "escalate"
+        elif re.search(r"need (more )?info|provide details", text, re.I):
+            state["next_action"] = "request_more_info"
+
+    # Common flags and notes
+    flags = _collect_policy_flags(text)
+    if flags:
+        for f in flags:
+            if f not in state["policy_flags"]:
+                state["policy_flags"].append(f)
+
+    # Domain-specific extraction
+    if domain == "commerce":
+        m = ORDER_PAT.search(text)
+        if m:
+            order_id = m.group(1) or m.group(2)
+            state["order_id"] = order_id
+        mr = AMOUNT_REFUND_PAT.search(text)
+        if mr:
+            state["refund_amount"] = float(mr.group(1))
+        mt = re.search(r"total\s*\$?\s*([0-9]+(?:\.[0-9]{1,2})?)", text, re.I)
+        if mt:
+            state["totals"] = float(mt.group(1))
+    elif domain == "banking":
+        ma = ACCOUNT_PAT.search(text)
+        if ma:
+            state["account_id"] = ma.group(1)
+        mamt = AMOUNT_GENERAL_PAT.search(text)
+        if mamt:
+            state["amount"] = float(mamt.group(1))
+        if re.search(r"kyc (ok|passed)", text, re.I):
+            state["kyc_status"] = "ok"
+        elif re.search(r"kyc (fail|flag)", text, re.I):
+            state["kyc_status"] = "flag"
+        if re.search(r"limit exceeded|over limit|above limit", text, re.I):
+            if "limit_exceeded" not in state.get("limit_flags", []):
+                state.setdefault("limit_flags", []).append("limit_exceeded")
+
+
+def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Deterministic extractor over the full transcript (turns as list of {role,user|assistant; text}).
+    Returns a compact state object aggregated from all turns. No LLM usage.
+    """
+    state = _initial_state(domain)
 
     if prev_state:
         # start from previous known values
@@ -112,81 +198,37 @@ def extract_state(domain: str, turns: List[Dict[str, str]], prev_state: Optional
 
     # Process turns sequentially, latest info wins
     for t in turns:
-        role = t.get("role", "").lower()
-        text = t.get("text", "")
-        # Fast-path: parse structured FINAL_STATE JSON line if present at end of assistant reply
-        if role == "assistant":
-            try:
-                import json as _json
-                import re as _re
-                m = _re.search(r"FINAL_STATE\s*:\s*(\{.*\})\s*$", text, _re.I)
-                if m:
-                    js = m.group(1)
-                    obj = _json.loads(js)
-                    # Merge allowed keys
-                    for k in ("decision", "next_action", "refund_amount", "policy_flags"):
-                        if k in obj:
-                            state[k] = obj[k]
-            except Exception:
-                pass
-        # intent primarily from user turns
-        if role == "user":
-            intent = _detect_intent(domain, text)
-            if intent:
-                state["user_intent"] = intent
-        # decisions/actions from assistant turns
-        if role == "assistant":
-            dec = _detect_decision(text)
-            # Heuristics around refund phrasing
-            if REFUND_NEGATIVE.search(text or ""):
-                dec = dec or "DENY"
-            elif REFUND_PARTIAL.search(text or ""):
-                dec = dec or "PARTIAL"
-            elif REFUND_POSITIVE.search(text or ""):
-                dec = dec or "ALLOW"
-            if dec:
-                state["decision"] = dec
-            if re.search(r"issue (a )?refund|process(ing)? refund", text, re.I):
-                state["next_action"] = "issue_refund"
-            elif re.search(r"confirm order|confirmed order", text, re.I):
-                state["next_action"] = "confirm_order"
-            elif re.search(r"escalat(e|ion)", text, re.I):
-                state["next_action"] = "escalate"
-            elif re.search(r"need (more )?info|provide details", text, re.I):
-                state["next_action"] = "request_more_info"
-
-        # Common flags and notes
-        flags = _collect_policy_flags(text)
-        if flags:
-            for f in flags:
-                if f not in state["policy_flags"]:
-                    state["policy_flags"].append(f)
-
-        # Domain-specific extraction
-        if domain == "commerce":
-            m = ORDER_PAT.search(text)
-            if m:
-                order_id = m.group(1) or m.group(2)
-                state["order_id"] = order_id
-            mr = AMOUNT_REFUND_PAT.search(text)
-            if mr:
-                state["refund_amount"] = float(mr.group(1))
-            mt = re.search(r"total\s*\$?\s*([0-9]+(?:\.[0-9]{1,2})?)", text, re.I)
-            if mt:
-                state["totals"] = float(mt.group(1))
-        elif domain == "banking":
-            ma = ACCOUNT_PAT.search(text)
-            if ma:
-                state["account_id"] = ma.group(1)
-            mamt = AMOUNT_GENERAL_PAT.search(text)
-            if mamt:
-                state["amount"] = float(mamt.group(1))
-            if re.search(r"kyc (ok|passed)", text, re.I):
-                state["kyc_status"] = "ok"
-            elif re.search(r"kyc (fail|flag)", text, re.I):
-                state["kyc_status"] = "flag"
-            if re.search(r"limit exceeded|over limit|above limit", text, re.I):
-                if "limit_exceeded" not in state.get("limit_flags", []):
-                    state.setdefault("limit_flags", []).append("limit_exceeded")
+        _apply_turn(domain, state, t)
 
     return state
+
+
+class IncrementalStateExtractor:
+    """extract_state for a transcript that only grows: each feed() processes just the new messages.
+
+    feed(turns) returns the same state as extract_state(domain, turns), and with_reply(turns, text) the same
+    as extract_state(domain, turns + [assistant reply], prev_state=extract_state(domain, turns)): re-folding
+    messages into a state that already contains them changes nothing, so only the reply needs processing.
+    A transcript that is not an extension of the one seen so far is re-read from the start.
+    Returned states are copies; the extractor's own state is never shared.
+    """
+
+    def __init__(self, domain: str) -> None:
+        self.domain = domain
+        self._state = _initial_state(domain)
+        self._seen = 0
+        self._last: Optional[Dict[str, str]] = None
+
+    def feed(self, turns: List[Dict[str, str]]) -> Dict[str, Any]:
+        if self._seen > len(turns) or (self._seen and turns[self._seen - 1] != self._last):
+            self._state, self._seen = _initial_state(self.domain), 0
+        for t in turns[self._seen:]:
+            _apply_turn(self.domain, self._state, t)
+        self._seen = len(turns)
+        self._last = turns[-1] if turns else None
+        return copy.deepcopy(self._state)
+
+    def with_reply(self, turns: List[Dict[str, str]], text: str) -> Dict[str, Any]:
+        state = self.feed(turns)
+        _apply_turn(self.domain, state, {"role": "assistant", "text": text})
+        return state
@@ -0,0 +1,211 @@
+from __future__ import annotations
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Prometheus text exposition (format 0.0.4) without a client library: a handful of process-wide
+# counters, gauges and histograms updated by hooks in the provider registry, TurnRunner,
+# the orchestrator, semantic scoring and RunArtifactWriter, rendered by GET /metrics.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+WRITE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> (per-bucket counts, sum, count)
+        self._series: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, n = self._series.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    counts[i] += 1
+                    break
+            self._series[key] = (counts, total + value, n + 1)
+
+    def count(self, **labels: object) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s, n)) for k, (c, s, n) in self._series.items())
+        out: List[str] = []
+        for key, (counts, total, n) in items:
+            cum = 0
+            for upper, c in zip(self.buckets, counts):
+                cum += c
+                out.append(f"{self.name}_bucket{self._labels(key, ('le', _fmt(upper)))} {cum}")
+            out.append(f"{self.name}_bucket{self._labels(key, ('le', '+Inf'))} {n}")
+            out.append(f"{self.name}_sum{self._labels(key)} {_fmt(total)}")
+            out.append(f"{self.name}_count{self._labels(key)} {n}")
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PROVIDER_REQUEST_SECONDS = REGISTRY.histogram(
+    "evals_provider_request_duration_seconds", "Latency of single provider calls (each retry and hedge counts).",
+    ("provider", "model", "outcome"))
+PROVIDER_ERRORS = REGISTRY.counter(
+    "evals_provider_errors_total", "Failed provider calls by HTTP status or exception type.", ("provider", "model", "reason"))
+PROVIDER_RETRIES = REGISTRY.counter(
+    "evals_provider_retries_total", "Provider call retries after transient failures.", ("provider", "model"))
+PROVIDER_INFLIGHT = REGISTRY.gauge(
+    "evals_provider_inflight_requests", "Provider calls currently awaiting a reply.", ("provider",))
+TURNS = REGISTRY.counter(
+    "evals_turns_total", "Turns executed, by response cache status (hit, miss, bypass).", ("provider", "model", "cache"))
+TOKENS = REGISTRY.counter(
+    "evals_tokens_total", "Tokens sent to (in) and generated by (out) models.", ("provider", "model", "direction"))
+CONVERSATIONS_ACTIVE = REGISTRY.gauge(
+    "evals_conversations_active", "Conversations currently generating turns.", ("model",))
+CONVERSATIONS_WAITING = REGISTRY.gauge(
+    "evals_conversations_waiting", "Conversations waiting for a concurrency slot.", ("model",))
+JOBS = REGISTRY.gauge("evals_jobs", "Jobs known to the orchestrators, by state.", ("state",))
+JOB_QUEUE_DEPTH = REGISTRY.gauge("evals_job_queue_depth", "Jobs waiting in the scheduler queue.")
+JOBS_RUNNING = REGISTRY.gauge("evals_scheduler_running_jobs", "Jobs started by the scheduler and not yet finished.")
+EMBED_CACHE = REGISTRY.counter(
+    "evals_embedding_cache_lookups_total", "Semantic-metric embedding lookups, by result (hit, miss).", ("result",))
+EMBED_CACHE_HIT_RATIO = REGISTRY.gauge("evals_embedding_cache_hit_ratio", "Share of embedding lookups served from the cache.")
+ARTIFACT_WRITE_SECONDS = REGISTRY.histogram(
+    "evals_artifact_write_duration_seconds", "Time to write run artifacts, by kind.", ("kind",), buckets=WRITE_BUCKETS)
+
+
+def render() -> str:
+    """The whole registry in text exposition format; derived gauges are refreshed first."""
+    hits, misses = EMBED_CACHE.value(result="hit"), EMBED_CACHE.value(result="miss")
+    EMBED_CACHE_HIT_RATIO.set(hits / (hits + misses) if hits + misses else 0.0)
+    return REGISTRY.render()
@@ -1,8 +1,11 @@
+import asyncio
 import json
 from pathlib import Path
 import tempfile
 
-from artifacts import RunArtifactWriter, RunArtifactReader
+import pytest
+
+from artifacts import JobStatusChannel, RunArtifactWriter, RunArtifactReader
 
 
 def sample_results():
@@ -40,3 +43,27 @@ def test_write_and_read_json_and_csv():
         # check csv rows
         content = p.read_text(encoding="utf-8").splitlines()
         assert len(content) >= 2
+
+
+@pytest.mark.asyncio
+async def test_job_status_channel_coalesces_progress_and_flushes_transitions():
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        w = RunArtifactWriter(root)
+        ch = JobStatusChannel(w, flush_interval_ms=50)
+        r = RunArtifactReader(root)
+        ch.publish("rid", {"state": "running", "completed_conversations": 0})
+        assert r.read_job_status("rid")["completed_conversations"] == 0
+        for i in range(1, 20):
+            ch.publish("rid", {"state": "running", "completed_conversations": i})
+        # in-memory view is current, disk lags until the timer fires
+        assert ch.latest("rid")["completed_conversations"] == 19
+        assert ch.writes == 1
+        await asyncio.sleep(0.1)
+        assert r.read_job_status("rid")["completed_conversations"] == 19
+        assert ch.writes == 2
+        # a state transition is written immediately
+        ch.publish("rid", {"state": "paused", "completed_conversations": 19})
+        assert r.read_job_status("rid")["state"] == "paused"
+        # no temp files left behind by the atomic rename
+        assert [p.name for p in (root / "rid").iterdir() if p.name.endswith(".tmp")] == []
@@ -26,3 +26,19 @@ def test_cli_run_with_sample(tmp_path: Path, monkeypatch):
     # should have created a runs folder with at least one subdir
     runs = list((tmp_path / "runs").glob("*/"))
     assert runs, "expected at least one run folder created"
+
+
+def test_cli_resume_run(tmp_path: Path):
+    assert cli.main(["init", "--root", str(tmp_path)]) == 0
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(tmp_path / "configs" / "sample.run.json")]) == 0
+    run_dirs = [p for p in (tmp_path / "runs").iterdir() if (p / "run_config.json").exists()]
+    assert len(run_dirs) == 1
+    assert cli.main(["resume", "--root", str(tmp_path), "--run-id", run_dirs[0].name]) == 0
+    assert cli.main(["resume", "--root", str(tmp_path), "--run-id", "missing-run"]) == 2
+
+
+def test_cli_run_rejects_unknown_cache_mode(tmp_path: Path, monkeypatch):
+    assert cli.main(["init", "--root", str(tmp_path)]) == 0
+    monkeypatch.setenv("RESPONSE_CACHE_MODE", "sometimes")
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(tmp_path / "configs" / "sample.run.json")]) == 2
+    assert not (tmp_path / "runs").exists() or not any((tmp_path / "runs").iterdir())
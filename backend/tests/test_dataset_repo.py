@@ -1,5 +1,6 @@
 from pathlib import Path
 import json
+import os
 import tempfile
 
 from backend.dataset_repo import DatasetRepository
@@ -71,3 +72,31 @@ def test_invalid_json_and_schema_rejection():
         assert len(items) == 1
         assert items[0]["valid"] is False
         assert "errors" in items[0]
+
+
+def test_golden_index_is_cached_and_invalidated_by_mtime():
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        golden = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "entries": [
+                {"conversation_id": "conv1", "turns": [{"turn_index": 1, "expected": {"variants": ["a"]}}], "final_outcome": {"decision": "ALLOW"}}
+            ]
+        }
+        write_json(root / "commerce_sample.golden.json", golden)
+        other = {**golden, "dataset_id": "other", "entries": [{**golden["entries"][0], "conversation_id": "conv9"}]}
+        write_json(root / "other.golden.json", other)
+
+        repo = DatasetRepository(root)
+        idx = repo.golden_index("commerce_sample")
+        assert set(idx) == {"conv1"}
+        assert idx["conv1"]["entry"]["turns"][0]["expected"]["variants"] == ["a"]
+        assert repo.golden_index("commerce_sample") is idx
+
+        golden["entries"].append({**golden["entries"][0], "conversation_id": "conv2"})
+        p = root / "commerce_sample.golden.json"
+        write_json(p, golden)
+        st = p.stat()
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert set(repo.golden_index("commerce_sample")) == {"conv1", "conv2"}
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from embeddings.batching import EmbeddingBatcher, prefetch_embeddings
+from embeddings.store import EmbeddingStore
+from orchestrator import SharedRunState, golden_variant_texts, semantic_texts
+
+
+class CountingEmbedder:
+    model = "fake"
+
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+        self.active = 0
+        self.max_active = 0
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("down")
+            return [[float(len(t)), 1.0] for t in texts]
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced_and_deduplicated():
+    inner = CountingEmbedder()
+    b = EmbeddingBatcher(inner, batch_size=100, window_ms=5)
+    r1, r2, r3 = await asyncio.gather(b.embed(["a", "bb"]), b.embed(["bb", "ccc"]), b.embed(["a"]))
+    assert inner.calls == [["a", "bb", "ccc"]]
+    assert r1 == [[1.0, 1.0], [2.0, 1.0]] and r2 == [[2.0, 1.0], [3.0, 1.0]] and r3 == [[1.0, 1.0]]
+    assert b.requests == 1 and b.texts_sent == 3
+
+
+@pytest.mark.asyncio
+async def test_batches_are_chunked_with_bounded_parallelism():
+    inner = CountingEmbedder(delay=0.01)
+    b = EmbeddingBatcher(inner, batch_size=2, concurrency=2, window_ms=50)
+    out = await b.embed(["t1", "t2", "t3", "t4", "t5"])
+    assert [len(c) for c in inner.calls] == [2, 2, 1]
+    assert inner.max_active == 2 and len(out) == 5
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter():
+    b = EmbeddingBatcher(CountingEmbedder(fail=True), window_ms=1)
+    results = await asyncio.gather(b.embed(["x"]), b.embed(["x", "y"]), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    await b.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_fills_cache_from_store_then_embedder(tmp_path):
+    store = EmbeddingStore(tmp_path / "e.sqlite3")
+    store.put_many("fake", {"known": [9.0, 9.0]})
+    inner = CountingEmbedder()
+    cache = {}
+    n = await prefetch_embeddings(EmbeddingBatcher(inner, window_ms=1), ["known", "new", "new", "other"], cache, store)
+    assert n == 2 and inner.calls == [["new", "other"]]
+    assert cache["known"] == [9.0, 9.0] and cache["new"] == [3.0, 1.0]
+    assert store.get_many("fake", ["other"]) == {"other": [5.0, 1.0]}
+
+
+def test_semantic_texts_cover_variants_and_outputs():
+    goldens = {"c1": {"entry": {"turns": [{"expected": {"variants": ["v1", "v2"]}}, {"expected": {"variants": ["v2", "v3"]}}]}}}
+    assert golden_variant_texts(goldens) == ["v1", "v2", "v3"]
+    shared = SharedRunState(dataset={}, domain="commerce", metrics_wanted=["semantic"], goldens=goldens)
+    recs = [{"response": {"content": "out 0"}}, {"response": {"content": None}}]
+    assert semantic_texts(shared, {"conversation_id": "c1"}, recs) == ["v1", "v2", "v3", "out 0", ""]
+    assert semantic_texts(shared, {"conversation_id": "nope"}, recs) == []
+    shared.metrics_wanted = ["exact"]
+    assert semantic_texts(shared, {"conversation_id": "c1"}, recs) == []
@@ -0,0 +1,85 @@
+import pytest
+
+from embeddings.store import EmbeddingStore, embedding_store_for, normalize_text
+from metrics import semantic_similarity
+
+
+def test_store_roundtrip_normalization_and_model_scope(tmp_path):
+    store = EmbeddingStore(tmp_path / "e.sqlite3")
+    store.put_many("m1", {"Refund  issued.\n": [0.25, -1.5, 3.0]})
+    assert normalize_text(" Refund issued. ") == "Refund issued."
+    got = store.get_many("m1", ["Refund issued.", "unknown"])
+    assert got == {"Refund issued.": [0.25, -1.5, 3.0]}
+    assert store.get_many("m2", ["Refund issued."]) == {}
+    # float32 blobs: 4 bytes per dimension
+    assert store.stats() == {"entries": 1, "bytes": 12}
+
+
+def test_store_evicts_least_recently_used(tmp_path, monkeypatch):
+    import embeddings.store as store_mod
+    monkeypatch.setattr(store_mod, "TOUCH_INTERVAL_S", 0.0)
+    store = EmbeddingStore(tmp_path / "e.sqlite3", max_bytes=2 * 16)
+    store.put_many("m", {"a": [1.0] * 4})
+    store.put_many("m", {"b": [2.0] * 4})
+    store.get_many("m", ["a"])  # 'a' is now more recently used than 'b'
+    store.put_many("m", {"c": [3.0] * 4})
+    assert sorted(store.get_many("m", ["a", "b", "c"])) == ["a", "c"]
+
+
+def test_store_keeps_running_size_between_sweeps(tmp_path):
+    path = tmp_path / "e.sqlite3"
+    store = EmbeddingStore(path, max_bytes=10_000)
+    store.put_many("m", {"a": [1.0] * 4, "b": [2.0] * 4})
+    store.put_many("m", {"a": [1.0] * 8, "a ": [1.0] * 8})  # replaces 'a' (same normalized key)
+    assert store._total == store.stats()["bytes"] == 48 and store._puts == 2
+    # a store opened on an existing file starts from its size
+    assert EmbeddingStore(path)._total == 48
+
+
+def test_embedding_store_for_honours_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("EMBED_CACHE", "off")
+    assert embedding_store_for(tmp_path) is None
+    monkeypatch.setenv("EMBED_CACHE", "on")
+    monkeypatch.setenv("EMBED_CACHE_PATH", str(tmp_path / "shared.sqlite3"))
+    assert embedding_store_for(tmp_path / "a") is embedding_store_for(tmp_path / "b")
+
+
+@pytest.mark.asyncio
+async def test_semantic_similarity_reuses_stored_vectors_across_runs(tmp_path):
+    calls = []
+
+    class FakeEmbedder:
+        model = "fake-embed"
+
+        async def embed(self, texts):
+            calls.append(list(texts))
+            return [[1.0, 0.0] if "ok" in t else [0.0, 1.0] for t in texts]
+
+    store = EmbeddingStore(tmp_path / "e.sqlite3")
+    cache = {}
+    first = await semantic_similarity("ok done", ["ok  done", "other"], embedder=FakeEmbedder(), threshold=0.8, cache=cache, store=store)
+    # the in-memory cache uses the store's normalization: a spacing variant is a hit in both layers
+    assert sorted(cache) == ["ok done", "other"]
+    again = await semantic_similarity(" ok done\n", ["ok done"], embedder=FakeEmbedder(), threshold=0.8, cache=cache, store=store)
+    assert again["pass"] and len(calls) == 1
+    # a later run starts with an empty per-run cache; only the new output is embedded
+    second = await semantic_similarity("ok again", ["ok done", "other"], embedder=FakeEmbedder(), threshold=0.8, cache={}, store=store)
+    assert first["pass"] and second["pass"]
+    assert calls == [["ok done", "ok done", "other"], ["ok again"]]
+    assert first["scores"] == second["scores"] == [1.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_cold_and_warm_runs_score_identically(tmp_path):
+    class PreciseEmbedder:
+        model = "precise"
+
+        async def embed(self, texts):
+            # float64 values that float32 cannot represent exactly
+            return [[0.1 + 1e-9 * len(t), 0.7 / (1 + len(t)), 1.0 / 3.0] for t in texts]
+
+    store = EmbeddingStore(tmp_path / "e.sqlite3")
+    args = ("the refund was issued", ["refund issued", "order cancelled"])
+    cold = await semantic_similarity(*args, embedder=PreciseEmbedder(), threshold=0.8, cache={}, store=store)
+    warm = await semantic_similarity(*args, embedder=PreciseEmbedder(), threshold=0.8, cache={}, store=store)
+    assert cold["scores"] == warm["scores"] and cold["pass"] == warm["pass"]
@@ -0,0 +1,91 @@
+import types
+
+import pytest
+
+from providers.endpoints import EndpointPool, parse_urls, route
+from providers.openai import OpenAIProvider
+from providers.types import ProviderRequest
+
+
+def _resp(ok=True, latency_ms=10, status=None):
+    meta = {"status": status} if status is not None else {}
+    return types.SimpleNamespace(ok=ok, latency_ms=latency_ms, provider_meta=meta, error=None if ok else "err")
+
+
+def test_parse_urls():
+    assert parse_urls("http://a:1/, http://b:2,http://a:1") == ["http://a:1", "http://b:2"]
+    assert parse_urls(["http://x/"]) == ["http://x"]
+
+
+def test_least_outstanding_spreads_load():
+    pool = EndpointPool(["http://a", "http://b", "http://c"])
+    held = [pool.acquire() for _ in range(3)]
+    assert sorted(e.url for e in held) == ["http://a", "http://b", "http://c"]
+    pool.release(held[1], True, 5)
+    assert pool.acquire() is held[1]
+
+
+def test_latency_weighted_prefers_faster_endpoint():
+    pool = EndpointPool(["http://slow", "http://fast"], strategy="latency")
+    slow, fast = pool.endpoints
+    pool.release(pool.acquire(), True, 900)
+    pool.release(pool.acquire(), True, 100)
+    picks = []
+    for _ in range(4):
+        ep = pool.acquire()
+        picks.append(ep.url)
+        pool.release(ep, True, 900 if ep is slow else 100)
+    assert picks.count("http://fast") >= 3
+
+
+def test_ejection_after_consecutive_host_failures():
+    pool = EndpointPool(["http://a", "http://b"], eject_after=2, eject_s=60)
+    a, b = pool.endpoints
+    pool.acquire(); pool.release(a, False, host_failure=False)  # a 4xx says nothing about the host
+    pool.release(a, False, host_failure=True)
+    assert not a.ejected_until
+    pool.release(a, False, host_failure=True)
+    assert a.ejections == 1
+    assert all(pool.acquire() is b for _ in range(3))
+    stats = {s["url"]: s for s in pool.stats()}
+    assert stats["http://a"]["healthy"] is False and stats["http://b"]["outstanding"] == 3
+    # everything ejected: still routes, to the endpoint re-admitted soonest
+    pool.eject(b)
+    assert pool.acquire() is a
+
+
+@pytest.mark.asyncio
+async def test_health_check_readmits_endpoints():
+    healthy = {"http://a": True, "http://b": False}
+
+    async def probe(url):
+        return healthy[url]
+    pool = EndpointPool(["http://a", "http://b"], probe=probe)
+    pool.eject(pool.endpoints[0])
+    assert await pool.check_health() == {"http://a": True, "http://b": False}
+    a, b = pool.endpoints
+    assert a.ejected_until == 0.0 and b.ejections == 1
+
+
+@pytest.mark.asyncio
+async def test_openai_compatible_pool_routes_around_failing_host(monkeypatch):
+    import httpx
+    from providers import http_client
+
+    def handler(request):
+        if request.url.host == "bad":
+            return httpx.Response(503, text="overloaded")
+        return httpx.Response(200, json={"model": "local", "choices": [{"message": {"content": "hi"}}]})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(http_client.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    monkeypatch.setenv("OPENAI_EJECT_AFTER", "1")
+    p = OpenAIProvider(None, base_urls="http://bad/v1,http://good/v1")
+    assert p.enabled  # local compatible servers need no API key
+    req = ProviderRequest(model="local", messages=[{"role": "user", "content": "hi"}], metadata={})
+    out = [await p.chat(req) for _ in range(4)]
+    assert sum(1 for r in out if not r.ok) == 1
+    assert all(r.provider_meta["endpoint"] == "http://good/v1" for r in out[-2:])
+    stats = {s["url"]: s for s in p.endpoints.stats()}
+    assert stats["http://bad/v1"]["ejections"] == 1 and stats["http://good/v1"]["requests"] >= 3
+    await p.aclose()
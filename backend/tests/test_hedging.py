@@ -0,0 +1,82 @@
+import asyncio
+import types
+
+import pytest
+
+from orchestrator import merge_results
+from providers.hedging import HedgePolicy, Hedger
+from providers.types import ProviderRequest
+
+REQ = ProviderRequest(model="m", messages=[], metadata={"hedge": True})
+
+
+def _warm(h, latency_ms=20.0, n=10):
+    for _ in range(n):
+        h.observe("p", "m", latency_ms)
+
+
+def _slow_then_fast():
+    calls = {"n": 0, "cancelled": 0}
+
+    async def chat(req):
+        calls["n"] += 1
+        delay = 0.3 if calls["n"] == 1 else 0.01
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls["cancelled"] += 1
+            raise
+        return types.SimpleNamespace(ok=True, content=f"reply {calls['n']}", latency_ms=int(delay * 1000), provider_meta={})
+    return chat, calls
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_p95_and_first_success_wins():
+    h = Hedger(HedgePolicy(min_samples=5, max_extra_fraction=1.0))
+    _warm(h)
+    chat, calls = _slow_then_fast()
+    stats = {}
+    resp = await h.call("p", chat, REQ, stats)
+    assert resp.content == "reply 2" and calls["n"] == 2 and calls["cancelled"] == 1
+    assert stats["fired"] == 1 and stats["hedge_won"] == 1
+    # latency is measured from the primary's dispatch
+    assert 20 <= resp.latency_ms < 250
+
+
+@pytest.mark.asyncio
+async def test_hedging_is_opt_in_and_load_capped():
+    # not enough samples yet, or hedging disabled on the request: a single call
+    h = Hedger(HedgePolicy(min_samples=5, max_extra_fraction=1.0))
+    chat, calls = _slow_then_fast()
+    await h.call("p", chat, ProviderRequest(model="m", messages=[], metadata={"hedge": False}), {})
+    assert calls["n"] == 1
+    # extra-load cap: 10% of one primary request allows no hedge
+    h = Hedger(HedgePolicy(min_samples=5, max_extra_fraction=0.1))
+    _warm(h)
+    chat, calls = _slow_then_fast()
+    stats = {}
+    resp = await h.call("p", chat, REQ, stats)
+    assert resp.content == "reply 1" and calls["n"] == 1 and not stats
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_cancels_outstanding_requests():
+    h = Hedger(HedgePolicy(min_samples=5, max_extra_fraction=1.0))
+    # the primary is cancelled while the hedger still waits for the hedge threshold
+    _warm(h, latency_ms=1000.0)
+    chat, calls = _slow_then_fast()
+    caller = asyncio.ensure_future(h.call("p", chat, REQ, {}))
+    await asyncio.sleep(0.05)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert calls["n"] == 1 and calls["cancelled"] == 1
+
+
+def test_merge_results_reports_hedging():
+    entries = [
+        {"conversation": {}, "timings": [{"latency_ms": 10}] * 4, "hedge": {"fired": 1, "hedge_won": 1, "saved_ms_est": 300}},
+        {"conversation": {}, "timings": [{"latency_ms": 10}] * 6, "hedge": {"fired": 1, "hedge_won": 0, "saved_ms_est": 0}},
+    ]
+    res = merge_results(run_id="r", dataset={"dataset_id": "d"}, model_spec="mock:default", entries=entries)
+    assert res["hedging"] == {"hedged_turns": 2, "hedge_wins": 1, "saved_ms_est": 300, "extra_load_fraction": 0.2}
@@ -0,0 +1,33 @@
+from latency_stats import cold_start_ms, latency_summary, percentile, summarize, turn_timing
+
+
+def test_percentiles_interpolate():
+    xs = list(range(1, 101))
+    assert percentile(xs, 50) == 50.5
+    assert percentile([5], 99) == 5.0
+    assert percentile([], 50) is None
+    s = summarize([10, 20, 30, 40, None])
+    assert s == {"count": 4, "p50": 25.0, "p95": 38.5, "p99": 39.7}
+    assert summarize([]) is None
+
+
+def test_latency_summary_excludes_cache_hits_and_failures():
+    def rec(latency, cache=None, ok=True, ttft=None):
+        return {"response": {"ok": ok, "latency_ms": latency, "cache": cache, "provider_meta": {"ttft_ms": ttft}},
+                "usage": {"output_tokens_per_sec": 20.0}}
+
+    samples = [t for t in (turn_timing(r) for r in [
+        rec(100, ttft=40), rec(300, cache="miss", ttft=60), rec(5, cache="hit", ttft=1), rec(900, ok=False),
+    ]) if t is not None]
+    out = latency_summary(samples)
+    assert out["turns"] == 2
+    assert out["latency_ms"]["p50"] == 200.0 and out["latency_ms"]["count"] == 2
+    assert out["ttft_ms"]["p99"] == 59.8
+    assert out["tokens_per_sec"]["p50"] == 20.0
+
+
+def test_cold_starts_are_left_out_and_reported_separately():
+    cold = {"response": {"ok": True, "latency_ms": 9000, "provider_meta": {"load_ms": 8500.0, "cold_start": True}}}
+    warm = {"response": {"ok": True, "latency_ms": 400, "provider_meta": {"load_ms": 2.0}}}
+    assert turn_timing(cold) is None and turn_timing(warm)["latency_ms"] == 400
+    assert cold_start_ms(cold) == 8500.0 and cold_start_ms(warm) is None
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from embeddings import ollama_embed
+from embeddings.base import Embedder
+from embeddings.local_embed import HashedNgramEmbeddings, is_local_model, parse_local_model
+from metrics import semantic_similarity
+
+
+def test_hashed_ngram_vectors_are_stable_and_normalized():
+    e = HashedNgramEmbeddings(256)
+    m = e.embed_sync(["Your refund of $10 was processed.", "We processed your $10 refund.", "The weather is nice", "", "CAFÉ"])
+    assert m.shape == (5, 256) and m.dtype == np.float32
+    assert np.allclose(np.linalg.norm(m[[0, 1, 2, 4]], axis=1), 1.0, atol=1e-6)
+    assert not m[3].any()
+    sims = m @ m.T
+    assert sims[0, 1] > 0.6 > abs(sims[0, 2])
+    # case and accent folding, and no per-process hash seed
+    assert np.allclose(HashedNgramEmbeddings(256).embed_sync(["cafe"])[0], m[4])
+    assert isinstance(e, Embedder)
+
+
+def test_model_names_select_the_backend(monkeypatch):
+    assert is_local_model("local") and is_local_model("local:ngram-256") and not is_local_model("nomic-embed-text")
+    assert parse_local_model("local:ngram-256") == 256 and parse_local_model("local") == 1024
+    monkeypatch.setenv("EMBED_MODEL", "local:ngram-128")
+    emb = ollama_embed.shared_embeddings()
+    assert isinstance(emb, HashedNgramEmbeddings) and emb.model == "local:ngram-128"
+    assert ollama_embed.shared_embeddings() is emb
+    monkeypatch.setenv("EMBED_MODEL", "nomic-embed-text")
+    other = ollama_embed.shared_embeddings()
+    assert isinstance(other, ollama_embed.OllamaEmbeddings) and other.model == "nomic-embed-text"
+
+
+@pytest.mark.asyncio
+async def test_semantic_metric_runs_offline(monkeypatch):
+    monkeypatch.setenv("EMBED_MODEL", "local")
+    monkeypatch.setenv("OLLAMA_HOST", "http://127.0.0.1:9")  # nothing listens here
+    res = await semantic_similarity("Your refund of $10 was processed.",
+                                    ["We processed your $10 refund.", "Please contact support."], threshold=0.6)
+    assert not res.get("skipped")
+    assert res["pass"] and res["best_variant_index"] == 0
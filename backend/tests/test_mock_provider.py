@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from backend import cli
+from providers.mock import MockProvider, parse_mock_model
+from providers.types import ProviderRequest
+
+
+def _req(model, cid="c1", turn=0, text="Where is order A1?"):
+    return ProviderRequest(model=model, messages=[{"role": "user", "content": text}],
+                           metadata={"run_id": "r", "conversation_id": cid, "turn_index": turn})
+
+
+def test_parse_mock_model_overrides():
+    name, s = parse_mock_model("flaky,error_rate=0.5,latency_ms=0,replay=run-1")
+    assert name == "flaky" and s["error_rate"] == 0.5 and s["latency_ms"] == 0 and s["replay"] == "run-1"
+    assert parse_mock_model("nope")[1]["template"] == parse_mock_model("default")[1]["template"]
+
+
+@pytest.mark.asyncio
+async def test_mock_templates_final_state_and_is_deterministic(monkeypatch):
+    monkeypatch.setenv("MOCK_PROVIDER_PROFILES", json.dumps({"canned": {"latency_ms": 0, "responses": ["A {turn_index}", "B {turn_index}"]}}))
+    a, b = MockProvider(), MockProvider()
+    ra = await a.chat(_req("canned"))
+    rb = await b.chat(_req("canned"))
+    assert ra.ok and ra.content == rb.content
+    assert ra.content.splitlines()[0] in ("A 0", "B 0")
+    assert ra.content.splitlines()[-1].startswith("FINAL_STATE: ")
+    assert json.loads(ra.content.split("FINAL_STATE:", 1)[1])["decision"] == "ALLOW"
+
+    err = await a.chat(_req("instant,error_rate=1,error_status=429,retry_after=1"))
+    assert not err.ok and err.provider_meta["status"] == 429 and err.provider_meta["retry_after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_mock_latency_distribution():
+    p = MockProvider()
+    r = await p.chat(_req("instant,latency_ms=30,latency_dist=fixed"))
+    assert r.latency_ms >= 25
+
+
+@pytest.mark.asyncio
+async def test_mock_attempt_counts_are_bounded(monkeypatch):
+    import providers.mock as mock_mod
+    monkeypatch.setattr(mock_mod, "MAX_ATTEMPT_KEYS", 3)
+    p = MockProvider()
+    for turn in range(10):
+        await p.chat(_req("instant", turn=turn))
+    await p.chat(_req("instant", turn=9))
+    assert len(p._attempts) == 3 and p._attempts[("r", "c1", 9)] == 2
+
+
+def test_cli_run_with_mock_and_replay(tmp_path: Path):
+    assert cli.main(["init", "--root", str(tmp_path)]) == 0
+    cfg_path = tmp_path / "configs" / "sample.run.json"
+    rc = json.loads(cfg_path.read_text(encoding="utf-8"))
+    rc["models"] = ["mock:instant"]
+    cfg_path.write_text(json.dumps(rc), encoding="utf-8")
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(cfg_path)]) == 0
+    (first,) = [p for p in (tmp_path / "runs").iterdir() if (p / "run_config.json").exists()]
+    turns = sorted((first / "conversations").rglob("turn_*.json"))
+    assert turns
+    rec = json.loads(turns[0].read_text(encoding="utf-8"))
+    assert rec["response"]["ok"] and rec["state"]["decision"] == "ALLOW"
+
+    # replay the recorded run through the mock provider
+    rc["models"] = [f"mock:instant,replay={first.name}"]
+    cfg_path.write_text(json.dumps(rc), encoding="utf-8")
+    assert cli.main(["run", "--root", str(tmp_path), "--file", str(cfg_path)]) == 0
+    (second,) = [p for p in (tmp_path / "runs").iterdir() if (p / "run_config.json").exists() and p != first]
+    replayed = json.loads((second / turns[0].relative_to(first)).read_text(encoding="utf-8"))
+    assert replayed["response"]["content"] == rec["response"]["content"]
+    assert replayed["response"]["provider_meta"]["replay"] == first.name
@@ -46,6 +46,65 @@ async def test_orchestrator_happy_path(monkeypatch):
         run_folder = Path(runs_dir, jr.run_id)
         assert run_folder.exists()
 
+@pytest.mark.asyncio
+async def test_orchestrator_records_golden_index_failure(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "c1", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]}],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+
+        async def fake_run_turn(self, **kwargs):
+            return {"response": {"ok": True}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        def broken_golden_index(dataset_id):
+            raise ValueError("bad golden file")
+        monkeypatch.setattr(orch.repo, 'golden_index', broken_golden_index)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"metrics": ["exact"], "thresholds": {}})
+        orch.start(jr.job_id)
+        res = await orch.wait(jr.job_id)
+        # not fatal: the run completes and the reason is kept on the job
+        assert res.state == 'succeeded'
+        assert "bad golden file" in res.error
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_drops_state_extractors_of_finished_conversations(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        turns = [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}, {"role": "user", "text": "order A1"}]
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": f"c{i}", "turns": turns} for i in range(3)],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        live = []
+
+        async def fake_run_turn(self, **kwargs):
+            self._extractor(kwargs["run_id"], kwargs["conversation_id"], kwargs["domain"])
+            live.append(len(self._extractors))
+            return {"response": {"ok": True}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"metrics": ["exact"], "thresholds": {}, "concurrency": 1})
+        orch.start(jr.job_id)
+        await orch.wait(jr.job_id)
+        # one conversation at a time: only its own extractor is alive, and none once the run ends
+        assert max(live) == 1 and not orch._runner._extractors
+
+
 @pytest.mark.asyncio
 async def test_orchestrator_cancel(monkeypatch):
     with tempfile.TemporaryDirectory() as d:
@@ -73,3 +132,221 @@ async def test_orchestrator_cancel(monkeypatch):
         orch.cancel(jr.job_id)
         res = await orch.wait(jr.job_id)
         assert res.state == 'cancelled'
+
+@pytest.mark.asyncio
+async def test_orchestrator_max_concurrency(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        convs = [
+            {"conversation_id": f"c{i}", "turns": [
+                {"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}, {"role": "user", "text": "bye"}
+            ]}
+            for i in range(6)
+        ]
+        ds = {"dataset_id": "commerce_sample", "version": "1.0.0", "metadata": {"domain": "commerce", "difficulty": "easy"}, "conversations": convs}
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        in_flight = {"now": 0, "peak": 0}
+        seen: dict = {}
+        async def tracked_run_turn(self, **kwargs):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            seen.setdefault(kwargs["conversation_id"], []).append(kwargs["turn_index"])
+            in_flight["now"] -= 1
+            return {"response": {"ok": True}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', tracked_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"context": {"max_concurrency": 3}})
+        orch.start(jr.job_id)
+        res = await orch.wait(jr.job_id)
+        assert res.state == 'succeeded'
+        assert res.completed_conversations == 6
+        assert in_flight["peak"] == 3
+        # turns inside one conversation stay in order
+        assert all(v == [0, 2] for v in seen.values())
+        status = json.loads(Path(runs_dir, jr.run_id, 'job.json').read_text(encoding='utf-8'))
+        assert status["completed_conversations"] == 6
+        # concurrency does not change what the run measures, so it must not change run_id
+        plain = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"context": {}})
+        assert plain.run_id == jr.run_id
+
+@pytest.mark.asyncio
+async def test_orchestrator_scores_conversations_as_they_finish(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": "slow", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]},
+                {"conversation_id": "fast", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]},
+            ]
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        partial_seen: list = []
+        async def fake_run_turn(self, **kwargs):
+            if kwargs["conversation_id"] == "slow":
+                # 'fast' must already be scored and stored while 'slow' is still generating
+                partial = orch._writer.layout.results_partial_path(kwargs["run_id"])
+                for _ in range(100):
+                    if partial.exists():
+                        partial_seen.extend(partial.read_text(encoding='utf-8').splitlines())
+                        break
+                    await asyncio.sleep(0.01)
+            return {"turn_index": kwargs["turn_index"], "response": {"ok": True, "content": "hello"}, "state": {}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={"context": {"max_concurrency": 2}})
+        orch.start(jr.job_id)
+        res = await orch.wait(jr.job_id)
+        assert res.state == 'succeeded'
+        assert len(partial_seen) == 1 and json.loads(partial_seen[0])["conversation"]["conversation_id"] == "fast"
+        results = json.loads(Path(runs_dir, jr.run_id, 'results.json').read_text(encoding='utf-8'))
+        # final merge keeps dataset order even though conversations finished out of order
+        assert [c["conversation_id"] for c in results["conversations"]] == ["slow", "fast"]
+        assert results["conversations"][1]["turns"][0]["assistant_output_snippet"] == "hello"
+        assert not Path(runs_dir, jr.run_id, 'results.partial.jsonl').exists()
+
+@pytest.mark.asyncio
+async def test_orchestrator_resume_run_skips_successful_turns(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        turns = [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}, {"role": "user", "text": "bye"}]
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "c1", "turns": turns}, {"conversation_id": "c2", "turns": turns}],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        run_id = "commerce_sample-1.0.0-ollama-llama3.2-latest-deadbeef"
+        run_dir = Path(runs_dir, run_id)
+        orch._writer.init_run(run_id, {"dataset_id": "commerce_sample", "model_spec": "ollama:llama3.2:latest", "metrics": ["exact"]})
+        (run_dir / "job.json").write_text(json.dumps({"state": "running", "completed_conversations": 1}), encoding='utf-8')
+        # c1 finished before the crash; c2 has a failed turn 0 and no turn 2 yet
+        for cid, idx, ok in (("c1", 0, True), ("c1", 2, True), ("c2", 0, False)):
+            p = run_dir / "conversations" / cid / f"turn_{idx:03d}.json"
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text(json.dumps({"turn_index": idx, "response": {"ok": ok, "content": "stored"}}), encoding='utf-8')
+
+        calls: list = []
+        async def fake_run_turn(self, **kwargs):
+            calls.append((kwargs["conversation_id"], kwargs["turn_index"]))
+            return {"turn_index": kwargs["turn_index"], "response": {"ok": True, "content": "fresh"}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+
+        jr = orch.resume_run(run_id)
+        assert jr.run_id == run_id
+        assert jr.completed_conversations == 1
+        with pytest.raises(RuntimeError):
+            orch.resume_run(run_id)
+        orch.start(jr.job_id)
+        res = await orch.wait(jr.job_id)
+        assert res.state == 'succeeded'
+        assert sorted(calls) == [("c2", 0), ("c2", 2)]
+        results = json.loads((run_dir / "results.json").read_text(encoding='utf-8'))
+        assert results["conversations"][0]["turns"][0]["assistant_output_snippet"] == "stored"
+
+@pytest.mark.asyncio
+async def test_orchestrator_matrix_job_shares_dataset_and_goldens(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        turns = [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [{"conversation_id": "c1", "turns": turns}, {"conversation_id": "c2", "turns": turns}],
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        calls: list = []
+        async def fake_run_turn(self, **kwargs):
+            calls.append((kwargs["provider"], kwargs["model"], kwargs["conversation_id"]))
+            return {"response": {"ok": True, "content": "hello"}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', fake_run_turn, raising=True)
+        golden_lookups: list = []
+        def fake_golden_index(dataset_id):
+            golden_lookups.append(dataset_id)
+            return {}
+        monkeypatch.setattr(orch.repo, 'golden_index', fake_golden_index)
+
+        specs = ['ollama:llama3.2:latest', 'openai:gpt-5.1']
+        jr = orch.submit_matrix(dataset_id='commerce_sample', model_specs=specs, config={"context": {"model_concurrency": {"openai:gpt-5.1": 2}}})
+        assert jr.total_conversations == 4
+        orch.start(jr.job_id)
+        res = await orch.wait(jr.job_id)
+        assert res.state == 'succeeded'
+        assert res.completed_conversations == 4
+        assert len(calls) == 4
+        # goldens are indexed once per job, not once per conversation or model
+        assert golden_lookups == ["commerce_sample"]
+        for spec in specs:
+            single = orch.submit(dataset_id='commerce_sample', model_spec=spec, config={"context": {}})
+            assert jr.model_runs[spec] == single.run_id
+            results = json.loads(Path(runs_dir, single.run_id, 'results.json').read_text(encoding='utf-8'))
+            assert results["model_spec"] == spec
+        summary = json.loads(Path(runs_dir, jr.run_id, 'matrix.json').read_text(encoding='utf-8'))
+        assert [m["model_spec"] for m in summary["models"]] == specs
+        assert set(summary["conversations"][0]["pass_by_model"]) == set(specs)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_pause_resume_cancel_are_event_driven(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        ds_dir = Path(d, 'datasets'); ds_dir.mkdir()
+        runs_dir = Path(d, 'runs'); runs_dir.mkdir()
+        ds = {
+            "dataset_id": "commerce_sample",
+            "version": "1.0.0",
+            "metadata": {"domain": "commerce", "difficulty": "easy"},
+            "conversations": [
+                {"conversation_id": f"c{i}", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]}
+                for i in range(3)
+            ]
+        }
+        Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+
+        orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+        started = asyncio.Event()
+        aborted = []
+
+        async def hanging_run_turn(self, **kwargs):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                aborted.append(kwargs["conversation_id"])
+                raise
+            return {"response": {"ok": True}}
+        monkeypatch.setattr(type(orch._runner), 'run_turn', hanging_run_turn, raising=True)
+        states = []
+        monkeypatch.setattr(orch._status, 'publish', lambda run_id, status, force=False: states.append(status["state"]))
+
+        jr = orch.submit(dataset_id='commerce_sample', model_spec='ollama:llama3.2:latest', config={})
+        orch.pause(jr.job_id)
+        orch.start(jr.job_id)
+        await asyncio.sleep(0.05)
+        # paused before the first conversation: nothing reaches the provider
+        assert not started.is_set()
+        orch.resume(jr.job_id)
+        await asyncio.wait_for(started.wait(), timeout=1)
+        orch.cancel(jr.job_id)
+        res = await asyncio.wait_for(orch.wait(jr.job_id), timeout=1)
+        assert res.state == 'cancelled'
+        # the in-flight request was interrupted, not awaited to completion
+        assert aborted == ["c0"]
+        # one status write per transition
+        assert states == ["queued", "paused", "running", "cancelled"]
@@ -36,3 +36,124 @@ async def test_gemini_disabled_without_key(monkeypatch):
     resp = await gemini.chat(ProviderRequest(model="gemini-2.5", messages=[{"role": "user", "content": "hi"}], metadata={}))
     assert not resp.ok
     assert "disabled" in (resp.error or "").lower()
+
+@pytest.mark.asyncio
+async def test_provider_reuses_one_pooled_client(monkeypatch):
+    import httpx
+    from providers import http_client
+
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("OLLAMA_HTTP_MAX_KEEPALIVE", "3")
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200, json={"message": {"content": f"reply {len(seen)}"}, "eval_count": 2})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(http_client.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    r = ProviderRegistry()
+    ollama = r.get("ollama")
+    assert ollama._http.settings.max_connections == 7
+    assert ollama._http.settings.max_keepalive_connections == 3
+    req = ProviderRequest(model="llama3.2:latest", messages=[{"role": "user", "content": "hi"}], metadata={})
+    out = [await ollama.chat(req) for _ in range(3)]
+    assert [o.content for o in out] == ["reply 1", "reply 2", "reply 3"]
+    assert seen == ["/api/chat"] * 3
+    assert ollama._http.clients_created == 1
+    client = ollama._http.get()
+    await r.aclose()
+    assert client.is_closed
+    # used again after shutdown: a fresh client is built
+    assert (await ollama.chat(req)).ok and ollama._http.clients_created == 2
+    await r.aclose()
+
+
+def _mock_client(monkeypatch, handler):
+    import httpx
+    from providers import http_client
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(http_client.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+
+
+@pytest.mark.asyncio
+async def test_ollama_streaming_records_ttft(monkeypatch):
+    import httpx
+    import json
+
+    def handler(request):
+        body = json.loads(request.content)
+        assert body["stream"] is True
+        lines = [
+            {"message": {"content": "Hello"}, "done": False},
+            {"message": {"content": " there"}, "done": False},
+            {"message": {"content": ""}, "done": True, "eval_count": 3, "eval_duration": 5_000_000},
+        ]
+        return httpx.Response(200, content="\n".join(json.dumps(l) for l in lines).encode())
+
+    _mock_client(monkeypatch, handler)
+    ollama = ProviderRegistry().get("ollama")
+    req = ProviderRequest(model="llama3.2:latest", messages=[{"role": "user", "content": "hi"}], metadata={"stream": True})
+    resp = await ollama.chat(req)
+    assert resp.ok and resp.content == "Hello there"
+    meta = resp.provider_meta
+    assert meta["stream"] is True and meta["stream_chunks"] == 2 and meta["eval_count"] == 3
+    assert meta["ttft_ms"] is not None and 0 <= meta["ttft_ms"] <= resp.latency_ms
+
+
+@pytest.mark.asyncio
+async def test_openai_streaming_parses_sse(monkeypatch):
+    import httpx
+    import json
+
+    def handler(request):
+        body = json.loads(request.content)
+        assert body["stream"] is True and body["stream_options"] == {"include_usage": True}
+        chunks = [
+            {"model": "gpt-x", "choices": [{"delta": {"content": "Your refund"}}]},
+            {"model": "gpt-x", "choices": [{"delta": {"content": " is approved."}}]},
+            {"model": "gpt-x", "choices": [], "usage": {"prompt_tokens": 9, "completion_tokens": 5}},
+        ]
+        sse = "".join(f"data: {json.dumps(c)}\n\n" for c in chunks) + "data: [DONE]\n\n"
+        return httpx.Response(200, content=sse.encode(), headers={"content-type": "text/event-stream"})
+
+    _mock_client(monkeypatch, handler)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("PROVIDER_STREAM", "1")
+    openai = ProviderRegistry().get("openai")
+    resp = await openai.chat(ProviderRequest(model="gpt-x", messages=[{"role": "user", "content": "hi"}], metadata={}))
+    assert resp.ok and resp.content == "Your refund is approved."
+    assert resp.provider_meta["usage"]["completion_tokens"] == 5
+    assert resp.provider_meta["stream_chunks"] == 2 and resp.provider_meta["ttft_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_ollama_warm_up_loads_model_and_flags_cold_starts(monkeypatch):
+    import httpx
+    import json
+    from providers.ollama import OllamaProvider
+
+    seen = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        seen.append((request.url.path, body))
+        if request.url.path == "/api/generate":
+            return httpx.Response(200, json={"model": body["model"], "done": True, "load_duration": 2_500_000_000})
+        load = 3_000_000_000 if body["messages"][0]["content"] == "cold" else 1_000_000
+        return httpx.Response(200, json={"message": {"content": "ok"}, "load_duration": load, "eval_count": 1})
+
+    _mock_client(monkeypatch, handler)
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "1h")
+    p = OllamaProvider("http://h:11434")
+    out = await p.warm_up("llama3.2:latest")
+    assert out["ok"] and out["load_ms"] == 2500.0 and out["endpoints"][0]["check_ms"] is not None
+    assert [path for path, _ in seen] == ["/api/generate", "/api/chat"]
+    assert all(body["keep_alive"] == "1h" for _, body in seen)
+
+    cold = await p.chat(ProviderRequest(model="llama3.2:latest", messages=[{"role": "user", "content": "cold"}], metadata={}))
+    warm = await p.chat(ProviderRequest(model="llama3.2:latest", messages=[{"role": "user", "content": "warm"}], metadata={}))
+    assert cold.provider_meta["cold_start"] is True and cold.provider_meta["load_ms"] == 3000.0
+    assert "cold_start" not in warm.provider_meta and seen[-1][1]["keep_alive"] == "1h"
+    await p.aclose()
@@ -0,0 +1,83 @@
+import json
+import types
+
+import pytest
+
+from providers.rate_limit import RateLimiter, TokenBucket, limits_from_env
+from providers.registry import ProviderRegistry
+from providers.types import ProviderRequest
+
+
+def _sleeper():
+    slept = []
+    buckets = []
+
+    async def sleep(s):
+        slept.append(s)
+        # advance the buckets as if the time had passed
+        for b in buckets:
+            b._at -= s
+    return sleep, slept, buckets
+
+
+def test_limits_from_env(monkeypatch):
+    monkeypatch.setenv("PROVIDER_RATE_LIMITS", json.dumps({"openai": {"rpm": 60, "tpm": 6000}, "openai:gpt-4o": {"tpm": 600}, "bad": 3}))
+    lim = limits_from_env()
+    assert lim == {"openai": {"rpm": 60.0, "tpm": 6000.0}, "openai:gpt-4o": {"tpm": 600.0}}
+    rl = RateLimiter(lim)
+    assert rl.limits_for("openai", "gpt-4o") == {"tpm": 600.0}
+    assert rl.limits_for("openai", "gpt-5") == {"rpm": 60.0, "tpm": 6000.0}
+    assert rl.limits_for("ollama", "llama3") == {}
+
+
+@pytest.mark.asyncio
+async def test_rpm_and_tpm_buckets_pace_requests():
+    rl = RateLimiter({"openai": {"rpm": 60, "tpm": 600}})
+    sleep, slept, buckets = _sleeper()
+    buckets.extend(rl._buckets_for("openai", "m").values())
+    # a full bucket lets the first request through immediately
+    res = await rl.acquire("openai", "m", 500, sleep=sleep)
+    assert res.waited_s == 0 and not slept
+    # only 100 tokens left: 300 more need 30s of refill at 10 tokens/s
+    res = await rl.acquire("openai", "m", 400, sleep=sleep)
+    assert res.waited_s == pytest.approx(30.0, abs=0.5)
+    # settling against real usage refunds the over-reservation
+    tpm = rl._buckets_for("openai", "m")["tpm"]
+    before = tpm.level
+    rl.settle(res, {"usage": {"prompt_tokens": 100, "completion_tokens": 50}})
+    assert tpm.level == pytest.approx(before + 250, abs=1)
+    # no limits configured: never waits
+    assert (await rl.acquire("ollama", "m", 10**6, sleep=sleep)).waited_s == 0
+
+
+def test_quota_headers_and_429_adapt_buckets():
+    rl = RateLimiter({"openai": {"rpm": 100, "tpm": 10000}})
+    b = rl._buckets_for("openai", "m")
+    res = types.SimpleNamespace(key=("openai", "m"), tokens=0)
+    rl.settle(res, {"ratelimit": {"x-ratelimit-remaining-requests": "3", "x-ratelimit-limit-tokens": "5000",
+                                  "x-ratelimit-remaining-tokens": "1200"}})
+    assert b["rpm"].level <= 3.01
+    assert b["tpm"].capacity == 5000 and b["tpm"].level <= 1200.5
+    rl.settle(res, {"status": 429}, 429)
+    assert b["rpm"].level <= 0.01 and b["tpm"].level <= 0.5
+
+
+def test_token_bucket_oversized_amount_waits_for_full_bucket():
+    b = TokenBucket(100, 10)
+    b.take(100)
+    assert b.wait_s(1000) == pytest.approx(10.0, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_registry_reserves_context_estimate(monkeypatch):
+    monkeypatch.setenv("PROVIDER_RATE_LIMITS", json.dumps({"ollama": {"tpm": 100000}}))
+    reg = ProviderRegistry()
+    ollama = reg.get("ollama")
+
+    async def fake_chat(self, req):
+        return types.SimpleNamespace(ok=True, content="ok", latency_ms=1, provider_meta={})
+    monkeypatch.setattr(type(ollama), "chat", fake_chat, raising=True)
+    req = ProviderRequest(model="llama3", messages=[], metadata={"token_estimate": 1500, "params": {"max_tokens": 500}})
+    resp, info = await reg.chat("ollama", req)
+    assert resp.ok and info["rate_limit_wait_ms"] == 0
+    assert reg.rate_limiter._buckets_for("ollama", "llama3")["tpm"].level == pytest.approx(98000, abs=50)
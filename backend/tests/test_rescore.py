@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+from backend import cli
+from backend.rescore import rescore_runs
+
+
+def _run_sample(root: Path) -> str:
+    assert cli.main(["init", "--root", str(root)]) == 0
+    assert cli.main(["run", "--root", str(root), "--file", str(root / "configs" / "sample.run.json")]) == 0
+    run_dirs = [p for p in (root / "runs").iterdir() if (p / "run_config.json").exists()]
+    assert len(run_dirs) == 1
+    return run_dirs[0].name
+
+
+def test_rescore_writes_new_results_version(tmp_path: Path):
+    run_id = _run_sample(tmp_path)
+    run_dir = tmp_path / "runs" / run_id
+    original = (run_dir / "results.json").read_text(encoding="utf-8")
+
+    out = rescore_runs(tmp_path / "runs", tmp_path / "datasets", [run_id], thresholds={"semantic": 0.5}, workers=1)
+    assert [s["version"] for s in out] == [2]
+    v2 = json.loads((run_dir / "results.v2.json").read_text(encoding="utf-8"))
+    assert v2["run_id"] == run_id
+    assert v2["rescore"]["thresholds"]["semantic"] == 0.5
+    assert len(v2["conversations"]) == len(json.loads(original)["conversations"])
+    assert (run_dir / "results.v2.csv").exists()
+    # the original results are left untouched; the next rescore gets the next version
+    assert (run_dir / "results.json").read_text(encoding="utf-8") == original
+    assert rescore_runs(tmp_path / "runs", tmp_path / "datasets", [run_id], workers=1)[0]["version"] == 3
+
+
+def test_cli_rescore(tmp_path: Path):
+    run_id = _run_sample(tmp_path)
+    assert cli.main(["rescore", "--root", str(tmp_path), "--run-id", run_id, "--thresholds", '{"semantic": 0.9}', "--workers", "2"]) == 0
+    assert (tmp_path / "runs" / run_id / "results.v2.json").exists()
+    assert cli.main(["rescore", "--root", str(tmp_path), "--run-id", "missing-run"]) == 2
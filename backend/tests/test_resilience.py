@@ -0,0 +1,128 @@
+import asyncio
+import types
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from providers.resilience import CircuitBreaker, RetryPolicy, call_with_resilience, parse_retry_after
+from providers.types import ProviderRequest, ProviderResponse
+from turn_runner import TurnRunner
+
+REQ = ProviderRequest(model="m", messages=[{"role": "user", "content": "hi"}], metadata={})
+
+
+def _scripted(responses):
+    calls = []
+
+    async def chat(req):
+        calls.append(req)
+        return responses[min(len(calls), len(responses)) - 1]
+    return chat, calls
+
+
+def _sleeps():
+    slept = []
+
+    async def sleep(s):
+        slept.append(s)
+    return sleep, slept
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_and_honors_retry_after():
+    chat, calls = _scripted([
+        ProviderResponse(False, "", 40, {"status": 429, "retry_after": "2"}, error="rate limited"),
+        ProviderResponse(False, "", 10, {"exception": "ReadTimeout"}, error="timeout"),
+        ProviderResponse(True, "done", 25, {}),
+    ])
+    sleep, slept = _sleeps()
+    resp, info = await call_with_resilience(chat, REQ, RetryPolicy(max_retries=3, backoff_base_ms=100), sleep=sleep)
+    assert resp.ok and resp.content == "done" and len(calls) == 3
+    assert info["attempts"] == 3 and info["retries"] == 2
+    assert slept[0] >= 2.0 and slept[1] <= 0.2
+    assert info["wasted_ms"] == 40 + 10 + sum(int(s * 1000) for s in slept)
+    assert [e.get("status") for e in info["errors"]] == [429, None]
+    assert info["errors"][0]["retry_after_s"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_client_errors_and_exhausted_retries_are_returned():
+    chat, calls = _scripted([ProviderResponse(False, "", 5, {"status": 400}, error="bad request")])
+    sleep, slept = _sleeps()
+    resp, info = await call_with_resilience(chat, REQ, RetryPolicy(), sleep=sleep)
+    assert not resp.ok and len(calls) == 1 and info["retries"] == 0 and not slept
+
+    chat, calls = _scripted([ProviderResponse(False, "", 5, {"status": 503}, error="unavailable")])
+    resp, info = await call_with_resilience(chat, REQ, RetryPolicy(max_retries=2), sleep=sleep)
+    assert not resp.ok and len(calls) == 3 and info["retries"] == 2 and len(info["errors"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_holds_calls_until_cooldown():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_s=0.2)
+    chat, calls = _scripted([
+        ProviderResponse(False, "", 1, {"status": 503}, error="down"),
+        ProviderResponse(False, "", 1, {"status": 503}, error="down"),
+        ProviderResponse(True, "back", 1, {}),
+    ])
+    resp, info = await call_with_resilience(chat, REQ, RetryPolicy(max_retries=0), breaker)
+    assert not resp.ok and breaker.state == "closed"
+    resp, info = await call_with_resilience(chat, REQ, RetryPolicy(max_retries=0), breaker)
+    assert breaker.state == "open" and breaker.opened_count == 1
+    # the next call waits out the cooldown, goes through as the half-open probe and closes the breaker
+    resp, info = await call_with_resilience(chat, REQ, RetryPolicy(max_retries=0), breaker)
+    assert resp.ok and breaker.state == "closed"
+    assert info["breaker_wait_ms"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=0.01)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    await asyncio.sleep(0.02)
+    started = asyncio.Event()
+
+    async def hang(req):
+        started.set()
+        await asyncio.sleep(3600)
+
+    probe = asyncio.create_task(call_with_resilience(hang, REQ, RetryPolicy(max_retries=0), breaker))
+    await started.wait()
+    assert breaker.state == "half-open"
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    chat, calls = _scripted([ProviderResponse(True, "ok", 1, {})])
+    resp, info = await asyncio.wait_for(call_with_resilience(chat, REQ, RetryPolicy(max_retries=0), breaker), 2.0)
+    assert resp.ok and breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_turn_artifact_records_retries(monkeypatch):
+    monkeypatch.setenv("OLLAMA_BACKOFF_BASE_MS", "1")
+    with tempfile.TemporaryDirectory() as d:
+        runner = TurnRunner(Path(d))
+        ollama = runner.providers.get("ollama")
+        replies = [
+            ProviderResponse(False, "", 3, {"status": 503}, error="busy"),
+            types.SimpleNamespace(ok=True, content="ok", latency_ms=2, provider_meta={}),
+        ]
+
+        async def fake_chat(self, req):
+            return replies.pop(0)
+        monkeypatch.setattr(type(ollama), "chat", fake_chat, raising=True)
+        rec = await runner.run_turn(
+            run_id="r", provider="ollama", model="llama3.2:latest", domain="commerce",
+            conversation_id="c1", turn_index=0, turns=[{"role": "user", "text": "Where is order A1?"}],
+        )
+        assert rec["response"]["ok"] and rec["response"]["content"] == "ok"
+        assert rec["resilience"]["retries"] == 1 and rec["resilience"]["wasted_ms"] >= 3
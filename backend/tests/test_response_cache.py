@@ -0,0 +1,51 @@
+from pathlib import Path
+import tempfile
+import time
+
+import pytest
+
+from response_cache import ResponseCache, cache_key, normalize_cache_mode
+
+
+def test_cache_key_covers_messages_and_params():
+    msgs = [{"role": "user", "content": "hi"}]
+    k = cache_key("ollama", "llama3", msgs, {"temperature": 0, "seed": 42})
+    assert k == cache_key("ollama", "llama3", list(msgs), {"seed": 42, "temperature": 0})
+    assert k != cache_key("ollama", "llama3", msgs, {"temperature": 0, "seed": 7})
+    assert k != cache_key("openai", "llama3", msgs, {"temperature": 0, "seed": 42})
+
+
+def test_normalize_cache_mode(monkeypatch):
+    monkeypatch.delenv("RESPONSE_CACHE_MODE", raising=False)
+    assert normalize_cache_mode(None) == "bypass"
+    assert normalize_cache_mode("read_only") == "read-only"
+    monkeypatch.setenv("RESPONSE_CACHE_MODE", "read-write")
+    assert normalize_cache_mode(None) == "read-write"
+    with pytest.raises(ValueError):
+        normalize_cache_mode("sometimes")
+
+
+def test_cache_evicts_by_size_lru_and_age():
+    with tempfile.TemporaryDirectory() as d:
+        cache = ResponseCache(Path(d, "rc.sqlite3"), max_bytes=300, max_age_days=1)
+        for k in ("a", "b", "c"):
+            cache.put(k, provider="ollama", model="m", content="x" * 120, latency_ms=5, provider_meta={})
+            time.sleep(0.01)
+        assert cache.get("a") is None  # oldest dropped to stay under 300 bytes
+        assert cache.get("b")["content"] == "x" * 120
+        cache.put("d", provider="ollama", model="m", content="x" * 120, latency_ms=5, provider_meta={})
+        # "b" was just used, so "c" is the least recently used
+        assert cache.get("c") is None and cache.get("b") is not None
+
+        old = ResponseCache(Path(d, "rc.sqlite3"), max_bytes=10_000, max_age_days=0)
+        assert old.get("b") is None
+
+
+def test_cache_keeps_running_size_between_sweeps():
+    with tempfile.TemporaryDirectory() as d:
+        cache = ResponseCache(Path(d, "rc.sqlite3"), max_bytes=10_000, max_age_days=1)
+        for i in range(5):
+            cache.put(f"k{i % 3}", provider="ollama", model="m", content="x" * (10 * i), latency_ms=5, provider_meta={})
+        # overwriting a key replaces its size rather than adding to it
+        assert cache._total == cache.stats()["bytes"] and cache._puts == 4
+        assert cache.get("k0") is not None and cache.stats()["entries"] == 3
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+import tempfile
+
+import pytest
+
+from orchestrator import Orchestrator
+from job_store import JobStore
+from artifacts import RunArtifactWriter
+from scheduler import JobScheduler, parse_priority
+
+
+def _make_orch(root: Path, monkeypatch, gate: asyncio.Event) -> Orchestrator:
+    ds_dir = root / 'datasets'; ds_dir.mkdir(parents=True)
+    runs_dir = root / 'runs'; runs_dir.mkdir(parents=True)
+    ds = {
+        "dataset_id": "commerce_sample",
+        "version": "1.0.0",
+        "metadata": {"domain": "commerce", "difficulty": "easy"},
+        "conversations": [
+            {"conversation_id": "c1", "turns": [{"role": "user", "text": "hi"}, {"role": "assistant", "text": "hello"}]}
+        ]
+    }
+    Path(ds_dir, 'commerce_sample.dataset.json').write_text(json.dumps(ds), encoding='utf-8')
+    orch = Orchestrator(datasets_dir=ds_dir, runs_root=runs_dir)
+
+    async def gated_run_turn(self, **kwargs):
+        await gate.wait()
+        return {"response": {"ok": True}}
+    monkeypatch.setattr(type(orch._runner), 'run_turn', gated_run_turn, raising=True)
+    return orch
+
+
+def _submit(sched: JobScheduler, orch: Orchestrator, vertical: str, model: str, priority="normal", seed=0):
+    cfg = {"metrics": ["exact"], "thresholds": {}, "params_override": {"seed": seed}}
+    jr = orch.submit(dataset_id='commerce_sample', model_spec=model, config=cfg, job_id=sched.new_job_id())
+    RunArtifactWriter(orch.runs_root).init_run(jr.run_id, {"dataset_id": 'commerce_sample', "model_spec": model, **cfg})
+    sched.enqueue(vertical, jr, kind="run", priority=parse_priority(priority), config=cfg)
+    return jr
+
+
+def test_parse_priority():
+    assert parse_priority(None) == parse_priority("normal")
+    assert parse_priority("interactive") < parse_priority("normal") < parse_priority("batch")
+    assert parse_priority("5") == 5
+    with pytest.raises(ValueError):
+        parse_priority("urgent")
+
+
+def test_job_store_ids_are_reserved_and_upserted():
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d, 'jobs.sqlite3')
+        a, b = JobStore(path), JobStore(path)
+        # two stores on one file (two connections) never hand out the same id
+        ids = [a.next_job_id(), b.next_job_id(), a.next_job_id()]
+        assert len(set(ids)) == 3
+        a.add(job_id=ids[0], vertical="commerce", kind="run", dataset_id="ds", model_specs=["ollama:m"],
+              config={}, run_id="r1", priority=10)
+        before = a.get(ids[0])
+        a.add(job_id=ids[0], vertical="commerce", kind="run", dataset_id="ds", model_specs=["ollama:m"],
+              config={"x": 1}, run_id="r1", priority=0)
+        after = a.get(ids[0])
+        # updated in place: submission order and creation time are kept
+        assert after["seq"] == before["seq"] and after["created_at"] == before["created_at"]
+        assert after["config"] == {"x": 1} and after["priority"] == 0
+        assert [r["job_id"] for r in a.pending()] == [ids[0]]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_running_jobs_per_provider(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        gate = asyncio.Event()
+        orch = _make_orch(Path(d), monkeypatch, gate)
+        store = JobStore(Path(d, 'jobs.sqlite3'))
+        sched = JobScheduler(store, lambda v: orch, provider_limits={"ollama": 1}, default_limit=2)
+
+        a = _submit(sched, orch, "commerce", "ollama:llama3.2:latest", seed=1)
+        b = _submit(sched, orch, "commerce", "ollama:llama3.2:latest", seed=2)
+        c = _submit(sched, orch, "commerce", "openai:gpt-4o-mini", seed=3)
+        assert a._task is not None and c._task is not None
+        assert b.state == "queued" and b._task is None
+        assert sched.queue_position(b.job_id) == 1
+        assert store.get(b.job_id)["state"] == "queued"
+
+        gate.set()
+        await orch.wait(a.job_id)
+        # the finished ollama job frees the slot for the queued one
+        assert b._task is not None
+        res = await orch.wait(b.job_id)
+        await orch.wait(c.job_id)
+        assert res.state == "succeeded"
+        await asyncio.sleep(0)
+        assert store.get(b.job_id)["state"] == "succeeded"
+        assert store.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_orders_by_priority_then_fair_share(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        gate = asyncio.Event()
+        orch = _make_orch(Path(d), monkeypatch, gate)
+        store = JobStore(Path(d, 'jobs.sqlite3'))
+        sched = JobScheduler(store, lambda v: orch, provider_limits={"ollama": 1})
+
+        running = _submit(sched, orch, "commerce", "ollama:m", seed=1)
+        b1 = _submit(sched, orch, "commerce", "ollama:m", priority="batch", seed=2)
+        c2 = _submit(sched, orch, "commerce", "ollama:m", seed=3)
+        c3 = _submit(sched, orch, "commerce", "ollama:m", seed=4)
+        h1 = _submit(sched, orch, "banking", "ollama:m", seed=5)
+        i1 = _submit(sched, orch, "commerce", "ollama:m", priority="interactive", seed=6)
+
+        assert running._task is not None
+        order = sorted([b1, c2, c3, h1, i1], key=lambda j: sched.queue_position(j.job_id))
+        # interactive first; commerce already holds the slot, so banking goes before the remaining commerce jobs
+        assert [j.job_id for j in order] == [i1.job_id, h1.job_id, c2.job_id, c3.job_id, b1.job_id]
+
+        gate.set()
+        for j in [running, b1, c2, c3, h1, i1]:
+            await orch.wait(j.job_id)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_restores_queued_jobs_from_store(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        gate = asyncio.Event()
+        orch = _make_orch(Path(d), monkeypatch, gate)
+        store_path = Path(d, 'jobs.sqlite3')
+        sched = JobScheduler(JobStore(store_path), lambda v: orch, provider_limits={"ollama": 1})
+        _submit(sched, orch, "commerce", "ollama:m", seed=1)
+        queued = _submit(sched, orch, "commerce", "ollama:m", seed=2)
+
+        # simulate a server restart: fresh orchestrator and scheduler over the same store
+        orch2 = Orchestrator(datasets_dir=Path(d, 'datasets'), runs_root=orch.runs_root)
+        sched2 = JobScheduler(JobStore(store_path), lambda v: orch2, provider_limits={"ollama": 1})
+        assert sched2.restore() == 2
+        # the running job continues from its artifacts, the queued one is re-submitted under its id
+        assert orch2.jobs[queued.job_id].resume is False
+        assert sched2.new_job_id() not in orch2.jobs
+        gate.set()
+        for jr in list(orch2.jobs.values()):
+            res = await orch2.wait(jr.job_id)
+            assert res.state == "succeeded"
+        for jr in list(orch.jobs.values()):
+            await orch.wait(jr.job_id)
+
+
+def test_rejected_run_submission_leaves_no_job_rows(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend.app import app, _get_or_create_vertical_context
+
+    store = JobStore(tmp_path / 'jobs.sqlite3')
+    monkeypatch.setattr(app.state, "scheduler", JobScheduler(store, lambda v: _get_or_create_vertical_context(v)['orch']), raising=False)
+    client = TestClient(app)
+    assert client.post("/runs", json={"dataset_id": "no_such_dataset", "model_spec": "ollama:m"}).status_code == 400
+    assert client.post("/runs", json={"dataset_id": "no_such_dataset", "model_specs": ["ollama:m", "bad"]}).status_code == 400
+    with sqlite3.connect(str(tmp_path / 'jobs.sqlite3')) as con:
+        assert con.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
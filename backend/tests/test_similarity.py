@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from embeddings.ollama_embed import OllamaEmbeddings
+from embeddings.similarity import VariantMatrix, best_match, score_pairs
+from metrics import semantic_similarity, semantic_similarity_many
+
+
+def _loop_scores(out, variants):
+    scores = [OllamaEmbeddings.cosine(out, v) for v in variants]
+    best_idx, best_score = -1, -1.0
+    for i, sc in enumerate(scores):
+        if sc > best_score:
+            best_idx, best_score = i, sc
+    return scores, best_idx, best_score
+
+
+def test_matrix_scores_match_pairwise_cosine():
+    rng = random.Random(7)
+    variants = [[rng.uniform(-1, 1) for _ in range(768)] for _ in range(5)]
+    variants.append([0.0] * 768)  # zero vector scores 0.0
+    variants.append([1.0] * 10)  # wrong dimension scores 0.0
+    vm = VariantMatrix(variants)
+    outputs = [[rng.uniform(-1, 1) for _ in range(768)] for _ in range(4)] + [variants[2], [0.0] * 768]
+    batch = vm.scores(outputs)
+    for row, out in zip(batch.tolist(), outputs):
+        scores, idx, best = _loop_scores(out, variants)
+        assert row == pytest.approx(scores, abs=1e-12)
+        assert best_match(row) == (idx, pytest.approx(best, abs=1e-12))
+    assert best_match([]) == (-1, -1.0)
+
+
+@pytest.mark.asyncio
+async def test_semantic_similarity_reuses_variant_matrix():
+    class FakeEmbedder:
+        model = "fake"
+
+        async def embed(self, texts):
+            return [[1.0, 0.0] if t.startswith("yes") else [0.6, 0.8] for t in texts]
+
+    matrices, cache = {}, {}
+    a = await semantic_similarity("yes a", ["yes b", "no"], embedder=FakeEmbedder(), threshold=0.8, cache=cache, matrices=matrices)
+    b = await semantic_similarity("no c", ["yes b", "no"], embedder=FakeEmbedder(), threshold=0.8, cache=cache, matrices=matrices)
+    assert len(matrices) == 1
+    assert a["best_variant_index"] == 0 and a["pass"] and a["scores"] == pytest.approx([1.0, 0.6])
+    assert b["best_variant_index"] == 1 and b["score_max"] == pytest.approx(1.0)
+
+
+def test_score_pairs_matches_per_matrix_scores():
+    rng = random.Random(11)
+    a = VariantMatrix([[rng.uniform(-1, 1) for _ in range(64)] for _ in range(3)])
+    b = VariantMatrix([[rng.uniform(-1, 1) for _ in range(64)] for _ in range(2)] + [[0.0] * 64])
+    outs = [[rng.uniform(-1, 1) for _ in range(64)] for _ in range(4)] + [[0.0] * 64, [1.0] * 5]
+    pairs = [(a, outs[0]), (b, outs[1]), (a, outs[2]), (b, outs[3]), (a, outs[4]), (b, outs[5])]
+    for (vm, out), got in zip(pairs, score_pairs(pairs)):
+        assert got.tolist() == pytest.approx(vm.scores([out])[0].tolist(), abs=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_semantic_similarity_many_embeds_and_scores_once():
+    calls = []
+
+    class FakeEmbedder:
+        model = "fake"
+
+        async def embed(self, texts):
+            calls.append(list(texts))
+            return [[1.0, 0.0] if t.startswith("yes") else [0.6, 0.8] for t in texts]
+
+    res = await semantic_similarity_many(
+        [("yes a", ["yes b", "no"]), ("no c", ["no"]), ("x", [])], embedder=FakeEmbedder(), threshold=0.8, cache={}
+    )
+    assert len(calls) == 1
+    assert res[0]["best_variant_index"] == 0 and res[0]["pass"]
+    assert res[1]["scores"] == pytest.approx([1.0])
+    assert res[2]["skipped"] and res[2]["reason"] == "no variants"
@@ -25,3 +25,39 @@ def test_extract_state_banking():
     assert s["amount"] == 100.0
     assert s["account_id"] == "9XYZ"
     assert s["decision"] == "ALLOW"
+
+
+def test_incremental_extractor_matches_full_passes(monkeypatch):
+    import state_extractor
+    from state_extractor import IncrementalStateExtractor
+
+    turns = [
+        {"role": "user", "text": "Where is my order #A123? It was shipped already."},
+        {"role": "assistant", "text": "Please provide details. Total $40."},
+        {"role": "user", "text": "I want a refund of $15, no receipt though."},
+        {"role": "assistant", "text": 'We can issue a refund.\nFINAL_STATE: {"decision": "PARTIAL", "policy_flags": ["max_refund"]}'},
+        {"role": "user", "text": "It is outside the return window? Please escalate."},
+    ]
+    replies = ["Approved, processing refund of $15.", "I cannot refund that.",
+               'Escalating now.\nFINAL_STATE: {"decision": "DENY", "next_action": "escalate", "policy_flags": []}']
+    calls = []
+    real_apply = state_extractor._apply_turn
+    monkeypatch.setattr(state_extractor, "_apply_turn", lambda d, s, t: calls.append(t) or real_apply(d, s, t))
+
+    ex = IncrementalStateExtractor("commerce")
+    for n, reply in zip((1, 3, 5), replies):
+        prefix = turns[:n]
+        state = ex.feed(prefix)
+        after = ex.with_reply(prefix, reply)
+        full = state_extractor.extract_state("commerce", prefix)
+        assert state == full
+        assert after == state_extractor.extract_state("commerce", prefix + [{"role": "assistant", "text": reply}], prev_state=full)
+    # returned states are copies: mutating one does not leak into the next turn
+    after["policy_flags"].append("tampered")
+    assert "tampered" not in ex.feed(turns)["policy_flags"]
+    calls.clear()
+    ex.feed(turns)
+    assert calls == []
+    # a transcript that is not an extension is re-read from the start
+    other = [{"role": "user", "text": "acct id 9XYZ transfer"}]
+    assert ex.feed(other) == state_extractor.extract_state("commerce", other)
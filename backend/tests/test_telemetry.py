@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import telemetry
+from providers.registry import ProviderRegistry
+from providers.types import ProviderRequest
+
+
+def test_text_exposition_format():
+    reg = telemetry.MetricsRegistry()
+    c = reg.counter("t_requests_total", "Requests.", ("model",))
+    c.inc(model='a"b')
+    c.inc(2, model='a"b')
+    h = reg.histogram("t_latency_seconds", "Latency.", ("model",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v, model="m")
+    g = reg.gauge("t_depth", "Depth.")
+    g.inc(); g.inc(); g.dec()
+    lines = reg.render().splitlines()
+    assert "# TYPE t_requests_total counter" in lines
+    assert 't_requests_total{model="a\\"b"} 3' in lines
+    assert 't_latency_seconds_bucket{model="m",le="0.1"} 1' in lines
+    assert 't_latency_seconds_bucket{model="m",le="1"} 2' in lines
+    assert 't_latency_seconds_bucket{model="m",le="+Inf"} 3' in lines
+    assert 't_latency_seconds_count{model="m"} 3' in lines
+    assert "t_depth 1" in lines
+    with pytest.raises(ValueError):
+        c.inc(-1, model="x")
+
+
+@pytest.mark.asyncio
+async def test_provider_calls_feed_latency_error_and_retry_metrics(monkeypatch):
+    monkeypatch.setenv("MOCK_MAX_RETRIES", "1")
+    monkeypatch.setenv("MOCK_BACKOFF_BASE_MS", "1")
+    reg = ProviderRegistry()
+    model = "instant,error_rate=1,error_status=503,tag=telemetry"
+    before = telemetry.PROVIDER_REQUEST_SECONDS.count(provider="mock", model=model, outcome="error")
+    req = ProviderRequest(model=model, messages=[{"role": "user", "content": "hi"}], metadata={"conversation_id": "c", "turn_index": 0})
+    resp, info = await reg.chat("mock", req)
+    assert not resp.ok and info["retries"] == 1
+    assert telemetry.PROVIDER_REQUEST_SECONDS.count(provider="mock", model=model, outcome="error") == before + 2
+    assert telemetry.PROVIDER_ERRORS.value(provider="mock", model=model, reason="503") >= 2
+    assert telemetry.PROVIDER_RETRIES.value(provider="mock", model=model) >= 1
+    assert telemetry.PROVIDER_INFLIGHT.value(provider="mock") == 0
+
+
+def test_metrics_endpoint_serves_text_exposition():
+    from backend.app import app
+    client = TestClient(app)
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    for name in ("evals_job_queue_depth", "evals_embedding_cache_hit_ratio", "evals_provider_request_duration_seconds"):
+        assert f"# TYPE {name} " in body
@@ -0,0 +1,71 @@
+from token_accounting import (
+    TokenCounter,
+    estimate_tokens,
+    model_family,
+    normalize_usage,
+    turn_usage,
+)
+
+
+def test_model_family_from_spec_or_name():
+    assert model_family("openai:gpt-4o-mini") == "openai"
+    assert model_family("ollama:llama3.2:latest") == "llama"
+    assert model_family("gemini-2.5-flash") == "gemini"
+    assert model_family("mystery-model") == "generic"
+    assert model_family(None) == "generic"
+
+
+def test_normalize_usage_across_providers():
+    assert normalize_usage({"usage": {"prompt_tokens": 12, "completion_tokens": 5}})["input_tokens"] == 12
+    assert normalize_usage({"usage": {"input_tokens": 7, "output_tokens": 3}})["output_tokens"] == 3
+    g = normalize_usage({"usageMetadata": {"promptTokenCount": 40, "candidatesTokenCount": 9, "thoughtsTokenCount": 11}})
+    assert (g["input_tokens"], g["output_tokens"]) == (40, 20)
+    o = normalize_usage({"prompt_eval_count": 30, "eval_count": 50, "eval_duration": 2_000_000_000})
+    assert (o["input_tokens"], o["output_tokens"], o["generation_ms"]) == (30, 50, 2000)
+    assert normalize_usage({}) == {"input_tokens": None, "output_tokens": None, "generation_ms": None}
+
+
+def test_turn_usage_falls_back_to_tokenizer_and_reports_throughput():
+    rec = {
+        "model": "llama3.2:latest",
+        "request": {"messages": [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Where is order A1?"}]},
+        "response": {"ok": True, "content": "It ships tomorrow.", "latency_ms": 500, "provider_meta": {}},
+    }
+    u = turn_usage(rec)
+    assert u["input_source"] == "tokenizer" and u["output_source"] == "tokenizer"
+    assert u["input_tokens"] > 8  # message framing included
+    assert u["output_tokens"] == estimate_tokens("It ships tomorrow.")
+    assert u["output_tokens_per_sec"] == round(u["output_tokens"] * 2.0, 2)
+
+    rec["response"]["provider_meta"] = {"prompt_eval_count": 21, "eval_count": 4, "eval_duration": 100_000_000}
+    u = turn_usage(rec)
+    assert (u["input_tokens"], u["output_tokens"], u["input_source"]) == (21, 4, "provider")
+    assert u["output_tokens_per_sec"] == 40.0
+
+
+def test_token_counter_caches_by_text_hash():
+    tc = TokenCounter(max_entries=2)
+    assert tc.count("refund order A1234", "gpt-4o") == tc.count("refund order A1234", "gpt-4o")
+    assert (tc.hits, tc.misses) == (1, 1)
+    tc.count("a"); tc.count("b")
+    # oldest entry evicted
+    tc.count("refund order A1234", "gpt-4o")
+    assert tc.misses == 4
+
+
+def test_tiktoken_is_only_used_with_a_cached_encoding(tmp_path, monkeypatch):
+    import hashlib
+    import sys
+    import types
+    import token_accounting
+
+    loaded = []
+    fake = types.SimpleNamespace(get_encoding=lambda name: loaded.append(name) or types.SimpleNamespace(encode=lambda text, **kw: text.split()))
+    monkeypatch.setitem(sys.modules, "tiktoken", fake)
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+    # no BPE file cached: no download attempt, the heuristic is used
+    assert token_accounting._load_vocab_tokenizer("openai") is None and loaded == []
+    url = token_accounting._TIKTOKEN_URLS["o200k_base"]
+    (tmp_path / hashlib.sha1(url.encode()).hexdigest()).write_bytes(b"")
+    count = token_accounting._load_vocab_tokenizer("openai")
+    assert loaded == ["o200k_base"] and count("a b c") == 3
@@ -35,3 +35,35 @@ async def test_turn_runner_persists(monkeypatch):
         assert rec["response"]["ok"]
         out = Path(d) / "runx" / "conversations" / "conv1" / "turn_001.json"
         assert out.exists()
+
+
+@pytest.mark.asyncio
+async def test_turn_runner_response_cache_modes(monkeypatch):
+    with tempfile.TemporaryDirectory() as d:
+        runner = TurnRunner(Path(d))
+        ollama = runner.providers.get("ollama")
+        calls = []
+        async def fake_chat(self, req):
+            calls.append(req.model)
+            return types.SimpleNamespace(ok=True, content=f"reply {len(calls)}", latency_ms=2, provider_meta={"eval_count": 2})
+        monkeypatch.setattr(type(ollama), "chat", fake_chat, raising=True)
+        turns = [{"role": "user", "text": "Where is my order A1?"}]
+
+        async def run(mode, run_id):
+            return await runner.run_turn(
+                run_id=run_id, provider="ollama", model="llama3.2:latest", domain="commerce",
+                conversation_id="conv1", turn_index=0, turns=turns, cache_mode=mode,
+            )
+
+        # read-only on an empty cache: miss, nothing stored
+        assert (await run("read-only", "r1"))["response"]["cache"] == "miss"
+        rec = await run("read-write", "r2")
+        assert rec["response"]["cache"] == "miss" and len(calls) == 2
+        # same provider/model/messages/params: served from the cache
+        rec = await run("read-write", "r3")
+        assert rec["response"]["cache"] == "hit" and rec["response"]["content"] == "reply 2"
+        assert (await run("read-only", "r4"))["response"]["content"] == "reply 2"
+        assert len(calls) == 2
+        # bypass always calls the provider and does not touch the cache
+        rec = await run("bypass", "r5")
+        assert rec["response"]["cache"] is None and len(calls) == 3
@@ -0,0 +1,235 @@
+from __future__ import annotations
+import hashlib
+import math
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Model name prefix -> tokenizer family. Vocab files are looked up per family.
+MODEL_FAMILIES: List[Tuple[str, str]] = [
+    ("gpt", "openai"), ("o1", "openai"), ("o3", "openai"), ("o4", "openai"), ("text-embedding", "openai"),
+    ("gemini", "gemini"), ("gemma", "gemma"),
+    ("llama", "llama"), ("codellama", "llama"),
+    ("mistral", "mistral"), ("mixtral", "mistral"),
+    ("qwen", "qwen"), ("phi", "phi"), ("deepseek", "deepseek"),
+]
+DEFAULT_FAMILY = "generic"
+# tiktoken encoding per family when tiktoken (and its cached BPE files) is available
+_TIKTOKEN_ENCODINGS = {"openai": "o200k_base"}
+# where tiktoken fetches each encoding from; its cache file is named after the URL's sha1
+_TIKTOKEN_URLS = {"o200k_base": "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken"}
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def model_family(model: Optional[str]) -> str:
+    """Tokenizer family for a model name or 'provider:model' spec."""
+    if not model:
+        return DEFAULT_FAMILY
+    provider, _, rest = model.partition(":")
+    # 'ollama:llama3.2:latest' -> 'llama3.2:latest'; bare model names are used as-is
+    name = rest if rest and provider in ("ollama", "openai", "gemini") else model
+    name = name.lower().rsplit("/", 1)[-1]
+    for prefix, family in MODEL_FAMILIES:
+        if name.startswith(prefix):
+            return family
+    return DEFAULT_FAMILY
+
+
+def estimate_tokens(text: str) -> int:
+    """Offline BPE-like estimate: words split every ~6 letters, digits in groups of 3, one token per symbol.
+
+    Closer to real tokenizers than a flat chars/4 rule on prose, code and JSON alike.
+    """
+    if not text:
+        return 0
+    n = 0
+    for piece in _PIECE_RE.findall(text):
+        if piece[0].isdigit():
+            n += math.ceil(len(piece) / 3)
+        elif piece[0].isalpha():
+            n += math.ceil(len(piece) / 6)
+        else:
+            n += 1
+    return max(1, n)
+
+
+def _tiktoken_cached(enc_name: str) -> bool:
+    """True when tiktoken would load `enc_name` from its local cache instead of downloading it."""
+    url = _TIKTOKEN_URLS.get(enc_name)
+    if not url:
+        return False
+    # TIKTOKEN_CACHE_DIR="" disables tiktoken's cache, so every load would hit the network
+    if os.getenv("TIKTOKEN_CACHE_DIR") == "":
+        return False
+    cache_dir = (
+        os.getenv("TIKTOKEN_CACHE_DIR")
+        or os.getenv("DATA_GYM_CACHE_DIR")
+        or os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    )
+    return (Path(cache_dir) / hashlib.sha1(url.encode()).hexdigest()).is_file()
+
+
+def _load_vocab_tokenizer(family: str) -> Optional[Callable[[str], int]]:
+    """Counting function backed by a local vocab, or None when no offline tokenizer is available.
+
+    TOKENIZER_DIR/<family>.json is loaded with the `tokenizers` package (Hugging Face format);
+    OpenAI models use tiktoken when installed and its BPE file is already in TIKTOKEN_CACHE_DIR (or
+    tiktoken's default cache): this runs on the event loop, so it never downloads.
+    """
+    tok_dir = os.getenv("TOKENIZER_DIR")
+    if tok_dir:
+        path = Path(tok_dir) / f"{family}.json"
+        if path.exists():
+            try:
+                from tokenizers import Tokenizer  # type: ignore
+                tok = Tokenizer.from_file(str(path))
+                return lambda text: len(tok.encode(text, add_special_tokens=False).ids)
+            except Exception:
+                pass
+    enc_name = _TIKTOKEN_ENCODINGS.get(family)
+    if enc_name and _tiktoken_cached(enc_name):
+        try:
+            import tiktoken  # type: ignore
+            enc = tiktoken.get_encoding(enc_name)
+            return lambda text: len(enc.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return None
+
+
+class TokenCounter:
+    """Counts tokens per model family, caching results by text hash."""
+
+    def __init__(self, max_entries: int = 50_000) -> None:
+        self.max_entries = max_entries
+        self._counters: Dict[str, Callable[[str], int]] = {}
+        self._cache: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def counter_for(self, family: str) -> Callable[[str], int]:
+        fn = self._counters.get(family)
+        if fn is None:
+            fn = _load_vocab_tokenizer(family) or estimate_tokens
+            self._counters[family] = fn
+        return fn
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        if not text:
+            return 0
+        family = model_family(model)
+        key = (family, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        n = self._cache.get(key)
+        if n is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return n
+        self.misses += 1
+        try:
+            n = int(self.counter_for(family)(text))
+        except Exception:
+            n = estimate_tokens(text)
+        self._cache[key] = n
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return n
+
+    def count_messages(self, messages: List[Dict[str, Any]], model: Optional[str] = None) -> int:
+        # ~4 tokens of chat framing per message, as in the OpenAI cookbook accounting
+        return sum(self.count(str(m.get("content") or ""), model) + 4 for m in messages or [])
+
+
+_default_counter = TokenCounter()
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    return _default_counter.count(text, model)
+
+
+def count_message_tokens(messages: List[Dict[str, Any]], model: Optional[str] = None) -> int:
+    return _default_counter.count_messages(messages, model)
+
+
+def _int_or_none(v: Any) -> Optional[int]:
+    try:
+        return int(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_usage(provider_meta: Optional[Dict[str, Any]]) -> Dict[str, Optional[int]]:
+    """Provider-reported token counts in one shape: {input_tokens, output_tokens, generation_ms}.
+
+    Understands OpenAI `usage` (chat and responses APIs), Ollama `prompt_eval_count`/`eval_count`
+    (+ `eval_duration`) and Gemini `usageMetadata`. Missing values are None.
+    """
+    pm = provider_meta if isinstance(provider_meta, dict) else {}
+    inp: Optional[int] = None
+    out: Optional[int] = None
+    gen_ms: Optional[int] = None
+    usage = pm.get("usage")
+    if isinstance(usage, dict):
+        inp = _int_or_none(usage.get("prompt_tokens"))
+        out = _int_or_none(usage.get("completion_tokens"))
+        if inp is None:
+            inp = _int_or_none(usage.get("input_tokens"))
+        if out is None:
+            out = _int_or_none(usage.get("output_tokens"))
+    gm = pm.get("usageMetadata")
+    if isinstance(gm, dict):
+        if inp is None:
+            inp = _int_or_none(gm.get("promptTokenCount"))
+        if out is None:
+            # thinking tokens are billed as output
+            cand = _int_or_none(gm.get("candidatesTokenCount"))
+            thoughts = _int_or_none(gm.get("thoughtsTokenCount"))
+            if cand is not None or thoughts is not None:
+                out = (cand or 0) + (thoughts or 0)
+    if inp is None:
+        inp = _int_or_none(pm.get("prompt_eval_count"))
+    if out is None:
+        out = _int_or_none(pm.get("eval_count"))
+    eval_ns = _int_or_none(pm.get("eval_duration"))
+    if eval_ns:
+        gen_ms = max(1, eval_ns // 1_000_000)
+    return {"input_tokens": inp, "output_tokens": out, "generation_ms": gen_ms}
+
+
+def tokens_per_sec(output_tokens: int, generation_ms: int) -> Optional[float]:
+    return round(output_tokens * 1000.0 / generation_ms, 2) if generation_ms > 0 else None
+
+
+def turn_usage(rec: Dict[str, Any], model: Optional[str] = None) -> Dict[str, Any]:
+    """Per-turn token record: provider counts when reported, else the family tokenizer.
+
+    Returns {input_tokens, output_tokens, input_source, output_source, generation_ms, output_tokens_per_sec};
+    sources are 'provider' or 'tokenizer'.
+    """
+    resp = rec.get("response", {}) or {}
+    model = model or rec.get("model")
+    usage = normalize_usage(resp.get("provider_meta"))
+    inp, out = usage["input_tokens"], usage["output_tokens"]
+    in_src = out_src = "provider"
+    if inp is None:
+        in_src = "tokenizer"
+        messages = (rec.get("request") or {}).get("messages")
+        if messages:
+            inp = count_message_tokens(messages, model)
+        else:
+            inp = _int_or_none((rec.get("context_audit") or {}).get("token_estimate")) or 0
+    if out is None:
+        out_src = "tokenizer"
+        out = count_tokens(resp.get("content") or "", model)
+    gen_ms = usage["generation_ms"] or _int_or_none(resp.get("latency_ms")) or 0
+    return {
+        "input_tokens": int(inp),
+        "output_tokens": int(out),
+        "input_source": in_src,
+        "output_source": out_src,
+        "generation_ms": int(gen_ms),
+        "output_tokens_per_sec": tokens_per_sec(int(out), int(gen_ms)),
+    }
@@ -1,26 +1,67 @@
 from __future__ import annotations
+import asyncio
 from pathlib import Path
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+from collections import OrderedDict
 import json
 from datetime import datetime, timezone
 
 try:
     from .providers.registry import ProviderRegistry  # type: ignore
-    from .providers.types import ProviderRequest  # type: ignore
-    from .state_extractor import extract_state  # type: ignore
+    from .providers.types import ProviderRequest, ProviderResponse  # type: ignore
+    from .state_extractor import IncrementalStateExtractor  # type: ignore
     from .context_builder import build_context  # type: ignore
+    from .token_accounting import turn_usage  # type: ignore
+    from .response_cache import ResponseCache, cache_key, normalize_cache_mode  # type: ignore
+    from .telemetry import ARTIFACT_WRITE_SECONDS, TOKENS, TURNS  # type: ignore
 except Exception:
     from providers.registry import ProviderRegistry  # type: ignore
-    from providers.types import ProviderRequest  # type: ignore
-    from state_extractor import extract_state  # type: ignore
+    from providers.types import ProviderRequest, ProviderResponse  # type: ignore
+    from state_extractor import IncrementalStateExtractor  # type: ignore
     from context_builder import build_context  # type: ignore
+    from token_accounting import turn_usage  # type: ignore
+    from response_cache import ResponseCache, cache_key, normalize_cache_mode  # type: ignore
+    from telemetry import ARTIFACT_WRITE_SECONDS, TOKENS, TURNS  # type: ignore
+
+# conversation extractors kept per TurnRunner
+MAX_EXTRACTORS = 4096
 
 
 class TurnRunner:
     def __init__(self, run_root: Path) -> None:
         self.run_root = Path(run_root)
-        self.providers = ProviderRegistry()
+        self.providers = ProviderRegistry(self.run_root)
+        self._response_cache: ResponseCache | None = None
+        # (run_id, conversation_id, domain) -> extractor holding the transcript state so far, least recently used first
+        self._extractors: "OrderedDict[Tuple[str, str, str], IncrementalStateExtractor]" = OrderedDict()
+
+    def _extractor(self, run_id: str, conversation_id: str, domain: str) -> IncrementalStateExtractor:
+        key = (run_id, conversation_id, domain)
+        ex = self._extractors.pop(key, None) or IncrementalStateExtractor(domain)
+        self._extractors[key] = ex
+        # conversations in flight are bounded by the run's concurrency; an evicted one just re-reads its transcript
+        while len(self._extractors) > MAX_EXTRACTORS:
+            self._extractors.popitem(last=False)
+        return ex
+
+    def forget_conversation(self, run_id: str, conversation_id: str) -> None:
+        """Drop the transcript state of a conversation that has no more turns to run."""
+        for key in [k for k in self._extractors if k[0] == run_id and k[1] == conversation_id]:
+            del self._extractors[key]
+
+    def forget_run(self, run_id: str) -> None:
+        """Drop every extractor of a run that ended (finished, failed or cancelled)."""
+        for key in [k for k in self._extractors if k[0] == run_id]:
+            del self._extractors[key]
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        # Opened on first use so runs that bypass the cache never create the database
+        if self._response_cache is None:
+            path = os.getenv("RESPONSE_CACHE_PATH") or str(self.run_root / "response_cache.sqlite3")
+            self._response_cache = ResponseCache(Path(path))
+        return self._response_cache
 
     @staticmethod
     def _now_iso() -> str:
@@ -51,6 +92,25 @@ class TurnRunner:
         base_plain.mkdir(parents=True, exist_ok=True)
         return candidate
 
+    def load_turn(self, run_id: str, conversation_id: str, turn_index: int) -> Dict[str, Any] | None:
+        """Return a persisted turn record if it completed successfully, else None."""
+        try:
+            from .artifacts import conversation_dirname  # type: ignore
+        except Exception:
+            from artifacts import conversation_dirname  # type: ignore
+        conv_root = self.run_root / run_id / "conversations"
+        name = f"turn_{turn_index:03d}.json"
+        for p in (conv_root / conversation_id / name, conv_root / conversation_dirname(conversation_id) / name):
+            if not p.exists():
+                continue
+            try:
+                rec = json.loads(p.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if (rec.get("response") or {}).get("ok") is True:
+                return rec
+        return None
+
     async def run_turn(
         self,
         *,
@@ -64,33 +124,66 @@ class TurnRunner:
         conv_meta: Dict[str, Any] | None = None,
         params_override: Dict[str, Any] | None = None,
         max_tokens: int = 2048,
+        cache_mode: str | None = None,
+        stream: bool | None = None,
+        hedge: bool | None = None,
     ) -> Dict[str, Any]:
         started_at = self._now_iso()
-        # 1) derive state from transcript
-        state = extract_state(domain, turns)
+        # 1) derive state from transcript (only the messages added since this conversation's previous turn)
+        extractor = self._extractor(run_id, conversation_id, domain)
+        state = extractor.feed(turns)
         # 2) build provider-ready context
         # Build context with conversation-level metadata (policy + facts) when available
-        ctx = build_context(domain, turns, state, max_tokens=max_tokens, conv_meta=conv_meta or {}, params_override=params_override)
+        ctx = build_context(domain, turns, state, max_tokens=max_tokens, conv_meta=conv_meta or {}, params_override=params_override, model=model)
         messages = ctx["messages"]
         params = ctx.get("params") or {}
         # 3) call provider
-        adapter = self.providers.get(provider)
         req = ProviderRequest(model=model, messages=messages, metadata={
             "run_id": run_id,
             "conversation_id": conversation_id,
             "turn_index": turn_index,
             "domain": domain,
             "params": params,
+            # reserves TPM in the provider rate limiter before dispatch
+            "token_estimate": (ctx.get("audit") or {}).get("token_estimate"),
         })
-        resp = await adapter.chat(req)
+        # Streaming (TTFT / tokens-per-sec in provider_meta) per run; None defers to PROVIDER_STREAM
+        if stream is not None:
+            req.metadata["stream"] = stream
+        # Hedged duplicate after the model's p95 latency; None defers to PROVIDER_HEDGE
+        if hedge is not None:
+            req.metadata["hedge"] = hedge
+        # Identical (provider, model, messages, params) calls are served from the response cache when enabled
+        mode = normalize_cache_mode(cache_mode)
+        cache_status = None
+        resp = None
+        resilience: Dict[str, Any] | None = None
+        if mode != "bypass":
+            key = cache_key(provider, model, messages, params)
+            hit = await asyncio.to_thread(self.response_cache.get, key)
+            if hit is not None:
+                cache_status = "hit"
+                resp = ProviderResponse(True, hit["content"], hit["latency_ms"] or 0, hit["provider_meta"])
+            else:
+                cache_status = "miss"
+        if resp is None:
+            # retries and circuit breaking live in the registry; the artifact keeps what they cost
+            resp, resilience = await self.providers.chat(provider, req)
+            if cache_status == "miss" and mode == "read-write" and resp.ok:
+                try:
+                    await asyncio.to_thread(
+                        self.response_cache.put, key,
+                        provider=provider, model=model, content=resp.content or "",
+                        latency_ms=resp.latency_ms, provider_meta=resp.provider_meta,
+                    )
+                except Exception:
+                    pass
         ended_at = self._now_iso()
 
-        # Update state with assistant reply by re-running extractor over turns + model output.
+        # Update state with assistant reply by folding the model output into the transcript state.
         # This captures the structured FINAL_STATE JSON (if present) or falls back to heuristics.
         try:
-            assistant_msg = {"role": "assistant", "text": resp.content or ""}
-            updated_turns: List[Dict[str, str]] = list(turns) + [assistant_msg]
-            state = extract_state(domain, updated_turns, prev_state=state)
+            state = extractor.with_reply(turns, resp.content or "")
         except Exception:
             pass
 
@@ -109,13 +202,28 @@ class TurnRunner:
                 "latency_ms": resp.latency_ms,
                 "provider_meta": resp.provider_meta,
                 "error": getattr(resp, "error", None),
+                # 'hit' | 'miss' when the response cache was consulted, else None
+                "cache": cache_status,
             },
+            # {attempts, retries, wasted_ms, breaker_wait_ms, errors}; None for cache hits
+            "resilience": resilience,
             "timestamps": {
                 "started_at": started_at,
                 "ended_at": ended_at,
             },
         }
+        # normalized token counts (provider-reported, else offline tokenizer)
+        try:
+            record["usage"] = turn_usage(record, model)
+        except Exception:
+            pass
+        TURNS.inc(provider=provider, model=model, cache=cache_status or "bypass")
+        usage = record.get("usage") or {}
+        if cache_status != "hit" and usage:
+            TOKENS.inc(usage.get("input_tokens") or 0, provider=provider, model=model, direction="in")
+            TOKENS.inc(usage.get("output_tokens") or 0, provider=provider, model=model, direction="out")
         # 4) persist artifact
         out_path = self._artifact_path(run_id, conversation_id, turn_index)
-        out_path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        with ARTIFACT_WRITE_SECONDS.time(kind="turn"):
+            out_path.write_text(json.dumps(record, indent=2), encoding="utf-8")
         return record